@@ -0,0 +1,80 @@
+# -* coding: utf-8 *-
+"""
+Benchmark for the memory footprint of models
+
+Measures the memory taken per argument by the models and by the columns (columnar module),
+without counting the strings and default values they reference (those are shared by all the
+representations).
+
+Usage:
+    python benchmarks/models_benchmark.py [--number N]
+"""
+# System imports
+import argparse
+import os
+import sys
+import tracemalloc
+
+# Third-party imports
+# Local imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pynspector.columnar import ColumnsBuilder  # noqa: E402
+from pynspector.models import Argument, ArgumentRecord, Function  # noqa: E402
+
+
+class DictArgument(object):
+    """Argument as it was before using __slots__"""
+
+    def __init__(self, name, default, kind, description, is_arg, position, parameter_kind=None):
+        self.name = name
+        self.default = default
+        self.kind = kind
+        self.description = description
+        self.is_arg = is_arg
+        self.position = position
+        self.parameter_kind = parameter_kind
+
+
+VALUES = ('name', None, 'str', 'Description', True, 0, 'POSITIONAL_OR_KEYWORD')
+
+
+def measure(factory, number):
+    """Get the bytes allocated per object when creating ``number`` objects"""
+    objects = [None] * number  # Allocate the list before measuring
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    for index in range(number):
+        objects[index] = factory(*VALUES)
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return float(end - start) / number
+
+
+def measure_columns(number):
+    """Get the bytes allocated per argument when writing ``number`` arguments into columns"""
+    function = Function('name', None, None, None, [Argument(*VALUES)] * number)
+    builder = ColumnsBuilder()
+    builder.add_result(Function('name', None, None, None, [Argument(*VALUES)]))  # Strings
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    builder.add_result(function)
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return float(end - start) / number
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--number', type=int, default=100000, help='Objects per measurement')
+    options = parser.parse_args(argv)
+
+    print('%-22s %14s' % ('model', 'bytes/argument'))
+    for name, factory in (('Argument (__dict__)', DictArgument),
+                          ('Argument (__slots__)', Argument),
+                          ('ArgumentRecord', ArgumentRecord)):
+        print('%-22s %14.1f' % (name, measure(factory, options.number)))
+    print('%-22s %14.1f' % ('Columns (array)', measure_columns(options.number)))
+
+
+if __name__ == '__main__':
+    main()
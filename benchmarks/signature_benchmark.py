@@ -0,0 +1,56 @@
+# -* coding: utf-8 *-
+"""
+Benchmark for function signature extraction
+
+Compares the previous implementation, which built an ``inspect.Signature`` twice per function
+(once for the argument names and once for the defaults), against ``get_parameters``.
+
+Usage:
+    python benchmarks/signature_benchmark.py [--number N]
+"""
+# System imports
+import argparse
+import inspect
+import os
+import sys
+import timeit
+
+# Third-party imports
+# Local imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pynspector.func_inspections import get_parameters  # noqa: E402
+
+
+def small_func(foo, bar=None):
+    return foo, bar
+
+
+def big_func(a, b, c, d=1, e=2, f=3, *args, **kwargs):
+    return a, b, c, d, e, f, args, kwargs
+
+
+def signature_twice(func):
+    """Previous implementation: get_function_args + get_default_args"""
+    args = list(inspect.signature(func).parameters.keys())
+    defaults = {param.name: param.default
+                for param in inspect.signature(func).parameters.values()
+                if param.default is not inspect.Parameter.empty}
+    return args, defaults
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--number', type=int, default=20000, help='Calls per measurement')
+    options = parser.parse_args(argv)
+
+    print('%-12s %16s %16s %8s' % ('function', 'signature x2 (us)', 'get_parameters (us)', 'speedup'))
+    for func in (small_func, big_func):
+        old = min(timeit.repeat(lambda: signature_twice(func), number=options.number, repeat=5))
+        new = min(timeit.repeat(lambda: get_parameters(func), number=options.number, repeat=5))
+        print('%-12s %16.2f %16.2f %7.1fx' % (
+            func.__name__, old / options.number * 1e6, new / options.number * 1e6, old / new
+        ))
+
+
+if __name__ == '__main__':
+    main()
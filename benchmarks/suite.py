@@ -0,0 +1,206 @@
+# -* coding: utf-8 *-
+"""
+Benchmark suite for pynspector
+
+Generates synthetic modules with functions and docstrings of different shapes and measures the
+throughput and peak memory of every inspection stage:
+
+- signature: get_parameters for every function.
+- docstring: sphinx_doc_parser for every docstring.
+- inspect: get_func_inspect_result for every function.
+- module_scan: get_module_functions on the module.
+- static: get_static_inspect_results on the module source.
+
+Results are written as JSON. A previous run can be used as baseline, the suite fails when a stage
+throughput drops, or its peak memory grows, more than the allowed threshold.
+
+Usage:
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --compare results.json --threshold 0.2
+"""
+# System imports
+import argparse
+import importlib
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Third-party imports
+# Local imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pynspector import __version__  # noqa: E402
+from pynspector.doc_parsers import sphinx_doc_parser  # noqa: E402
+from pynspector.func_inspections import get_func_inspect_result, get_parameters  # noqa: E402
+from pynspector.module_inspections import get_module_functions  # noqa: E402
+from pynspector.static_inspections import get_static_inspect_results  # noqa: E402
+
+
+# name: (params per function, long description lines, separate :type: lines)
+SCENARIOS = {
+    'small': (2, 1, False),
+    'many_params': (20, 3, False),
+    'long_descriptions': (3, 500, False),
+    'many_types': (50, 1, True),
+}
+
+
+def generate_module(functions, params, description_lines, type_lines):
+    """Get the source code of a synthetic module
+
+    :param int functions: Number of functions
+    :param int params: Number of parameters per function, half of them with defaults
+    :param int description_lines: Number of lines of the long description
+    :param bool type_lines: Document types with `:type:` lines instead of inline
+    :return: Source code
+    :rtype: str
+    """
+    chunks = []
+    for number in range(functions):
+        names = ['param_%d' % index for index in range(params)]
+        signature = ', '.join(
+            name if index < params // 2 else '%s=%d' % (name, index)
+            for index, name in enumerate(names)
+        )
+        doc = ['Function number %d' % number, '']
+        doc.extend('Long description line %d with some words in it.' % line
+                   for line in range(description_lines))
+        doc.append('')
+        for name in names:
+            if type_lines:
+                doc.append(':param %s: Description of %s' % (name, name))
+                doc.append('    spanning two lines.')
+                doc.append(':type %s: int' % name)
+            else:
+                doc.append(':param int %s: Description of %s' % (name, name))
+        doc.append(':returns: Nothing')
+        doc.append(':rtype: None')
+        chunks.append('def function_%d(%s):\n    """%s\n    """\n    return None\n' % (
+            number, signature, '\n    '.join(doc)
+        ))
+    return '\n\n'.join(chunks)
+
+
+def measure(func, operations, repeat):
+    """Measure a stage
+
+    :param function func: Function running the stage once
+    :param int operations: Number of operations done by a run of the stage
+    :param int repeat: Number of runs, the fastest one is reported
+    :return: Dictionary with operations per second and peak memory in bytes
+    :rtype: dict
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'ops_per_second': operations / best, 'peak_memory': peak}
+
+
+def run_scenario(name, directory, functions, repeat):
+    params, description_lines, type_lines = SCENARIOS[name]
+    module_name = 'pynspector_benchmark_%s' % name
+    path = os.path.join(directory, module_name + '.py')
+    with open(path, 'w') as module_file:
+        module_file.write(generate_module(functions, params, description_lines, type_lines))
+    module = importlib.import_module(module_name)
+    funcs = list(get_module_functions(module))
+    docstrings = [func.__doc__ for func in funcs]
+
+    return {
+        'signature': measure(lambda: [get_parameters(func) for func in funcs],
+                             len(funcs), repeat),
+        'docstring': measure(lambda: [sphinx_doc_parser(doc) for doc in docstrings],
+                             len(docstrings), repeat),
+        'inspect': measure(lambda: [get_func_inspect_result(func) for func in funcs],
+                           len(funcs), repeat),
+        'module_scan': measure(lambda: list(get_module_functions(module)), 1, repeat),
+        'static': measure(lambda: get_static_inspect_results(path), 1, repeat),
+    }
+
+
+def run(functions, repeat, scenarios):
+    directory = tempfile.mkdtemp()
+    sys.path.insert(0, directory)
+    try:
+        results = {name: run_scenario(name, directory, functions, repeat) for name in scenarios}
+    finally:
+        sys.path.remove(directory)
+        shutil.rmtree(directory)
+    return {
+        'pynspector': __version__,
+        'python': platform.python_version(),
+        'functions': functions,
+        'scenarios': results,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Compare results against a baseline
+
+    Throughput regresses when it drops more than the threshold, peak memory when it grows more
+    than the threshold.
+
+    :return: List of regressions as (scenario, stage, metric, baseline value, current value)
+    :rtype: list
+    """
+    regressions = []
+    for scenario, stages in results['scenarios'].items():
+        for stage, current in stages.items():
+            previous = baseline.get('scenarios', {}).get(scenario, {}).get(stage)
+            if not previous:
+                continue
+            if current['ops_per_second'] < previous['ops_per_second'] * (1 - threshold):
+                regressions.append((scenario, stage, 'ops_per_second',
+                                    previous['ops_per_second'], current['ops_per_second']))
+            if (previous.get('peak_memory') and
+                    current['peak_memory'] > previous['peak_memory'] * (1 + threshold)):
+                regressions.append((scenario, stage, 'peak_memory', previous['peak_memory'],
+                                    current['peak_memory']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--functions', type=int, default=200, help='Functions per module')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per stage')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help='Scenario to run, can be repeated. All of them by default')
+    parser.add_argument('--output', help='Write the results to this file instead of stdout')
+    parser.add_argument('--compare', metavar='BASELINE', help='Results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Allowed throughput drop and peak memory growth against the '
+                             'baseline, 0.2 means 20%%')
+    options = parser.parse_args(argv)
+
+    results = run(options.functions, options.repeat, options.scenario or sorted(SCENARIOS))
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if options.output:
+        with open(options.output, 'w') as output_file:
+            output_file.write(output + '\n')
+    else:
+        print(output)
+
+    if options.compare:
+        with open(options.compare) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), options.threshold)
+        for scenario, stage, metric, previous, current in regressions:
+            unit = 'ops/s' if metric == 'ops_per_second' else 'bytes'
+            sys.stderr.write('Regression in %s/%s: %.1f %s -> %.1f %s\n' % (
+                scenario, stage, previous, unit, current, unit
+            ))
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,56 @@
+# -* coding: utf-8 *-
+"""
+Benchmark for keyword arguments validation
+
+Compares binding keyword arguments with ``inspect.Signature.bind`` (plus ``apply_defaults``)
+against a validator compiled with ``compile_validator``.
+
+Usage:
+    python benchmarks/validator_benchmark.py [--number N]
+"""
+# System imports
+import argparse
+import inspect
+import os
+import sys
+import timeit
+
+# Third-party imports
+# Local imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pynspector.func_inspections import get_func_inspect_result  # noqa: E402
+from pynspector.validators import compile_validator  # noqa: E402
+
+
+def handler(user_id, name, email, timeout=10, retries=3, verbose=False, tags=None):
+    return user_id, name, email, timeout, retries, verbose, tags
+
+
+KWARGS = {'user_id': 1, 'name': 'foo', 'email': 'foo@example.com', 'retries': 5}
+
+
+def signature_bind(signature, kwargs):
+    bound = signature.bind(**kwargs)
+    bound.apply_defaults()
+    return bound.arguments
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--number', type=int, default=100000, help='Calls per measurement')
+    options = parser.parse_args(argv)
+
+    signature = inspect.signature(handler)
+    validate = compile_validator(get_func_inspect_result(handler))
+    assert dict(signature_bind(signature, KWARGS)) == validate(KWARGS)
+
+    old = min(timeit.repeat(lambda: signature_bind(signature, KWARGS),
+                            number=options.number, repeat=5))
+    new = min(timeit.repeat(lambda: validate(KWARGS), number=options.number, repeat=5))
+    print('%-26s %10.3f us/call' % ('Signature.bind', old / options.number * 1e6))
+    print('%-26s %10.3f us/call' % ('compile_validator', new / options.number * 1e6))
+    print('%-26s %10.1fx' % ('speedup', old / new))
+
+
+if __name__ == '__main__':
+    main()
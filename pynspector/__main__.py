@@ -0,0 +1,16 @@
+# -* coding: utf-8 *-
+"""
+:py:mod:`pynspector.__main__`
+-----------------------------
+Allows running the command line interface with ``python -m pynspector``
+"""
+# System imports
+import sys
+
+# Third-party imports
+# Local imports
+from .cli import main
+
+
+if __name__ == '__main__':
+    sys.exit(main())
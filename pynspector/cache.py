@@ -0,0 +1,403 @@
+# -* coding: utf-8 *-
+"""
+:py:mod:`pynspector.cache`
+--------------------------
+Here you will find caches used to avoid inspecting the same objects over and over.
+
+- LRUCache: Generic least-recently-used cache with hit/miss counters.
+- FunctionInspectionCache: Cache for function inspections, keyed weakly on the function object.
+- DocParserCache: Wraps a doc parser so every distinct docstring is parsed only once.
+- NegativeCache: Remembers the objects an inspection failed for, with the fallback result.
+"""
+# System imports
+import copy
+import sys
+import threading
+import weakref
+from collections import OrderedDict, namedtuple
+
+# Third-party imports
+# Local imports
+from . import stats
+
+
+__all__ = ['CacheInfo', 'LRUCache', 'FunctionInspectionCache', 'DocParserCache', 'NegativeCache',
+           'FrozenDict']
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+_MISSING = object()
+
+
+class LRUCache(object):
+    """Least recently used cache
+
+    Holds up to ``maxsize`` entries, when the cache is full the least recently used entry
+    is evicted. If ``maxsize`` is None the cache grows without bound.
+    Caches are thread safe.
+    """
+
+    def __init__(self, maxsize=128):
+        """ Initialize LRUCache object
+
+        :param int maxsize: Maximum number of entries to keep, None means unbounded
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        # Reentrant, weakref callbacks could remove entries while the lock is held
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        """Get a value from the cache, marking it as recently used
+
+        :param key: Key to look for
+        :param default: Value returned when the key is not cached
+        :return: Cached value or default
+        """
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._touch(key, value)
+            return value
+
+    def set(self, key, value):
+        """Store a value on the cache, evicting the least recently used entries if needed
+
+        :param key: Key for the value
+        :param value: Value to store
+        """
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            self._evict()
+
+    def pop(self, key, default=None):
+        """Remove a key from the cache and return its value"""
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self):
+        """Remove all entries and reset the counters"""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def info(self):
+        """Get cache statistics
+
+        :return: Named tuple with hits, misses, maxsize and currsize
+        :rtype: CacheInfo
+        """
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def _touch(self, key, value):
+        # OrderedDict.move_to_end is not available on python 2
+        del self._data[key]
+        self._data[key] = value
+
+    def _evict(self):
+        if self.maxsize is None:
+            return
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+def _func_fingerprint(func):
+    """Get the attributes that invalidate an inspection when they change
+
+    :param function func: Function to get the fingerprint from
+    :return: Tuple with code, defaults, keyword defaults and docstring
+    :rtype: tuple
+    """
+    return (
+        getattr(func, '__code__', None),
+        getattr(func, '__defaults__', None),
+        getattr(func, '__kwdefaults__', None),
+        getattr(func, '__doc__', None),
+    )
+
+
+def _same_fingerprint(first, second):
+    # Compare by identity, defaults could be unhashable or define a weird __eq__
+    return all(a is b for a, b in zip(first, second))
+
+
+class FunctionInspectionCache(LRUCache):
+    """Cache for function inspection results
+
+    Entries are keyed weakly on the function object, so caching a function doesn't keep it alive.
+    Results are stored without their live function (``func``), which is set again on the copy
+    returned by ``get``. Bound methods are keyed on their underlying function, so the result is
+    shared by every instance and every access to the method.
+    A cached result is invalidated whenever the function's ``__code__``, ``__defaults__``,
+    ``__kwdefaults__`` or ``__doc__`` are replaced, or when it's requested with a different
+    doc parser.
+
+    Example:
+    >>> cache = FunctionInspectionCache(maxsize=256)
+    >>> get_func_inspect_result(func, cache=cache)
+    >>> get_func_inspect_result(func, cache=cache)  # O(1), no inspection
+    >>> cache.info()
+    >>> CacheInfo(hits=1, misses=1, maxsize=256, currsize=1)
+    """
+
+    def get(self, func, doc_parser=None, default=None):
+        """Get the cached inspection for a function
+
+        :param function func: Inspected function
+        :param function doc_parser: Doc parser used for the inspection
+        :param default: Value returned when there's no valid cached inspection
+        :return: Cached inspection result or default
+        """
+        key = self._key(func)
+        with self._lock:
+            entry = self._data.get(key, _MISSING) if key is not None else _MISSING
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            fingerprint, parser, result = entry
+            if parser is not doc_parser or not _same_fingerprint(fingerprint,
+                                                                 _func_fingerprint(func)):
+                self.misses += 1
+                del self._data[key]
+                return default
+            self.hits += 1
+            self._touch(key, entry)
+        return _attach(result, func)
+
+    def set(self, func, result, doc_parser=None):
+        """Cache the inspection result for a function
+
+        Functions that can't be weakly referenced (builtins for example) are not cached.
+
+        :param function func: Inspected function
+        :param result: Inspection result
+        :param function doc_parser: Doc parser used for the inspection
+        """
+        key = self._key(func)
+        if key is None:
+            return
+        super(FunctionInspectionCache, self).set(key, (_func_fingerprint(func), doc_parser,
+                                                       _attach(result, None)))
+
+    def pop(self, func, default=None):
+        """Remove a function from the cache and return its cached result"""
+        key = self._key(func)
+        with self._lock:
+            entry = self._data.pop(key, _MISSING) if key is not None else _MISSING
+        return default if entry is _MISSING else _attach(entry[2], func)
+
+    def __contains__(self, func):
+        key = self._key(func)
+        return key is not None and key in self._data
+
+    def _key(self, func):
+        # Every key removes its entry when the function dies, hits store the key they looked up
+        bound = getattr(func, '__self__', None) is not None and hasattr(func, '__func__')
+        try:
+            ref = weakref.ref(func.__func__ if bound else func, self._remove)
+        except TypeError:
+            return None
+        # Bound methods don't share entries with their function, the signature differs
+        return (ref, _BOUND) if bound else ref
+
+    def _remove(self, ref):
+        with self._lock:
+            self._data.pop(ref, None)
+            self._data.pop((ref, _BOUND), None)
+
+
+_BOUND = 'bound'
+
+
+def _attach(result, func):
+    """Get a shallow copy of a result holding another live function
+
+    Results without a ``func`` attribute, or already holding that function, are returned as they
+    are.
+    """
+    if getattr(result, 'func', func) is func:
+        return result
+    attached = copy.copy(result)
+    attached.func = func
+    return attached
+
+
+class NegativeCache(LRUCache):
+    """Cache for objects an inspection failed for
+
+    Failing inspection paths (exceptions raised by ``inspect.signature`` or ``inspect.getsource``)
+    are slow, so the fallback result used for an object is remembered and returned directly the
+    next time. Objects are keyed weakly when possible. Builtins can't be weakly referenced, they are
+    kept alive by the cache, which is harmless since they live as long as their module.
+    Unhashable objects are not cached.
+
+    Example:
+    >>> unresolved = NegativeCache(maxsize=1024)
+    >>> unresolved.set(len, ())
+    >>> unresolved.get(len)
+    >>> ()
+    """
+
+    def get(self, obj, default=None):
+        key = self._key(obj)
+        if key is None:
+            self.misses += 1
+            return default
+        return super(NegativeCache, self).get(key, default)
+
+    def set(self, obj, value):
+        key = self._key(obj)
+        if key is not None:
+            super(NegativeCache, self).set(key, value)
+
+    def pop(self, obj, default=None):
+        key = self._key(obj)
+        if key is None:
+            return default
+        return super(NegativeCache, self).pop(key, default)
+
+    def __contains__(self, obj):
+        key = self._key(obj)
+        return key is not None and key in self._data
+
+    def _key(self, obj):
+        try:
+            hash(obj)
+        except TypeError:
+            return None
+        try:
+            return weakref.ref(obj, self._remove)
+        except TypeError:
+            return obj
+
+    def _remove(self, ref):
+        with self._lock:
+            self._data.pop(ref, None)
+
+
+class FrozenDict(dict):
+    """Read only dictionary
+
+    Returned by caches so a result can be shared safely between callers.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("'%s' object is read only" % type(self).__name__)
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+
+def _freeze(value):
+    """Get a read only copy of dictionaries, lists and tuples, recursively
+
+    Tuple subclasses such as named tuples keep their type and attributes.
+    """
+    if isinstance(value, dict):
+        return FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, tuple):
+        frozen = tuple.__new__(type(value), [_freeze(item) for item in value])
+        for name, attribute in getattr(value, '__dict__', {}).items():
+            setattr(frozen, name, _freeze(attribute))
+        return frozen
+    return value
+
+
+def _sizeof(value):
+    """Approximate memory used by a value and the containers and strings it holds, in bytes"""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_sizeof(key) + _sizeof(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(_sizeof(item) for item in value)
+    for attribute in getattr(value, '__dict__', {}).values():
+        size += _sizeof(attribute)
+    return size
+
+
+class DocParserCache(LRUCache):
+    """Cache for a doc parser
+
+    Wraps any doc parser and behaves as a doc parser itself, parsing every distinct docstring
+    only once. Entries are keyed on the docstring text and evicted in LRU order when there are
+    more than ``maxsize`` entries or they take more than ``max_bytes``.
+    Parse results are returned read only, since the same result is shared between every function
+    with that docstring.
+
+    Example:
+    >>> doc_parser = DocParserCache(sphinx_doc_parser, maxsize=4096, max_bytes=16 * 1024 * 1024)
+    >>> get_func_inspect_result(func, doc_parser=doc_parser)
+    """
+
+    def __init__(self, doc_parser, maxsize=1024, max_bytes=None):
+        """ Initialize DocParserCache object
+
+        :param function doc_parser: Doc parser to wrap
+        :param int maxsize: Maximum number of docstrings to keep, None means unbounded
+        :param int max_bytes: Approximate maximum memory used by the entries, None means unbounded
+        """
+        super(DocParserCache, self).__init__(maxsize=maxsize)
+        self.doc_parser = doc_parser
+        self.max_bytes = max_bytes
+        self.currbytes = 0
+
+    def __call__(self, docstring):
+        """Parse a docstring, using the cached result if it was already parsed
+
+        :param str docstring: Docstring in string format
+        :return: Read only result of the wrapped doc parser
+        """
+        entry = super(DocParserCache, self).get(docstring, _MISSING)
+        if entry is not _MISSING:
+            stats.hit('doc_parse')
+            return entry[0]
+        stats.miss('doc_parse')
+        result = _freeze(self.doc_parser(docstring))
+        self.set(docstring, result)
+        return result
+
+    def set(self, docstring, result):
+        """Store the parse result of a docstring"""
+        size = _sizeof(docstring) + _sizeof(result)
+        with self._lock:
+            self.pop(docstring)
+            self.currbytes += size
+            super(DocParserCache, self).set(docstring, (result, size))
+
+    def pop(self, docstring, default=None):
+        """Remove a docstring from the cache and return its parse result"""
+        with self._lock:
+            entry = self._data.pop(docstring, _MISSING)
+            if entry is _MISSING:
+                return default
+            self.currbytes -= entry[1]
+            return entry[0]
+
+    def clear(self):
+        with self._lock:
+            super(DocParserCache, self).clear()
+            self.currbytes = 0
+
+    def _evict(self):
+        while self._data and (
+                (self.maxsize is not None and len(self._data) > self.maxsize) or
+                (self.max_bytes is not None and self.currbytes > self.max_bytes)):
+            _, (_, size) = self._data.popitem(last=False)
+            self.currbytes -= size
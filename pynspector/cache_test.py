@@ -0,0 +1,204 @@
+# -* coding: utf-8 *-
+"""
+Set of tests for cache module
+"""
+# System imports
+import gc
+import pickle
+import unittest
+
+# Third-party imports
+# Local imports
+from .cache import (
+    LRUCache, FunctionInspectionCache, DocParserCache, NegativeCache, CacheInfo, FrozenDict
+)
+from .doc_parsers import sphinx_doc_parser
+from .func_inspections import get_func_inspect_result
+
+
+def dummy_parser(docstring):
+    return docstring
+
+
+class TestLRUCache(unittest.TestCase):
+    """
+    Test suite for class `LRUCache`
+    """
+
+    def test_should_count_hits_and_misses(self):
+        cache = LRUCache(maxsize=2)
+        cache.set('foo', 1)
+        self.assertEqual(cache.get('foo'), 1)
+        self.assertIsNone(cache.get('bar'))
+        self.assertEqual(cache.info(), CacheInfo(hits=1, misses=1, maxsize=2, currsize=1))
+
+    def test_should_evict_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.set('foo', 1)
+        cache.set('bar', 2)
+        cache.get('foo')
+        cache.set('baz', 3)
+        self.assertIn('foo', cache)
+        self.assertNotIn('bar', cache)
+        self.assertIn('baz', cache)
+
+    def test_should_not_evict_when_unbounded(self):
+        cache = LRUCache(maxsize=None)
+        for number in range(1000):
+            cache.set(number, number)
+        self.assertEqual(len(cache), 1000)
+
+
+class TestFunctionInspectionCache(unittest.TestCase):
+    """
+    Test suite for class `FunctionInspectionCache`
+    """
+
+    def setUp(self):
+        def func(foo, bar=1):
+            """Docstring"""
+            return foo, bar
+        self.func = func
+        self.cache = FunctionInspectionCache(maxsize=8)
+        self.cache.set(func, 'result', dummy_parser)
+
+    def test_should_return_cached_result(self):
+        self.assertEqual(self.cache.get(self.func, dummy_parser), 'result')
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_should_miss_with_another_doc_parser(self):
+        self.assertIsNone(self.cache.get(self.func, None))
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_should_invalidate_when_defaults_change(self):
+        self.func.__defaults__ = (2,)
+        self.assertIsNone(self.cache.get(self.func, dummy_parser))
+
+    def test_should_invalidate_when_docstring_change(self):
+        self.func.__doc__ = "Another docstring"
+        self.assertIsNone(self.cache.get(self.func, dummy_parser))
+
+    def test_should_invalidate_when_code_change(self):
+        def another_func(foo, bar=1):
+            return bar, foo
+        self.func.__code__ = another_func.__code__
+        self.assertIsNone(self.cache.get(self.func, dummy_parser))
+
+    def test_should_not_keep_functions_alive(self):
+        del self.func
+        gc.collect()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_should_ignore_functions_without_weakref_support(self):
+        self.cache.set(len, 'result', dummy_parser)
+        self.assertIsNone(self.cache.get(len, dummy_parser))
+        self.assertEqual(len(self.cache), 1)
+
+    def test_should_not_keep_inspected_functions_alive(self):
+        cache = FunctionInspectionCache(maxsize=8)
+        result = get_func_inspect_result(self.func, cache=cache)
+        self.assertIs(result.func, self.func)
+        del self.func, result
+        gc.collect()
+        self.assertEqual(len(cache), 0)
+
+    def test_should_return_result_with_live_function(self):
+        cache = FunctionInspectionCache(maxsize=8)
+        first = get_func_inspect_result(self.func, cache=cache)
+        second = get_func_inspect_result(self.func, cache=cache)
+        self.assertIs(second.func, self.func)
+        self.assertIs(second.arguments, first.arguments)
+        self.assertIn('def func', second.source_code)
+
+    def test_should_share_bound_methods_results(self):
+        class Handler(object):
+            def get(self, request):
+                return request
+        cache = FunctionInspectionCache(maxsize=8)
+        handler = Handler()
+        for method in (handler.get, handler.get, Handler().get):
+            result = get_func_inspect_result(method, cache=cache)
+            self.assertIs(result.func, method)
+            self.assertEqual([argument.name for argument in result.arguments], ['request'])
+        self.assertEqual(cache.info(), CacheInfo(hits=2, misses=1, maxsize=8, currsize=1))
+        self.assertNotIn(Handler.get, cache)
+        del handler, result, method
+        gc.collect()
+        self.assertEqual(len(cache), 1)
+        del Handler
+        gc.collect()
+        self.assertEqual(len(cache), 0)
+
+
+class TestNegativeCache(unittest.TestCase):
+    """
+    Test suite for class `NegativeCache`
+    """
+
+    def setUp(self):
+        self.cache = NegativeCache(maxsize=8)
+
+    def test_should_remember_objects(self):
+        self.cache.set(len, ())
+        self.assertIn(len, self.cache)
+        self.assertEqual(self.cache.get(len), ())
+
+    def test_should_not_keep_functions_alive(self):
+        def func():
+            pass
+        self.cache.set(func, True)
+        self.assertTrue(self.cache.get(func))
+        del func
+        gc.collect()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_should_ignore_unhashable_objects(self):
+        self.cache.set([], True)
+        self.assertEqual(len(self.cache), 0)
+        self.assertNotIn([], self.cache)
+
+
+class TestDocParserCache(unittest.TestCase):
+    """
+    Test suite for class `DocParserCache`
+    """
+
+    docstring = """Title
+
+    :param str foo: Description foo
+    :rtype: int
+    """
+
+    def test_should_parse_each_docstring_once(self):
+        doc_parser = DocParserCache(sphinx_doc_parser)
+        first = doc_parser(self.docstring)
+        second = doc_parser(self.docstring)
+        self.assertIs(first, second)
+        self.assertEqual(first, sphinx_doc_parser(self.docstring))
+        self.assertEqual((doc_parser.hits, doc_parser.misses), (1, 1))
+
+    def test_should_return_read_only_results(self):
+        _, _, params, _ = DocParserCache(sphinx_doc_parser)(self.docstring)
+        self.assertIsInstance(params, FrozenDict)
+        with self.assertRaises(TypeError):
+            params['bar'] = {}
+        with self.assertRaises(TypeError):
+            params['foo']['type'] = 'bool'
+
+    def test_should_keep_parse_result_attributes(self):
+        self.assertEqual(DocParserCache(sphinx_doc_parser)(self.docstring).rtype, 'int')
+
+    def test_should_evict_when_exceeding_max_bytes(self):
+        doc_parser = DocParserCache(sphinx_doc_parser, maxsize=None, max_bytes=4096)
+        for number in range(100):
+            doc_parser("Title %d" % number)
+        self.assertLess(len(doc_parser), 100)
+        self.assertLessEqual(doc_parser.currbytes, 4096)
+
+    def test_frozen_dict_should_be_picklable(self):
+        frozen = FrozenDict(foo=1)
+        self.assertEqual(pickle.loads(pickle.dumps(frozen)), frozen)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+# -* coding: utf-8 *-
+"""
+:py:mod:`pynspector.class_inspections`
+--------------------------------------
+Main module for inspecting classes
+"""
+# System imports
+from inspect import isfunction
+
+# Third-party imports
+# Local imports
+from . import models
+from .cache import FunctionInspectionCache
+from .doc_parsers import sphinx_doc_parser
+from .func_inspections import get_func_inspect_result
+
+
+__all__ = ['get_class_inspect_result', 'METHOD', 'CLASSMETHOD', 'STATICMETHOD', 'PROPERTY']
+
+
+METHOD = 'method'
+CLASSMETHOD = 'classmethod'
+STATICMETHOD = 'staticmethod'
+PROPERTY = 'property'
+
+_BUILTIN_MODULES = ('builtins', '__builtin__')
+
+# Methods are shared across all the classes inheriting them, keyed on the underlying function.
+# Entries die with their functions, the bound keeps the cache small while classes are alive
+_method_cache = FunctionInspectionCache(maxsize=4096)
+
+
+def get_class_inspect_result(cls, doc_parser=sphinx_doc_parser, cache=_method_cache):
+    """Get inspect results for a class and its public methods
+
+    Methods are looked up through the MRO, so inherited methods are included. A method inherited
+    unchanged is the same function on every subclass, so it's inspected once and its arguments
+    are shared by all of them.
+
+    Example:
+    >>> class Base(object):
+    ...     def save(self, force=False):
+    ...         pass
+    >>> class User(Base):
+    ...     @classmethod
+    ...     def create(cls, name):
+    ...         pass
+    >>> result = get_class_inspect_result(User)
+    >>> [(method.name, method.method_type, method.defined_in) for method in result.methods]
+    >>> [('create', 'classmethod', 'User'), ('save', 'method', 'Base')]
+    >>> result.methods[1].arguments is get_class_inspect_result(Base).methods[0].arguments
+    >>> True
+
+    :param type cls: Class to inspect
+    :param function doc_parser: Parser used to parse the docstrings
+    :param cache.FunctionInspectionCache cache: Cache used to share the inspected methods,
+        None to inspect every method again
+    :return: Object with all the information related with the class
+    :rtype: models.Class
+    """
+    methods = []
+    seen = set()
+    for klass in cls.__mro__:
+        if klass.__module__ in _BUILTIN_MODULES:
+            continue
+        for name, attribute in vars(klass).items():
+            if name in seen:
+                continue
+            seen.add(name)
+            if name.startswith('_'):
+                continue
+            func, method_type = _get_method_function(attribute)
+            if func is not None:
+                methods.append(
+                    _get_method_inspect_result(name, func, method_type, klass, doc_parser, cache)
+                )
+    methods.sort(key=lambda method: method.name)
+
+    short_description, long_description, _, _ = doc_parser(cls.__doc__)
+    return models.Class(name=cls.__name__, short_description=short_description,
+                        long_description=long_description, cls=cls, methods=methods)
+
+
+def _get_method_function(attribute):
+    """Get the underlying function and method type of a class attribute
+
+    :return: Tuple with function and method type, (None, None) if it's not a method
+    :rtype: tuple
+    """
+    if isinstance(attribute, staticmethod):
+        return attribute.__func__, STATICMETHOD
+    if isinstance(attribute, classmethod):
+        return attribute.__func__, CLASSMETHOD
+    if isinstance(attribute, property):
+        return attribute.fget, PROPERTY
+    if isfunction(attribute):
+        return attribute, METHOD
+    return None, None
+
+
+def _get_method_inspect_result(name, func, method_type, klass, doc_parser, cache):
+    defined_in = getattr(klass, '__qualname__', klass.__name__)
+    if cache is not None:
+        method = cache.get(func, doc_parser)
+        # The same function could be reused with another name or as another kind of method
+        if method is not None and (method.name, method.method_type, method.defined_in) == (
+                name, method_type, defined_in):
+            return method
+
+    function = get_func_inspect_result(func, doc_parser=doc_parser)
+    method = models.Method(name=name, short_description=function.short_description,
+                           long_description=function.long_description, func=func,
+                           arguments=function.arguments, method_type=method_type,
+                           defined_in=defined_in, return_type=function.return_type)
+    if cache is not None:
+        cache.set(func, method, doc_parser)
+    return method
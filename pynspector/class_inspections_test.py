@@ -0,0 +1,127 @@
+# -* coding: utf-8 *-
+"""
+Set of tests for class inspections module
+"""
+# System imports
+import gc
+import unittest
+
+# Third-party imports
+# Local imports
+from pynspector.cache import FunctionInspectionCache
+from pynspector.class_inspections import (
+    get_class_inspect_result, METHOD, CLASSMETHOD, STATICMETHOD, PROPERTY, _method_cache
+)
+from pynspector import models
+
+
+class Base(object):
+    """Base model
+
+    Long description.
+    """
+
+    def save(self, force=False):
+        """Save the model
+
+        :param bool force: Save even if nothing changed
+        """
+        return force
+
+    @classmethod
+    def create(cls, name):
+        """Create a model"""
+        return cls()
+
+    @staticmethod
+    def validate(value):
+        """Validate a value"""
+        return value
+
+    @property
+    def pk(self):
+        """Primary key"""
+        return 1
+
+    def _private(self):
+        pass
+
+
+class User(Base):
+    """User model"""
+
+    def save(self, force=False, notify=True):
+        """Save the user"""
+        return force, notify
+
+
+class Admin(User):
+    """Admin model"""
+
+
+class TestGetClassInspectResult(unittest.TestCase):
+    """
+    Test suite for function `get_class_inspect_result`
+    """
+
+    def setUp(self):
+        self.cache = FunctionInspectionCache(maxsize=None)
+
+    def _methods(self, cls):
+        result = get_class_inspect_result(cls, cache=self.cache)
+        return {method.name: method for method in result.methods}
+
+    def test_it_should_inspect_the_class(self):
+        result = get_class_inspect_result(Base, cache=self.cache)
+        self.assertIsInstance(result, models.Class)
+        self.assertEqual((result.name, result.short_description, result.long_description),
+                         ('Base', 'Base model', 'Long description.'))
+        self.assertIs(result.cls, Base)
+
+    def test_it_should_get_every_kind_of_method(self):
+        methods = self._methods(Base)
+        self.assertListEqual(sorted(methods), ['create', 'pk', 'save', 'validate'])
+        self.assertEqual(
+            {name: method.method_type for name, method in methods.items()},
+            {'create': CLASSMETHOD, 'pk': PROPERTY, 'save': METHOD, 'validate': STATICMETHOD}
+        )
+        self.assertIsInstance(methods['save'], models.Method)
+        self.assertEqual(methods['save'].arguments[1].description, 'Save even if nothing changed')
+        self.assertEqual(methods['validate'].short_description, 'Validate a value')
+
+    def test_it_should_use_overridden_methods(self):
+        methods = self._methods(User)
+        self.assertEqual(methods['save'].defined_in, 'User')
+        self.assertEqual([argument.name for argument in methods['save'].arguments],
+                         ['self', 'force', 'notify'])
+        self.assertEqual(methods['create'].defined_in, 'Base')
+
+    def test_it_should_share_inherited_methods(self):
+        base_methods = self._methods(Base)
+        user_methods = self._methods(User)
+        admin_methods = self._methods(Admin)
+        self.assertIs(admin_methods['create'].arguments, base_methods['create'].arguments)
+        self.assertIs(admin_methods['pk'].arguments, base_methods['pk'].arguments)
+        self.assertIs(admin_methods['save'].arguments, user_methods['save'].arguments)
+        self.assertIsNot(user_methods['save'].arguments, base_methods['save'].arguments)
+
+    def test_it_should_not_keep_classes_alive(self):
+        class Temporary(object):
+            def run(self, job):
+                return job
+        get_class_inspect_result(Temporary)
+        self.assertIn(Temporary.__dict__['run'], _method_cache)
+        size = len(_method_cache)
+        del Temporary
+        gc.collect()
+        self.assertEqual(len(_method_cache), size - 1)
+        self.assertIsNotNone(_method_cache.maxsize)
+
+    def test_it_should_inspect_again_without_cache(self):
+        first = get_class_inspect_result(Base, cache=None).methods[0]
+        second = get_class_inspect_result(Base, cache=None).methods[0]
+        self.assertIsNot(first, second)
+
+
+if __name__ == '__main__':
+    unittest.main()
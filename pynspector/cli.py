@@ -0,0 +1,170 @@
+# -* coding: utf-8 *-
+"""
+:py:mod:`pynspector.cli`
+------------------------
+Command line entry point.
+
+Inspects modules and packages, given by dotted name or path, and writes one JSON object per
+function to stdout (JSON Lines) as soon as it's inspected. With several jobs, the functions of a
+module are written once the worker inspecting it is done.
+
+Usage:
+    pynspector mypackage other.module path/to/script.py
+    pynspector --jobs 4 --no-source mypackage | jq .name
+    pynspector --serve /tmp/pynspector.sock mypackage
+
+The inspection modules are only imported once the arguments are parsed, so ``--help`` and
+argument errors don't pay for them.
+
+With ``--serve`` nothing is written: the targets are kept indexed by a server.InspectionServer
+listening on the given Unix socket.
+"""
+# System imports
+import argparse
+import errno
+import json
+import os
+import sys
+
+# Third-party imports
+# Local imports
+
+
+__all__ = ['main', 'resolve_target']
+
+
+def resolve_target(target):
+    """Get the module name of a target and the directory it's imported from
+
+    Targets that are not an existing path are taken as a dotted module name. Paths to a file or
+    package directory are imported from the first parent directory that is not a package.
+
+    Example:
+    >>> resolve_target('src/mypackage/handlers.py')
+    >>> ('mypackage.handlers', '/abs/src')
+
+    :param str target: Dotted module name, path to a python file or to a package directory
+    :return: Tuple with the module name and the directory to add to sys.path (None for names)
+    :rtype: tuple
+    """
+    if not os.path.exists(target):
+        return target, None
+    path = os.path.abspath(target)
+    if os.path.isdir(path):
+        directory, name = os.path.dirname(path), os.path.basename(path)
+    else:
+        directory, name = os.path.split(os.path.splitext(path)[0])
+        if name == '__init__':
+            directory, name = os.path.split(directory)
+    names = [name]
+    while os.path.isfile(os.path.join(directory, '__init__.py')):
+        directory, name = os.path.split(directory)
+        names.append(name)
+    return '.'.join(reversed(names)), directory
+
+
+def _build_parser():
+    parser = argparse.ArgumentParser(
+        prog='pynspector',
+        description='Inspect the public functions of modules and packages, writing one JSON '
+                    'object per function to stdout.'
+    )
+    parser.add_argument('targets', nargs='+', metavar='TARGET',
+                        help='Module or package, as dotted name or path')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Number of worker processes, 0 to use one per CPU. Default: 1')
+    parser.add_argument('--no-source', action='store_true',
+                        help="Don't include the source code of the functions")
+    parser.add_argument('--serve', metavar='SOCKET',
+                        help='Keep the targets indexed and answer queries on this Unix socket')
+    parser.add_argument('--poll-interval', type=float, default=1.0,
+                        help='With --serve, seconds between checks for changed files. Default: 1')
+    return parser
+
+
+def _write_line(stream, data):
+    stream.write(json.dumps(data, default=repr, sort_keys=True))
+    stream.write('\n')
+    stream.flush()
+
+
+def _resolve_targets(targets):
+    module_names = []
+    for target in targets:
+        module_name, directory = resolve_target(target)
+        if directory is not None and directory not in sys.path:
+            sys.path.insert(0, directory)
+        module_names.append(module_name)
+    return module_names
+
+
+def _iter_functions(module_name, workers, include_source, on_error):
+    """Get tuples with the module name and the models.Function of every function of a package"""
+    from .package_inspections import iter_inspections, iter_package_inspections
+
+    if workers == 1:
+        # Inspected in this process one function at a time
+        return iter_inspections(module_name, lightweight=not include_source, on_error=on_error)
+    inspections = iter_package_inspections(module_name, workers=workers,
+                                           lightweight=not include_source)
+    return _iter_inspection_functions(inspections, on_error)
+
+
+def _iter_inspection_functions(inspections, on_error):
+    for inspection in inspections:
+        if inspection.error:
+            on_error(inspection.module, inspection.error)
+            continue
+        for function in inspection.functions:
+            yield inspection.module, function
+
+
+def _serve(options):
+    from .server import InspectionServer
+
+    server = InspectionServer(options.serve, _resolve_targets(options.targets),
+                              poll_interval=options.poll_interval)
+    for module_name, error in sorted(server.index.errors.items()):
+        sys.stderr.write('%s: %s\n' % (module_name, error))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def main(argv=None):
+    """Run the command line interface
+
+    :param list argv: Command line arguments, sys.argv by default
+    :return: Exit code, 1 if any module couldn't be inspected
+    :rtype: int
+    """
+    options = _build_parser().parse_args(argv)
+    if options.serve:
+        return _serve(options)
+    include_source = not options.no_source
+    workers = options.jobs or None
+    errors = []
+
+    def on_error(module_name, error):
+        errors.append(module_name)
+        sys.stderr.write('%s: %s\n' % (module_name, error))
+
+    try:
+        for target, module_name in zip(options.targets, _resolve_targets(options.targets)):
+            try:
+                for module, function in _iter_functions(module_name, workers, include_source,
+                                                        on_error):
+                    data = function.to_dict(include_source=include_source)
+                    data['module'] = module
+                    _write_line(sys.stdout, data)
+            except ImportError as error:
+                on_error(target, error)
+    except IOError as error:
+        # The reader went away, `pynspector mypackage | head` for example
+        if error.errno != errno.EPIPE:
+            raise
+    return 1 if errors else 0
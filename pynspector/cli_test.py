@@ -0,0 +1,110 @@
+# -* coding: utf-8 *-
+"""
+Set of tests for cli module
+"""
+# System imports
+import json
+import os
+import sys
+import unittest
+
+import six
+
+try:
+    from unittest import mock
+except ImportError:  # python 2
+    import mock
+
+# Third-party imports
+# Local imports
+from pynspector import package_inspections
+from pynspector.cli import main, resolve_target
+from pynspector.package_inspections_test import PackageFixtureMixin
+
+
+class TestResolveTarget(PackageFixtureMixin, unittest.TestCase):
+    """
+    Test suite for function `resolve_target`
+    """
+
+    def setUp(self):
+        super(TestResolveTarget, self).setUp()
+        self.directory = sys.path[0]
+
+    def test_it_should_keep_dotted_names(self):
+        self.assertEqual(resolve_target('fixture_package.handlers'),
+                         ('fixture_package.handlers', None))
+
+    def test_it_should_resolve_module_paths(self):
+        path = os.path.join(self.directory, 'fixture_package', 'subpackage', 'utils.py')
+        self.assertEqual(resolve_target(path),
+                         ('fixture_package.subpackage.utils', self.directory))
+
+    def test_it_should_resolve_package_paths(self):
+        path = os.path.join(self.directory, 'fixture_package')
+        self.assertEqual(resolve_target(path), ('fixture_package', self.directory))
+        self.assertEqual(resolve_target(os.path.join(path, '__init__.py')),
+                         ('fixture_package', self.directory))
+
+
+class TestMain(PackageFixtureMixin, unittest.TestCase):
+    """
+    Test suite for function `main`
+    """
+
+    def _run(self, argv):
+        stdout, stderr = six.StringIO(), six.StringIO()
+        self.addCleanup(setattr, sys, 'stdout', sys.stdout)
+        self.addCleanup(setattr, sys, 'stderr', sys.stderr)
+        sys.stdout, sys.stderr = stdout, stderr
+        exit_code = main(argv)
+        lines = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        return exit_code, lines, stderr.getvalue()
+
+    def test_it_should_write_one_json_object_per_function(self):
+        exit_code, lines, _ = self._run(['fixture_package.handlers'])
+        self.assertEqual(exit_code, 0)
+        self.assertEqual([(line['module'], line['name']) for line in lines],
+                         [('fixture_package.handlers', 'get'), ('fixture_package.handlers', 'post')])
+        self.assertEqual(lines[0]['arguments'][1]['default'], 3)
+        self.assertIn('def get(request, retries=3):', lines[0]['source_code'])
+
+    def test_it_should_write_every_function_as_soon_as_it_is_inspected(self):
+        events = []
+        inspect = package_inspections.get_func_inspect_result
+
+        def get_func_inspect_result(func, **kwargs):
+            events.append('inspect')
+            return inspect(func, **kwargs)
+
+        with mock.patch.object(package_inspections, 'get_func_inspect_result',
+                               get_func_inspect_result):
+            with mock.patch('pynspector.cli._write_line', lambda *_: events.append('write')):
+                self.assertEqual(main(['fixture_package.handlers']), 0)
+        self.assertEqual(events, ['inspect', 'write'] * 2)
+
+    def test_it_should_report_missing_targets(self):
+        exit_code, lines, errors = self._run(['fixture_package_not_found'])
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(lines, [])
+        self.assertIn('fixture_package_not_found', errors)
+
+    def test_it_should_skip_source_code(self):
+        _, lines, _ = self._run(['--no-source', 'fixture_package.handlers'])
+        self.assertNotIn('source_code', lines[0])
+        self.assertEqual(lines[0]['source_location'][1:], [1, 3])
+
+    def test_it_should_report_broken_modules(self):
+        exit_code, lines, errors = self._run(['fixture_package'])
+        self.assertEqual(exit_code, 1)
+        self.assertIn('fixture_package.broken', errors)
+        self.assertEqual([line['name'] for line in lines], ['get', 'post', 'helper'])
+
+    def test_it_should_inspect_with_several_jobs(self):
+        exit_code, lines, _ = self._run(['--jobs', '2', 'fixture_package.subpackage'])
+        self.assertEqual(exit_code, 0)
+        self.assertEqual([line['name'] for line in lines], ['helper'])
+
+
+if __name__ == '__main__':
+    unittest.main()
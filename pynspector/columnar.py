@@ -0,0 +1,344 @@
+# -* coding: utf-8 *-
+"""
+:py:mod:`pynspector.columnar`
+-----------------------------
+Columnar export of inspection results, for bulk analytics.
+
+Results are written straight into two tables of columns, without building models: one row per
+function and one row per argument. Columns are ``array.array`` of integers, strings are
+dictionary encoded as codes of a shared string table (-1 stands for None), so an argument takes
+29 bytes of columns. They can be converted back to models (``Columns.get_function``), to NumPy
+structured arrays when NumPy is installed, and saved to and loaded from a compact binary file.
+
+Example, handlers taking a ``timeout`` argument without default:
+>>> columns = inspect_columnar('mypackage.handlers')
+>>> timeout = columns.code('timeout')
+>>> arguments = columns.arguments
+>>> [columns.decode(columns.functions['name'][arguments['function'][row]])
+...  for row in range(len(arguments['name'])) if arguments['name'][row] == timeout
+...  and not arguments['has_default'][row]]
+>>> ['get', 'post']
+"""
+# System imports
+import array
+import importlib
+import io
+import json
+import struct
+import sys
+import traceback
+
+# Third-party imports
+try:
+    import numpy
+except ImportError:  # NumPy is optional, only needed for structured arrays
+    numpy = None
+
+# Local imports
+from . import models
+from .doc_parsers import sphinx_doc_parser
+from .func_inspections import get_argument_records, get_doc, get_name, get_parameters
+from .module_inspections import get_module_functions
+from .package_inspections import get_package_module_names
+
+
+__all__ = ['Columns', 'ColumnsBuilder', 'inspect_columnar', 'FUNCTION_COLUMNS',
+           'ARGUMENT_COLUMNS']
+
+
+# Column name and array typecode, 'i' columns of strings hold codes of the string table
+FUNCTION_COLUMNS = (
+    ('module', 'i'),
+    ('name', 'i'),
+    ('short_description', 'i'),
+    ('long_description', 'i'),
+    ('return_type', 'i'),
+    ('filename', 'i'),
+    ('first_line', 'i'),
+    ('last_line', 'i'),
+    ('first_argument', 'i'),  # Row of its first argument on the arguments table
+    ('argument_count', 'i'),
+)
+ARGUMENT_COLUMNS = (
+    ('function', 'i'),  # Row of its function on the functions table
+    ('name', 'i'),
+    ('position', 'i'),
+    ('parameter_kind', 'i'),
+    ('kind', 'i'),
+    ('description', 'i'),
+    ('default', 'i'),  # Code of the repr of the default value
+    ('has_default', 'b'),
+)
+
+_MAGIC = b'PYNSCOL1'
+_HEADER = struct.Struct('<Q')
+
+
+def _tobytes(values):
+    # array.tobytes is called tostring on python 2
+    return getattr(values, 'tobytes', getattr(values, 'tostring', None))()
+
+
+def _frombytes(values, data):
+    getattr(values, 'frombytes', getattr(values, 'fromstring', None))(data)
+
+
+class Columns(object):
+    """Inspection results in columnar form
+
+    - functions: Dictionary with column name as key and array as value, see FUNCTION_COLUMNS.
+    - arguments: Dictionary with column name as key and array as value, see ARGUMENT_COLUMNS.
+    - strings: String table, string columns hold indexes of this list.
+    """
+
+    def __init__(self, functions, arguments, strings):
+        self.functions = functions
+        self.arguments = arguments
+        self.strings = strings
+        self._codes = None
+
+    def code(self, value):
+        """Get the code of a string, to compare it against string columns
+
+        :param str value: String to look for
+        :return: Code of the string, -1 if it's not on the string table
+        :rtype: int
+        """
+        if self._codes is None:
+            self._codes = {string: code for code, string in enumerate(self.strings)}
+        return self._codes.get(value, -1)
+
+    def decode(self, code):
+        """Get the string for a code, None for -1"""
+        return self.strings[code] if code >= 0 else None
+
+    def get_function(self, row):
+        """Get a function of the functions table as a model, ``func`` will be None
+
+        Default values are their repr (models.DefaultRepr), source code is not available.
+
+        :param int row: Row of the function on the functions table
+        :rtype: models.Function
+        """
+        decode, functions, columns = self.decode, self.functions, self.arguments
+        first_argument = functions['first_argument'][row]
+        arguments = []
+        for argument_row in range(first_argument,
+                                  first_argument + functions['argument_count'][row]):
+            has_default = columns['has_default'][argument_row]
+            arguments.append(models.Argument(
+                decode(columns['name'][argument_row]),
+                models.DefaultRepr(decode(columns['default'][argument_row]))
+                if has_default else None,
+                decode(columns['kind'][argument_row]),
+                decode(columns['description'][argument_row]),
+                not has_default,
+                columns['position'][argument_row],
+                decode(columns['parameter_kind'][argument_row]),
+            ))
+        function = models.Function(decode(functions['name'][row]),
+                                   decode(functions['short_description'][row]),
+                                   decode(functions['long_description'][row]), None, arguments,
+                                   decode(functions['return_type'][row]))
+        filename = decode(functions['filename'][row])
+        if filename is not None:
+            function.source_location = (filename, functions['first_line'][row],
+                                        functions['last_line'][row])
+        return function
+
+    def to_numpy(self):
+        """Get both tables as NumPy structured arrays
+
+        :return: Tuple with the functions and arguments structured arrays
+        :rtype: tuple
+        :raises ImportError: If NumPy is not installed
+        """
+        if numpy is None:
+            raise ImportError('NumPy is required to get structured arrays')
+        return (_structured_array(self.functions, FUNCTION_COLUMNS),
+                _structured_array(self.arguments, ARGUMENT_COLUMNS))
+
+    def save(self, path):
+        """Save the columns to a binary file
+
+        The file holds a JSON header with the columns layout followed by the raw arrays and the
+        UTF-8 encoded string table, so it's loaded without parsing every value.
+
+        :param str path: Path of the file
+        """
+        strings = [string.encode('utf-8') for string in self.strings]
+        string_sizes = array.array(str('i'), [len(string) for string in strings])
+        chunks = []
+        header = {'byteorder': sys.byteorder, 'columns': []}
+        for table_name, table, layout in (('functions', self.functions, FUNCTION_COLUMNS),
+                                          ('arguments', self.arguments, ARGUMENT_COLUMNS),
+                                          ('strings', {'size': string_sizes}, [('size', 'i')])):
+            for column, typecode in layout:
+                data = _tobytes(table[column])
+                header['columns'].append([table_name, column, typecode, len(data)])
+                chunks.append(data)
+        header = json.dumps(header).encode('utf-8')
+        with io.open(path, 'wb') as columns_file:
+            columns_file.write(_MAGIC)
+            columns_file.write(_HEADER.pack(len(header)))
+            columns_file.write(header)
+            for chunk in chunks:
+                columns_file.write(chunk)
+            columns_file.write(b''.join(strings))
+
+    @classmethod
+    def load(cls, path):
+        """Load columns saved with ``save``
+
+        :param str path: Path of the file
+        :rtype: Columns
+        :raises ValueError: If the file was not saved by ``save``
+        """
+        with io.open(path, 'rb') as columns_file:
+            if columns_file.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError('%s is not a pynspector columns file' % path)
+            header_size, = _HEADER.unpack(columns_file.read(_HEADER.size))
+            header = json.loads(columns_file.read(header_size).decode('utf-8'))
+            tables = {'functions': {}, 'arguments': {}, 'strings': {}}
+            for table_name, column, typecode, size in header['columns']:
+                values = array.array(str(typecode))
+                _frombytes(values, columns_file.read(size))
+                if header['byteorder'] != sys.byteorder:
+                    values.byteswap()
+                tables[table_name][column] = values
+            data = columns_file.read()
+        strings, offset = [], 0
+        for size in tables['strings']['size']:
+            strings.append(data[offset:offset + size].decode('utf-8'))
+            offset += size
+        return cls(tables['functions'], tables['arguments'], strings)
+
+
+def _structured_array(table, layout):
+    dtype = [(str(column), numpy.int8 if typecode == 'b' else numpy.int32)
+             for column, typecode in layout]
+    result = numpy.empty(len(table[layout[0][0]]), dtype=dtype)
+    if len(result):
+        for column, _ in layout:
+            result[column] = numpy.frombuffer(table[column], dtype=result.dtype[column])
+    return result
+
+
+class ColumnsBuilder(object):
+    """Writes inspection results into columns
+
+    Live functions are inspected straight into the columns, no models are built for them.
+    """
+
+    def __init__(self, doc_parser=sphinx_doc_parser):
+        """ Initialize ColumnsBuilder object
+
+        :param function doc_parser: Parser used to parse the docstrings of live functions
+        """
+        self.doc_parser = doc_parser
+        self.functions = {column: array.array(str(typecode))
+                          for column, typecode in FUNCTION_COLUMNS}
+        self.arguments = {column: array.array(str(typecode))
+                          for column, typecode in ARGUMENT_COLUMNS}
+        self.strings = []
+        self._codes = {}
+
+    def encode(self, value):
+        """Get the code of a string, adding it to the string table if needed
+
+        :param str value: String to encode, None is encoded as -1
+        :rtype: int
+        """
+        if value is None:
+            return -1
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+    def add_function(self, func, module=None):
+        """Inspect a live function into the columns
+
+        :param function func: Function to inspect
+        :param str module: Name of the module the function is inspected from
+        """
+        parsed = self.doc_parser(get_doc(func))
+        short_description, long_description, doc_args, _ = parsed
+        self._add_row(module, get_name(func), short_description, long_description,
+                      getattr(parsed, 'rtype', None), models.get_source_location(func),
+                      get_argument_records(get_parameters(func), doc_args))
+
+    def add_result(self, function, module=None):
+        """Add an already inspected function to the columns
+
+        :param models.Function function: Inspection result
+        :param str module: Name of the module the function is inspected from
+        """
+        self._add_row(module, function.name, function.short_description,
+                      function.long_description, function.return_type, function.source_location,
+                      function.arguments)
+
+    def build(self):
+        """Get the columns built so far
+
+        :rtype: Columns
+        """
+        return Columns(self.functions, self.arguments, self.strings)
+
+    def _add_row(self, module, name, short_description, long_description, return_type, location,
+                 arguments):
+        # Computed first, so a failing repr leaves the columns untouched
+        defaults = [None if argument.is_arg else models.get_default_repr(argument.default)
+                    for argument in arguments]
+        encode = self.encode
+        row = len(self.functions['name'])
+        filename, first_line, last_line = location or (None, -1, -1)
+        functions = self.functions
+        functions['module'].append(encode(module))
+        functions['name'].append(encode(name))
+        functions['short_description'].append(encode(short_description))
+        functions['long_description'].append(encode(long_description))
+        functions['return_type'].append(encode(return_type))
+        functions['filename'].append(encode(filename))
+        functions['first_line'].append(first_line)
+        functions['last_line'].append(last_line)
+        functions['first_argument'].append(len(self.arguments['function']))
+        functions['argument_count'].append(len(arguments))
+
+        columns = self.arguments
+        for position, argument in enumerate(arguments):
+            columns['function'].append(row)
+            columns['name'].append(encode(argument.name))
+            columns['position'].append(position)
+            columns['parameter_kind'].append(encode(argument.parameter_kind))
+            columns['kind'].append(encode(argument.kind))
+            columns['description'].append(encode(argument.description))
+            columns['default'].append(encode(defaults[position]))
+            columns['has_default'].append(not argument.is_arg)
+
+
+def inspect_columnar(root, doc_parser=sphinx_doc_parser, on_error=None):
+    """Inspect every public function of a package and its submodules into columns
+
+    :param root: Package or module to inspect, module object or dotted name
+    :param function doc_parser: Parser used to parse the docstrings
+    :param function on_error: Called with the module name and the traceback when a module, or
+        one of its functions, can't be inspected. Those are skipped, by default silently
+    :rtype: Columns
+    """
+    builder = ColumnsBuilder(doc_parser=doc_parser)
+    for module_name in get_package_module_names(root):
+        try:
+            functions = list(get_module_functions(importlib.import_module(module_name)))
+        except Exception:
+            if on_error is not None:
+                on_error(module_name, traceback.format_exc())
+            continue
+        for func in functions:
+            try:
+                builder.add_function(func, module=module_name)
+            except Exception:
+                if on_error is not None:
+                    on_error(module_name, traceback.format_exc())
+    return builder.build()
@@ -0,0 +1,145 @@
+# -* coding: utf-8 *-
+"""
+Set of tests for columnar module
+"""
+# System imports
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Third-party imports
+# Local imports
+from pynspector import columnar
+from pynspector.columnar import Columns, ColumnsBuilder, inspect_columnar
+from pynspector.func_inspections import get_func_inspect_result
+from pynspector.package_inspections_test import PackageFixtureMixin, _write
+
+
+def handler(request, timeout, retries=3):
+    """Handle a request
+
+    :param Request request: Incoming request
+    :param float timeout: Seconds to wait
+    :rtype: Response
+    """
+
+
+class TestColumnsBuilder(unittest.TestCase):
+    """
+    Test suite for class `ColumnsBuilder`
+    """
+
+    def setUp(self):
+        builder = ColumnsBuilder()
+        builder.add_function(handler, module='handlers')
+        builder.add_result(get_func_inspect_result(handler), module='handlers')
+        self.columns = builder.build()
+
+    def _strings(self, table, column):
+        return [self.columns.decode(code) for code in table[column]]
+
+    def test_it_should_write_one_row_per_function(self):
+        functions = self.columns.functions
+        self.assertEqual(self._strings(functions, 'name'), ['handler', 'handler'])
+        self.assertEqual(self._strings(functions, 'return_type'), ['Response', 'Response'])
+        self.assertEqual(list(functions['first_argument']), [0, 3])
+        self.assertEqual(list(functions['argument_count']), [3, 3])
+
+    def test_it_should_write_one_row_per_argument(self):
+        arguments = self.columns.arguments
+        self.assertEqual(self._strings(arguments, 'name'), ['request', 'timeout', 'retries'] * 2)
+        self.assertEqual(self._strings(arguments, 'kind'), ['Request', 'float', None] * 2)
+        self.assertEqual(self._strings(arguments, 'default'), [None, None, '3'] * 2)
+        self.assertEqual(list(arguments['has_default']), [0, 0, 1] * 2)
+        self.assertEqual(list(arguments['function']), [0, 0, 0, 1, 1, 1])
+
+    def test_it_should_convert_rows_back_to_models(self):
+        inspected = get_func_inspect_result(handler)
+        for row in range(2):
+            function = self.columns.get_function(row)
+            self.assertIsNone(function.func)
+            self.assertEqual(function.return_type, 'Response')
+            self.assertEqual(function.source_location, inspected.source_location)
+            self.assertEqual([argument.is_mandatory for argument in function.arguments],
+                             [True, True, False])
+            self.assertEqual(function.arguments[0].kind, 'Request')
+            self.assertEqual(function.fingerprint, inspected.fingerprint)
+
+    def test_it_should_strip_addresses_from_defaults(self):
+        def with_marker(marker=object()):
+            return marker
+
+        builder = ColumnsBuilder()
+        builder.add_function(with_marker)
+        columns = builder.build()
+        self.assertEqual(columns.decode(columns.arguments['default'][0]), '<object object>')
+
+    def test_it_should_encode_every_string_once(self):
+        self.assertEqual(len(self.columns.strings), len(set(self.columns.strings)))
+        self.assertEqual(self.columns.code('timeout'), self.columns.arguments['name'][1])
+        self.assertEqual(self.columns.code('missing'), -1)
+
+    def test_it_should_save_and_load(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'columns.bin')
+        self.columns.save(path)
+        loaded = Columns.load(path)
+        self.assertEqual(loaded.functions, self.columns.functions)
+        self.assertEqual(loaded.arguments, self.columns.arguments)
+        self.assertEqual(loaded.strings, self.columns.strings)
+
+    def test_it_should_reject_other_files(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'other.bin')
+        with open(path, 'wb') as other_file:
+            other_file.write(b'something else')
+        self.assertRaises(ValueError, Columns.load, path)
+
+    @unittest.skipIf(columnar.numpy is None, "NumPy is not installed")
+    def test_it_should_convert_to_structured_arrays(self):
+        functions, arguments = self.columns.to_numpy()
+        self.assertEqual(len(functions), 2)
+        self.assertEqual(list(arguments['has_default']), [0, 0, 1] * 2)
+
+    @unittest.skipIf(columnar.numpy is not None, "NumPy is installed")
+    def test_it_should_require_numpy_for_structured_arrays(self):
+        self.assertRaises(ImportError, self.columns.to_numpy)
+
+
+class TestInspectColumnar(PackageFixtureMixin, unittest.TestCase):
+    """
+    Test suite for function `inspect_columnar`
+    """
+
+    def test_it_should_inspect_packages(self):
+        errors = []
+        columns = inspect_columnar('fixture_package', on_error=lambda *args: errors.append(args))
+        self.assertEqual([columns.decode(code) for code in columns.functions['name']],
+                         ['get', 'post', 'helper'])
+        self.assertEqual([columns.decode(code) for code in columns.functions['module']],
+                         ['fixture_package.handlers'] * 2 + ['fixture_package.subpackage.utils'])
+        self.assertEqual([module for module, _ in errors], ['fixture_package.broken'])
+
+    def test_it_should_report_functions_that_cant_be_inspected(self):
+        _write(os.path.join(sys.path[0], 'fixture_package', 'defaults.py'),
+               'class Marker(object):\n'
+               '    def __repr__(self):\n'
+               '        raise ValueError("broken repr")\n\n\n'
+               'def broken(marker=Marker()):\n    pass\n\n\n'
+               'def working(value):\n    pass\n')
+        errors = []
+        columns = inspect_columnar('fixture_package', on_error=lambda *args: errors.append(args))
+        self.assertIn('working', [columns.decode(code) for code in columns.functions['name']])
+        self.assertNotIn('broken', [columns.decode(code) for code in columns.functions['name']])
+        self.assertEqual(len(columns.arguments['name']), sum(columns.functions['argument_count']))
+        self.assertEqual([module for module, _ in errors],
+                         ['fixture_package.broken', 'fixture_package.defaults'])
+        self.assertIn('broken repr', errors[1][1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,189 @@
+# -* coding: utf-8 *-
+"""
+:py:mod:`pynspector.concurrency`
+--------------------------------
+Thread safe and asyncio friendly inspection entry points.
+
+When several threads ask for the same inspection at the same time, only one of them computes it
+and the others wait for its result (single flight). Function inspections are cached, so once
+computed they are served from the cache.
+"""
+# System imports
+import functools
+import sys
+import threading
+
+import six
+
+try:
+    import asyncio
+except ImportError:  # python 2
+    asyncio = None
+
+# Third-party imports
+# Local imports
+from . import func_inspections
+from . import package_inspections
+from .cache import FunctionInspectionCache
+from .doc_parsers import sphinx_doc_parser
+
+
+__all__ = ['SingleFlight', 'get_func_inspect_result', 'inspect_module',
+           'get_func_inspect_result_async', 'inspect_module_async']
+
+
+class _Call(object):
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """Deduplicates concurrent calls
+
+    Calls made with the same key while a previous one is still running wait for it and get its
+    result (or its exception) instead of running again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func, *args, **kwargs):
+        """Call a function, unless a call with the same key is in flight
+
+        :param key: Hashable key identifying the call
+        :param function func: Function to call
+        :return: Result of the call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                six.reraise(*call.error)
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException:
+            call.error = sys.exc_info()
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result
+
+
+_flights = SingleFlight()
+_inspections_cache = FunctionInspectionCache(maxsize=4096)
+
+
+def get_func_inspect_result(func, doc_parser=sphinx_doc_parser, cache=_inspections_cache):
+    """Thread safe version of func_inspections.get_func_inspect_result
+
+    Results are cached, and concurrent inspections of the same function are computed once.
+
+    :param function func: Function to inspect
+    :param function doc_parser: Parser used to parse the function docstring
+    :param cache.FunctionInspectionCache cache: Cache for the results, shared by default
+    :return: Object with all the information related with the function
+    :rtype: models.Function
+    """
+    result = cache.get(func, doc_parser)
+    if result is not None:
+        return result
+    return _flights.do(('function', func, doc_parser), _inspect_function, func, doc_parser, cache)
+
+
+def _inspect_function(func, doc_parser, cache):
+    # A previous leader could have finished between the cache miss and this flight
+    result = cache.get(func, doc_parser)
+    if result is not None:
+        return result
+    result = func_inspections.get_func_inspect_result(func, doc_parser=doc_parser)
+    cache.set(func, result, doc_parser)
+    return result
+
+
+def inspect_module(module_name, doc_parser=sphinx_doc_parser):
+    """Thread safe version of package_inspections.inspect_module
+
+    Concurrent inspections of the same module are computed once, so the module is imported and
+    inspected by a single thread.
+
+    :param str module_name: Dotted name of the module
+    :param function doc_parser: Parser used to parse the docstrings
+    :return: Inspection results for the module
+    :rtype: package_inspections.ModuleInspection
+    """
+    return _flights.do(('module', module_name, doc_parser), package_inspections.inspect_module,
+                       module_name, doc_parser=doc_parser)
+
+
+def _read_sources(functions):
+    """Read the source code of inspected functions, so it's not read later from the loop"""
+    for function in functions:
+        function.source_code
+
+
+def _inspect_function_with_source(func, doc_parser):
+    result = get_func_inspect_result(func, doc_parser=doc_parser)
+    _read_sources([result])
+    return result
+
+
+def _inspect_module_with_source(module_name, doc_parser):
+    result = inspect_module(module_name, doc_parser=doc_parser)
+    _read_sources(result.functions)
+    return result
+
+
+def get_func_inspect_result_async(func, doc_parser=sphinx_doc_parser, executor=None, loop=None):
+    """Inspect a function on an executor, without blocking the event loop
+
+    The source code is read on the executor too.
+
+    Example:
+    >>> result = await get_func_inspect_result_async(handler)
+
+    :param function func: Function to inspect
+    :param function doc_parser: Parser used to parse the function docstring
+    :param concurrent.futures.Executor executor: Executor to use, the loop default one if None
+    :param asyncio.AbstractEventLoop loop: Event loop, the current one by default
+    :return: Future with the models.Function
+    :rtype: asyncio.Future
+    """
+    loop = loop or asyncio.get_event_loop()
+    return loop.run_in_executor(
+        executor, functools.partial(_inspect_function_with_source, func, doc_parser)
+    )
+
+
+def inspect_module_async(module_name, doc_parser=sphinx_doc_parser, executor=None, loop=None):
+    """Import and inspect a module on an executor, without blocking the event loop
+
+    The source code of the functions is read on the executor too.
+
+    Example:
+    >>> result = await inspect_module_async('mypackage.handlers')
+
+    :param str module_name: Dotted name of the module
+    :param function doc_parser: Parser used to parse the docstrings
+    :param concurrent.futures.Executor executor: Executor to use, the loop default one if None
+    :param asyncio.AbstractEventLoop loop: Event loop, the current one by default
+    :return: Future with the package_inspections.ModuleInspection
+    :rtype: asyncio.Future
+    """
+    loop = loop or asyncio.get_event_loop()
+    return loop.run_in_executor(
+        executor, functools.partial(_inspect_module_with_source, module_name, doc_parser)
+    )
@@ -0,0 +1,142 @@
+# -* coding: utf-8 *-
+"""
+Set of tests for concurrency module
+"""
+# System imports
+import threading
+import time
+import unittest
+
+import six
+
+# Third-party imports
+# Local imports
+from pynspector import concurrency, func_inspections
+from pynspector.cache import FunctionInspectionCache
+from pynspector.concurrency import SingleFlight, get_func_inspect_result
+from pynspector.doc_parsers import sphinx_doc_parser
+from pynspector import models
+
+
+def dummy_func(foo, bar=None):
+    """Dummy function"""
+    return foo, bar
+
+
+def _run_threads(target, number=8):
+    threads = [threading.Thread(target=target) for _ in range(number)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+class TestSingleFlight(unittest.TestCase):
+    """
+    Test suite for class `SingleFlight`
+    """
+
+    def test_it_should_run_concurrent_calls_once(self):
+        flights = SingleFlight()
+        calls = []
+        results = []
+
+        def slow_call():
+            calls.append(1)
+            time.sleep(0.1)
+            return 'result'
+
+        _run_threads(lambda: results.append(flights.do('key', slow_call)))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['result'] * 8)
+
+    def test_it_should_share_exceptions(self):
+        flights = SingleFlight()
+        errors = []
+
+        def failing_call():
+            time.sleep(0.1)
+            raise ValueError('failed')
+
+        def target():
+            try:
+                flights.do('key', failing_call)
+            except ValueError as error:
+                errors.append(error)
+
+        _run_threads(target)
+        self.assertEqual(len(errors), 8)
+
+    def test_it_should_run_again_after_finishing(self):
+        flights = SingleFlight()
+        calls = []
+        flights.do('key', calls.append, 1)
+        flights.do('key', calls.append, 2)
+        self.assertEqual(calls, [1, 2])
+
+
+class TestGetFuncInspectResult(unittest.TestCase):
+    """
+    Test suite for function `get_func_inspect_result`
+    """
+
+    def test_concurrent_inspections_should_share_result(self):
+        cache = FunctionInspectionCache()
+        results = []
+        _run_threads(lambda: results.append(get_func_inspect_result(dummy_func, cache=cache)))
+        self.assertTrue(all(result.arguments is results[0].arguments for result in results))
+        self.assertTrue(all(result.func is dummy_func for result in results))
+        self.assertEqual(len(cache), 1)
+
+    def test_it_should_not_inspect_again_after_a_previous_flight(self):
+        class RacyCache(FunctionInspectionCache):
+            """Misses once, as if the previous flight finished right after the lookup"""
+            raced = False
+
+            def get(self, func, doc_parser=None, default=None):
+                if not self.raced:
+                    self.raced = True
+                    return default
+                return super(RacyCache, self).get(func, doc_parser, default)
+
+        docstrings = []
+
+        def doc_parser(docstring):
+            docstrings.append(docstring)
+            return sphinx_doc_parser(docstring)
+
+        cache = RacyCache()
+        cache.set(dummy_func, func_inspections.get_func_inspect_result(dummy_func, doc_parser),
+                  doc_parser)
+        del docstrings[:]
+        result = get_func_inspect_result(dummy_func, doc_parser=doc_parser, cache=cache)
+        self.assertIs(result.func, dummy_func)
+        self.assertEqual(docstrings, [])
+
+
+@unittest.skipUnless(six.PY3, "asyncio is python 3 only")
+class TestAsync(unittest.TestCase):
+    """
+    Test suite for asyncio entry points
+    """
+
+    def test_it_should_inspect_functions_on_executor(self):
+        loop = concurrency.asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        result = loop.run_until_complete(
+            concurrency.get_func_inspect_result_async(dummy_func, loop=loop)
+        )
+        self.assertIsInstance(result, models.Function)
+        self.assertIn('def dummy_func', result.source_code)
+
+    def test_it_should_inspect_modules_on_executor(self):
+        loop = concurrency.asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        result = loop.run_until_complete(concurrency.inspect_module_async(
+            'pynspector.module_inspections_fixture_test', loop=loop
+        ))
+        self.assertEqual(['dummy_func'], [function.name for function in result.functions])
+
+
+if __name__ == '__main__':
+    unittest.main()
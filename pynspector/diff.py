@@ -0,0 +1,135 @@
+# -* coding: utf-8 *-
+"""
+:py:mod:`pynspector.diff`
+-------------------------
+Compare inspection results, for example between two releases of a package.
+
+Functions are compared by their fingerprint first, the detailed diff of their arguments is only
+computed for the functions whose fingerprint changed.
+
+Default values are compared by repr. Live, disk cached and static results can be mixed: cached
+and static defaults are models.DefaultRepr, whose repr is the one of the value they stand for.
+Static defaults that are not literals are the source of their expression though (``TIMEOUT``
+instead of ``30``), so they are reported as changed against live results.
+
+Example:
+>>> old = DiskCache('.cache_v1').inspect_module('mypackage.handlers')
+>>> new = get_static_inspect_results('mypackage.handlers')
+>>> diff = diff_modules(old, new)
+>>> diff.removed
+>>> ['delete']
+>>> [(change.name, change.changed_arguments) for change in diff.changed]
+>>> [('get', [ArgumentDiff(name='retries', old=..., new=..., fields=('default',))])]
+"""
+# System imports
+from collections import namedtuple
+
+# Third-party imports
+# Local imports
+from .models import get_argument_key
+
+
+__all__ = ['ModuleDiff', 'FunctionDiff', 'ArgumentDiff', 'FUNCTION_FIELDS', 'ARGUMENT_FIELDS',
+           'diff_modules', 'diff_functions']
+
+
+# Fields compared for functions and arguments, besides their names
+FUNCTION_FIELDS = ('short_description', 'long_description', 'return_type')
+ARGUMENT_FIELDS = ('position', 'parameter_kind', 'is_arg', 'default', 'kind', 'description')
+
+
+class ModuleDiff(namedtuple('ModuleDiff', ['added', 'removed', 'changed'])):
+    """Differences between two sets of functions
+
+    - added: Sorted names of the functions only found on the new set.
+    - removed: Sorted names of the functions only found on the old set.
+    - changed: List of FunctionDiff for the functions found on both sets that changed, sorted
+      by name.
+    """
+    __slots__ = ()
+
+
+class FunctionDiff(namedtuple('FunctionDiff', ['name', 'old', 'new', 'fields', 'added_arguments',
+                                               'removed_arguments', 'changed_arguments'])):
+    """Differences between two versions of a function
+
+    - name: Name of the function.
+    - old, new: Both versions, models.Function.
+    - fields: Names of the FUNCTION_FIELDS that changed.
+    - added_arguments: Names of the arguments only found on the new version.
+    - removed_arguments: Names of the arguments only found on the old version.
+    - changed_arguments: List of ArgumentDiff, in the order of the new version arguments.
+    """
+    __slots__ = ()
+
+
+class ArgumentDiff(namedtuple('ArgumentDiff', ['name', 'old', 'new', 'fields'])):
+    """Differences between two versions of an argument
+
+    - name: Name of the argument.
+    - old, new: Both versions, models.Argument.
+    - fields: Names of the ARGUMENT_FIELDS that changed, ``is_arg`` when it became mandatory or
+      optional. Default values are compared by repr.
+    """
+    __slots__ = ()
+
+
+def diff_modules(old, new):
+    """Compare two sets of functions, such as the functions of a module on two releases
+
+    Functions are matched by name. Sets can be lists of models.Function or dictionaries with
+    any name as key (dotted names to compare whole packages, for example) and models.Function
+    as value.
+
+    :param old: Old functions, list or dictionary
+    :param new: New functions, list or dictionary
+    :return: Added, removed and changed functions
+    :rtype: ModuleDiff
+    """
+    old, new = _by_name(old), _by_name(new)
+    added = sorted(name for name in new if name not in old)
+    removed = sorted(name for name in old if name not in new)
+    changed = []
+    for name in sorted(name for name in new if name in old):
+        old_function, new_function = old[name], new[name]
+        if old_function.fingerprint != new_function.fingerprint:
+            changed.append(diff_functions(old_function, new_function, name=name))
+    return ModuleDiff(added, removed, changed)
+
+
+def diff_functions(old, new, name=None):
+    """Compare two versions of a function
+
+    :param models.Function old: Old version
+    :param models.Function new: New version
+    :param str name: Name reported on the diff, the new version name by default
+    :return: Differences between both versions, with no fields nor arguments if they are equal
+    :rtype: FunctionDiff
+    """
+    fields = tuple(field for field in FUNCTION_FIELDS if getattr(old, field) != getattr(new, field))
+    old_arguments = {argument.name: argument for argument in old.arguments}
+    new_names = set(argument.name for argument in new.arguments)
+    added_arguments = [argument.name for argument in new.arguments
+                       if argument.name not in old_arguments]
+    removed_arguments = [argument.name for argument in old.arguments
+                         if argument.name not in new_names]
+    changed_arguments = []
+    for argument in new.arguments:
+        previous = old_arguments.get(argument.name)
+        if previous is None:
+            continue
+        old_key, new_key = get_argument_key(previous), get_argument_key(argument)
+        if old_key != new_key:
+            changed_fields = tuple(field for field, old_value, new_value
+                                   in zip(ARGUMENT_FIELDS, old_key[1:], new_key[1:])
+                                   if old_value != new_value)
+            changed_arguments.append(ArgumentDiff(argument.name, previous, argument,
+                                                  changed_fields))
+    return FunctionDiff(name if name is not None else new.name, old, new, fields,
+                        added_arguments, removed_arguments, changed_arguments)
+
+
+def _by_name(functions):
+    if hasattr(functions, 'items'):
+        return functions
+    return {function.name: function for function in functions}
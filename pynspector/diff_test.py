@@ -0,0 +1,131 @@
+# -* coding: utf-8 *-
+"""
+Set of tests for diff module
+"""
+# System imports
+import unittest
+
+import six
+
+# Third-party imports
+# Local imports
+from pynspector import static_inspections_fixture_test
+from pynspector.diff import diff_functions, diff_modules
+from pynspector.func_inspections import get_func_inspect_result
+from pynspector.module_inspections import get_module_functions
+from pynspector.static_inspections import get_static_inspect_results
+
+
+def get_v1(request, retries=3, timeout=None):
+    """Get handler
+
+    :param Request request: Incoming request
+    :param int retries: Number of retries
+    """
+
+
+def get_v2(request, retries=5, verbose=False):
+    """Get handler
+
+    :param dict request: Incoming request
+    :param int retries: Number of retries
+    """
+
+
+def post(request, sentinel=object()):
+    """Post handler"""
+
+
+def delete(request):
+    """Delete handler"""
+
+
+def find(name, limit):
+    return name, limit
+
+
+def find_with_default_limit(name, limit=None):
+    return name, limit
+
+
+def _inspect(**funcs):
+    return {name: get_func_inspect_result(func) for name, func in funcs.items()}
+
+
+class TestFingerprint(unittest.TestCase):
+    """
+    Test suite for property `Function.fingerprint`
+    """
+
+    def test_it_should_ignore_memory_addresses_of_defaults(self):
+        def post(request, sentinel=object()):
+            """Post handler"""
+        self.assertEqual(get_func_inspect_result(post).fingerprint,
+                         _inspect(post=globals()['post'])['post'].fingerprint)
+
+    def test_it_should_change_with_the_signature(self):
+        self.assertNotEqual(get_func_inspect_result(get_v1).fingerprint,
+                            get_func_inspect_result(get_v2).fingerprint)
+
+
+class TestDiffModules(unittest.TestCase):
+    """
+    Test suite for function `diff_modules`
+    """
+
+    def test_it_should_report_added_and_removed_functions(self):
+        diff = diff_modules(_inspect(get=get_v1, delete=delete), _inspect(get=get_v1, post=post))
+        self.assertEqual((diff.added, diff.removed, diff.changed), (['post'], ['delete'], []))
+
+    def test_it_should_accept_lists(self):
+        old = [get_func_inspect_result(delete)]
+        self.assertEqual(diff_modules(old, [get_func_inspect_result(post)]).added, ['post'])
+
+    def test_it_should_report_changed_functions(self):
+        diff = diff_modules(_inspect(get=get_v1), _inspect(get=get_v2))
+        self.assertEqual(len(diff.changed), 1)
+        change = diff.changed[0]
+        self.assertEqual(change.name, 'get')
+        self.assertEqual(change.fields, ())
+        self.assertEqual(change.added_arguments, ['verbose'])
+        self.assertEqual(change.removed_arguments, ['timeout'])
+        self.assertEqual([(argument.name, argument.fields) for argument in change.changed_arguments],
+                         [('request', ('kind',)), ('retries', ('default',))])
+
+    def test_it_should_report_arguments_that_become_optional(self):
+        diff = diff_modules(_inspect(find=find), _inspect(find=find_with_default_limit))
+        self.assertEqual([(argument.name, argument.fields)
+                          for argument in diff.changed[0].changed_arguments],
+                         [('limit', ('is_arg',))])
+
+    @unittest.skipUnless(six.PY3, "keyword only arguments are python 3 only")
+    def test_it_should_report_keyword_only_arguments_that_become_optional(self):
+        namespace = {}
+        exec("def mandatory(*, limit):\n    pass\n\n\n"
+             "def optional(*, limit=None):\n    pass\n", namespace)
+        self.assertNotEqual(get_func_inspect_result(namespace['mandatory']).fingerprint,
+                            get_func_inspect_result(namespace['optional']).fingerprint)
+
+    def test_it_should_compare_live_and_static_defaults_by_repr(self):
+        module = static_inspections_fixture_test
+        live = [get_func_inspect_result(func) for func in get_module_functions(module)]
+        diff = diff_modules(live, get_static_inspect_results(module.__name__))
+        # Only the default that is not a literal, its source is not the repr of its value
+        self.assertEqual([(change.name, [argument.name for argument in change.changed_arguments])
+                          for change in diff.changed], [('func_with_defaults', ['timeout'])])
+
+
+class TestDiffFunctions(unittest.TestCase):
+    """
+    Test suite for function `diff_functions`
+    """
+
+    def test_it_should_report_documentation_changes(self):
+        change = diff_functions(get_func_inspect_result(post), get_func_inspect_result(delete))
+        self.assertEqual(change.name, 'delete')
+        self.assertEqual(change.fields, ('short_description',))
+        self.assertEqual(change.removed_arguments, ['sentinel'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,221 @@
+# -* coding: utf-8 *-
+"""
+:py:mod:`pynspector.disk_cache`
+-------------------------------
+Persistent cache for module inspections.
+
+Inspection results of a module are stored on a local directory together with the fingerprints
+(path, modification time, size and content hash) of its source file and of the files defining the
+functions it re-exports, and the pynspector version. Modules are only imported and inspected
+again when one of those fingerprints changes.
+
+Entries never reference objects from the inspected modules, so reading them doesn't import
+anything: default values that are not plain builtin values are stored as their repr
+(models.DefaultRepr).
+"""
+# System imports
+import hashlib
+import importlib
+import io
+import os
+import pickle
+
+# Third-party imports
+# Local imports
+from . import __version__
+from . import models
+from . import stats
+from .doc_parsers import sphinx_doc_parser
+from .func_inspections import get_func_inspect_result
+from .module_inspections import get_module_functions
+from .static_inspections import find_module_path
+
+
+__all__ = ['DiskCache']
+
+
+_replace = getattr(os, 'replace', os.rename)
+
+
+class DiskCache(object):
+    """On disk cache for module inspections
+
+    Example:
+    >>> cache = DiskCache('.pynspector_cache')
+    >>> functions = cache.inspect_module('mypackage.handlers')  # Imported and inspected
+    >>> functions = cache.inspect_module('mypackage.handlers')  # Read from disk, not imported
+    """
+
+    def __init__(self, directory, doc_parser=sphinx_doc_parser, include_source=True):
+        """ Initialize DiskCache object
+
+        :param str directory: Directory where the cache files are stored, created if needed
+        :param function doc_parser: Parser used to parse the docstrings
+        :param bool include_source: Store the source code of the functions
+        """
+        self.directory = directory
+        self.doc_parser = doc_parser
+        self.include_source = include_source
+        self.hits = 0
+        self.misses = 0
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def inspect_module(self, module_name):
+        """Get the inspect results for the public functions of a module
+
+        Results are read from the cache if the module source didn't change, otherwise the module
+        is imported, inspected and the results are stored.
+
+        :param str module_name: Dotted name of the module
+        :return: List of models.Function, ``func`` is None for results read from the cache
+        :rtype: list
+        """
+        functions = self.get(module_name)
+        if functions is not None:
+            return functions
+        # Taken before importing, so changes made while importing make the entry stale
+        try:
+            source = _get_fingerprint(os.path.abspath(find_module_path(module_name)))
+        except (ImportError, IOError, OSError):
+            source = None  # Modules without a source file can't be cached
+        module = importlib.import_module(module_name)
+        functions = [get_func_inspect_result(func, doc_parser=self.doc_parser)
+                     for func in get_module_functions(module)]
+        if source is not None:
+            try:
+                self._set(module_name, functions, source)
+            except (IOError, OSError):
+                pass
+        return functions
+
+    def get(self, module_name):
+        """Get the cached inspect results for a module, if its source didn't change
+
+        :param str module_name: Dotted name of the module
+        :return: List of models.Function or None if there's no valid entry
+        :rtype: list
+        """
+        entry = self._load(module_name)
+        if entry is None or not self._is_fresh(module_name, entry):
+            self.misses += 1
+            stats.miss('disk_cache')
+            return None
+        self.hits += 1
+        stats.hit('disk_cache')
+        return [models.Function.from_record(record) for record in entry['records']]
+
+    def set(self, module_name, functions, path=None):
+        """Store the inspect results for a module
+
+        :param str module_name: Dotted name of the module
+        :param list functions: List of models.Function
+        :param str path: Source file of the module, found from the module name by default
+        """
+        path = os.path.abspath(_source_path(path) if path else find_module_path(module_name))
+        self._set(module_name, functions, _get_fingerprint(path))
+
+    def _set(self, module_name, functions, source):
+        files = [source]
+        paths = {source['path']}
+        for function in functions:
+            location = function.source_location
+            if location is None:
+                continue
+            path = os.path.abspath(_source_path(location[0]))
+            if path not in paths:
+                paths.add(path)
+                try:
+                    files.append(_get_fingerprint(path))
+                except (IOError, OSError):
+                    pass  # Functions created from strings have no file to check
+        records = [function.to_record(include_source=self.include_source).to_plain()
+                   for function in functions]
+        entry = dict(self._key(module_name), files=files, records=records)
+        self._store(module_name, pickle.dumps(entry, pickle.HIGHEST_PROTOCOL))
+
+    def clear(self):
+        """Remove all the cached entries"""
+        for filename in os.listdir(self.directory):
+            if filename.endswith('.pickle'):
+                os.remove(os.path.join(self.directory, filename))
+
+    def _key(self, module_name):
+        return {
+            'module': module_name,
+            'version': __version__,
+            'doc_parser': '%s.%s' % (getattr(self.doc_parser, '__module__', None),
+                                     getattr(self.doc_parser, '__name__', None)),
+            'include_source': self.include_source,
+        }
+
+    def _filename(self, module_name):
+        return os.path.join(self.directory,
+                            hashlib.sha1(module_name.encode('utf-8')).hexdigest() + '.pickle')
+
+    def _load(self, module_name):
+        try:
+            with io.open(self._filename(module_name), 'rb') as cache_file:
+                entry = pickle.load(cache_file)
+        except Exception:
+            return None
+        key = self._key(module_name)
+        if any(entry.get(name) != value for name, value in key.items()):
+            return None
+        return entry
+
+    def _is_fresh(self, module_name, entry):
+        """Check if the module source and the files defining its functions match the
+        fingerprints of a cache entry
+
+        Modification time and size are checked first, the content hash is only computed when
+        they differ (a file that was touched but not modified is still fresh).
+        """
+        files = entry.get('files')
+        try:
+            path = os.path.abspath(find_module_path(module_name))
+        except ImportError:
+            return False
+        if not files or path != files[0]['path']:
+            return False
+        touched = False
+        for fingerprint in files:
+            try:
+                stat = os.stat(fingerprint['path'])
+            except OSError:
+                return False
+            if stat.st_size != fingerprint['size']:
+                return False
+            if stat.st_mtime == fingerprint['mtime']:
+                continue
+            with io.open(fingerprint['path'], 'rb') as source_file:
+                if hashlib.sha1(source_file.read()).hexdigest() != fingerprint['hash']:
+                    return False
+            fingerprint['mtime'] = stat.st_mtime
+            touched = True
+        if touched:
+            self._store(module_name, pickle.dumps(entry, pickle.HIGHEST_PROTOCOL))
+        return True
+
+    def _store(self, module_name, data):
+        # Write to a temporary file first, so readers never see a partial entry
+        filename = self._filename(module_name)
+        with io.open(filename + '.tmp', 'wb') as cache_file:
+            cache_file.write(data)
+        _replace(filename + '.tmp', filename)
+
+
+def _get_fingerprint(path):
+    """Get the fingerprint of a source file: path, modification time, size and content hash"""
+    stat = os.stat(path)
+    with io.open(path, 'rb') as source_file:
+        content = source_file.read()
+    return {'path': path, 'mtime': stat.st_mtime, 'size': stat.st_size,
+            'hash': hashlib.sha1(content).hexdigest()}
+
+
+def _source_path(path):
+    # Modules imported from bytecode report the .pyc file
+    if path.endswith(('.pyc', '.pyo')):
+        return path[:-1]
+    return path
@@ -0,0 +1,123 @@
+# -* coding: utf-8 *-
+"""
+Set of tests for disk cache module
+"""
+# System imports
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Third-party imports
+# Local imports
+from pynspector.disk_cache import DiskCache
+
+
+HANDLERS_SOURCE = '''
+import threading
+
+
+def get(request, retries=3, lock=threading.Lock):
+    """Get handler
+
+    :param request: The request
+    """
+    return request
+'''
+
+
+class TestDiskCache(unittest.TestCase):
+    """
+    Test suite for class `DiskCache`
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.source_path = os.path.join(self.directory, 'cached_handlers.py')
+        self._write(HANDLERS_SOURCE)
+        sys.path.insert(0, self.directory)
+        self.addCleanup(sys.path.remove, self.directory)
+        self.addCleanup(self._unload)
+        self.cache_directory = os.path.join(self.directory, 'cache')
+
+    def _write(self, content, name='cached_handlers'):
+        with open(os.path.join(self.directory, name + '.py'), 'w') as module_file:
+            module_file.write(content)
+
+    def _unload(self):
+        sys.modules.pop('cached_handlers', None)
+        sys.modules.pop('cached_helpers', None)
+
+    def _inspect(self):
+        cache = DiskCache(self.cache_directory)
+        return cache, cache.inspect_module('cached_handlers')
+
+    def test_it_should_inspect_on_first_run(self):
+        cache, functions = self._inspect()
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        self.assertEqual(['get'], [function.name for function in functions])
+        self.assertIn('cached_handlers', sys.modules)
+
+    def test_it_should_not_import_on_warm_runs(self):
+        self._inspect()
+        self._unload()
+        cache, functions = self._inspect()
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+        self.assertNotIn('cached_handlers', sys.modules)
+        self.assertEqual('The request', functions[0].arguments[0].description)
+        self.assertEqual(3, functions[0].arguments[1].default)
+        self.assertIn('def get(request', functions[0].source_code)
+        self.assertIsNone(functions[0].func)
+
+    def test_it_should_store_non_builtin_defaults_as_repr(self):
+        self._inspect()
+        _, functions = self._inspect()
+        self.assertIsInstance(functions[0].arguments[2].default, str)
+
+    def test_it_should_inspect_again_when_source_changes(self):
+        self._inspect()
+        self._unload()
+        self._write(HANDLERS_SOURCE.replace('retries=3', 'retries=5, timeout=1'))
+        cache, functions = self._inspect()
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        self.assertEqual(5, functions[0].arguments[1].default)
+
+    def test_it_should_use_content_hash_when_only_mtime_changes(self):
+        self._inspect()
+        self._unload()
+        stat = os.stat(self.source_path)
+        os.utime(self.source_path, (stat.st_atime, stat.st_mtime + 10))
+        cache, _ = self._inspect()
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+        self.assertNotIn('cached_handlers', sys.modules)
+
+    def test_it_should_miss_with_another_doc_parser(self):
+        self._inspect()
+        cache = DiskCache(self.cache_directory, doc_parser=lambda docstring: ('', '', {}, ''))
+        self.assertIsNone(cache.get('cached_handlers'))
+
+    def test_it_should_inspect_again_when_a_reexported_function_changes(self):
+        self._write('def helper(foo):\n    return foo\n', name='cached_helpers')
+        self._write(HANDLERS_SOURCE + 'from cached_helpers import helper\n')
+        self._inspect()
+        self._unload()
+        self._write('def helper(foo, bar=1):\n    return foo\n', name='cached_helpers')
+        cache, functions = self._inspect()
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        self.assertEqual(['foo', 'bar'],
+                         [argument.name for argument in functions[1].arguments])
+
+    def test_it_should_take_the_fingerprint_before_importing(self):
+        # The module changes its own source while it's being imported
+        self._write(HANDLERS_SOURCE + 'with open(__file__, "a") as source:\n'
+                                      '    source.write("# Imported\\n")\n')
+        self._inspect()
+        self._unload()
+        cache, _ = self._inspect()
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,31 +6,80 @@ Here you will find parsers for docstrings, this will help you to retrieve all
 arguments, types and descriptions defined on docstrings.
 
 You can use different parsers such as:
-- sphinx_doc_parser
+- sphinx_doc_parser: ``:param str name: description`` fields.
+- google_doc_parser: ``Args:``, ``Returns:`` and ``Raises:`` sections.
+- numpy_doc_parser: ``Parameters``, ``Returns`` and ``Raises`` sections underlined with dashes.
+- auto_doc_parser: Detects the style of every docstring and parses it with the parser registered
+  for that style, so codebases mixing styles are parsed once per docstring.
+
+Parsers for other styles, or replacements for the default ones, are registered with
+register_doc_parser.
 """
 # System imports
 import re
 import sys
+from collections import namedtuple
 
 # Third-party imports
 # Local imports
+from . import stats
+
+
+__all__ = ['sphinx_doc_parser', 'google_doc_parser', 'numpy_doc_parser', 'auto_doc_parser',
+           'detect_doc_style', 'register_doc_parser', 'get_doc_parser', 'ParsedDocstring']
+
+
+# Matches a field list line, such as ":param str name: description" or ":returns: description".
+# Other roles and fields, such as ":class:`Foo`" or ":note:", are kept as text
+FIELD_REGEX = re.compile(r":(?P<field>param|type|returns|return|rtype|raises|raise)"
+                         r"(?P<argument>(?:\s[^:]*)?):(?P<body>.*)")
+
+# Google style section header and entries, such as "Args:" and "name (str): description"
+GOOGLE_SECTION_REGEX = re.compile(r"(?P<section>[A-Z][A-Za-z ]*):\s*$")
+GOOGLE_PARAM_REGEX = re.compile(r"(?P<name>\*{0,2}\w+)\s*(?:\((?P<type>[^)]*)\))?\s*:\s*(?P<doc>.*)")
+GOOGLE_RETURN_REGEX = re.compile(r"(?P<type>[\w.]+(?:\[.*\])?):\s+(?P<doc>.*)")
 
+# Numpy style section underline
+NUMPY_UNDERLINE_REGEX = re.compile(r"\s*-{3,}\s*$")
 
-__all__ = ['sphinx_doc_parser']
+# Section name to the part of the result it fills
+_GOOGLE_SECTIONS = {
+    'args': 'params', 'arguments': 'params', 'parameters': 'params', 'keyword args': 'params',
+    'keyword arguments': 'params', 'other parameters': 'params',
+    'returns': 'returns', 'return': 'returns', 'yields': 'returns', 'raises': 'raises',
+}
+_NUMPY_SECTIONS = {
+    'parameters': 'params', 'other parameters': 'params', 'returns': 'returns',
+    'yields': 'returns', 'raises': 'raises',
+}
 
+# Markers of every style, searched on the raw docstring by detect_doc_style
+_SPHINX_MARKERS = (':param', ':return', ':rtype', ':raise', ':type')
+_NUMPY_MARKER_REGEX = re.compile(r"^\s*(?:Parameters|Returns|Yields|Raises)\s*\n\s*-{3,}", re.M)
+_GOOGLE_MARKER_REGEX = re.compile(r"^\s*(?:Args|Arguments|Returns|Yields|Raises):\s*$", re.M)
+
+
+class ParsedDocstring(namedtuple('ParsedDocstring',
+                                 ['short_description', 'long_description', 'params', 'returns'])):
+    """Result of parsing a docstring
+
+    It behaves as a tuple of (short_description, long_description, params, returns), so it can be
+    unpacked as parsers always did. Return type and raised exceptions are available as attributes:
+
+    - rtype: Return type, None when not documented.
+    - raises: Dictionary with exception as key and description as value.
+    """
 
-PARAM_OR_RETURNS_REGEX = re.compile(r":(?:param|returns|return)")
-RETURNS_REGEX = re.compile(
-    r":(returns|return): (?P<doc>.*)(?:(?=:param)|(?=:raises)|(?=:rtype)|(?=:type)|\Z)", re.S
-)
-TYPE_REGEX = re.compile(
-    r":type (?P<name>[\*\w]+): (?P<type>.*?)(?:(?=:param)|"
-    r"(?=:return)|(?=:returns)|(?=:raises)|(?=:rtype)|\Z)", re.S
-)
-PARAM_REGEX = re.compile(
-    r":param (?P<type>.*?)(?P<name>[\*\w]+): (?P<doc>.*?)(?:(?=:param)|"
-    r"(?=:return)|(?=:returns)|(?=:raises)|(?=:rtype)|(?=:type)|\Z)", re.S
-)
+    def __new__(cls, short_description, long_description, params, returns, rtype=None,
+                raises=None):
+        self = super(ParsedDocstring, cls).__new__(cls, short_description, long_description,
+                                                   params, returns)
+        self.rtype = rtype
+        self.raises = raises or {}
+        return self
+
+    def __getnewargs__(self):
+        return tuple(self) + (self.rtype, self.raises)
 
 
 def _trim(docstring):
@@ -70,11 +119,6 @@ def _trim(docstring):
     return "\n".join(trimmed)
 
 
-def _reindent(string):
-    """Reindent string"""
-    return "\n".join(l.strip() for l in string.strip().split("\n"))
-
-
 def sphinx_doc_parser(docstring):
     """Parse docstring and return short, long and arguments for this function
     
@@ -97,46 +141,305 @@ def sphinx_doc_parser(docstring):
     - The long description is optional, it will report "" if there's no long description available.
     - The param type is not mandatory, if there's no type for a param, it will report it as None.
     - The return statement could be also "returns", both works fine.
+    - Return type (`:rtype:`) and exceptions (`:raises Exception:`) are available as attributes of
+      the result.
+
+    The docstring is read line by line in a single pass, a field ends where the next line
+    starting with a field marker begins. Only ``param``, ``type``, ``return(s)``, ``rtype`` and
+    ``raise(s)`` are fields, lines starting with other roles are part of the description or of
+    the field they follow.
 
     :param str docstring: Docstring in string format
     :returns: Tuple with short_description, long_description, params, returns
-    :rtype: tuple
+    :rtype: ParsedDocstring
     """
     short_description = long_description = returns = ""
     params = {}
+    rtype = None
+    raises = {}
+
+    if not docstring:
+        return ParsedDocstring(short_description, long_description, params, returns)
 
-    if docstring:
-        docstring = _trim(docstring)
+    lines = stats.measure('trim', _trim, docstring).split("\n")
+    short_description = lines[0]
 
-        lines = docstring.split("\n", 1)
-        short_description = lines[0]
+    # Single pass over the lines, splitting the description from the field list,
+    # every field keeps the lines that belong to it.
+    description_lines = []
+    fields = []
+    field_lines = None
+    for line in lines[1:]:
+        stripped = line.strip()
+        match = FIELD_REGEX.match(stripped) if stripped.startswith(':') else None
+        if match:
+            field_lines = [match.group('body').strip()]
+            fields.append((match.group('field'), match.group('argument').strip(), field_lines))
+        elif field_lines is not None:
+            field_lines.append(stripped)
+        else:
+            description_lines.append(line)
+    long_description = "\n".join(description_lines).strip()
 
-        if len(lines) > 1:
-            long_description = lines[1].strip()
+    typed_params = set()
+    for field, argument, field_lines in fields:
+        if field == 'param' and argument:
+            type_and_name = argument.rsplit(None, 1)
+            param = params.setdefault(type_and_name[-1], {'doc': '', 'type': None})
+            param['doc'] = ' '.join(line for line in field_lines if line)
+            if type_and_name[-1] not in typed_params:
+                param['type'] = type_and_name[0] if len(type_and_name) > 1 else None
+        elif field == 'type' and argument:
+            params.setdefault(argument, {'doc': '', 'type': None})
+            params[argument]['type'] = ' '.join(line for line in field_lines if line)
+            typed_params.add(argument)
+        elif field in ('returns', 'return'):
+            if not returns:
+                returns = "\n".join(field_lines).strip()
+        elif field == 'rtype':
+            rtype = ' '.join(line for line in field_lines if line)
+        elif field in ('raises', 'raise'):
+            raises[argument] = ' '.join(line for line in field_lines if line)
 
-            params_returns_desc = None
+    return ParsedDocstring(short_description, long_description, params, returns, rtype, raises)
 
-            match = PARAM_OR_RETURNS_REGEX.search(long_description)
-            if match:
-                long_desc_end = match.start()
-                params_returns_desc = long_description[long_desc_end:].strip()
-                long_description = long_description[:long_desc_end].rstrip()
 
-            if params_returns_desc:
-                params = {}
-                for type_, name, doc in PARAM_REGEX.findall(params_returns_desc):
-                    params[name] = {'doc': ' '.join(_trim(doc).split('\n')),
-                                    'type': type_.strip() if type_ else None}
+def google_doc_parser(docstring):
+    """Parse a Google style docstring
+
+    ```
+    Title of the docstring
 
-                match = RETURNS_REGEX.search(params_returns_desc)
+    Long description goes here.
+
+    Args:
+        argument_one (str): Argument one description
+        argument_two: Argument two description,
+            with multiline support.
+
+    Returns:
+        bool: What the function returns
+
+    Raises:
+        ValueError: When it fails
+    ```
+
+    Sections other than arguments, returns and raises are kept on the long description.
+
+    :param str docstring: Docstring in string format
+    :returns: Tuple with short_description, long_description, params, returns
+    :rtype: ParsedDocstring
+    """
+    if not docstring:
+        return ParsedDocstring("", "", {}, "")
+    lines = stats.measure('trim', _trim, docstring).split("\n")
+
+    description_lines = []
+    sections = []
+    section_lines = None
+    for line in lines[1:]:
+        match = GOOGLE_SECTION_REGEX.match(line)
+        section = _GOOGLE_SECTIONS.get(match.group('section').lower()) if match else None
+        if section:
+            section_lines = []
+            sections.append((section, section_lines))
+        elif section_lines is not None and (not line or line[0].isspace()):
+            section_lines.append(line)
+        else:
+            section_lines = None
+            description_lines.append(line)
+
+    params, returns, rtype, raises = {}, "", None, {}
+    for section, section_lines in sections:
+        entries = _split_entries(section_lines)
+        if section == 'params':
+            for head, body in entries:
+                match = GOOGLE_PARAM_REGEX.match(head)
                 if match:
-                    returns = _reindent(match.group("doc"))
+                    params[match.group('name').lstrip('*')] = {
+                        'doc': ' '.join([match.group('doc')] + body).strip(),
+                        'type': match.group('type'),
+                    }
+        elif section == 'returns' and entries and not returns:
+            head, body = entries[0]
+            match = GOOGLE_RETURN_REGEX.match(head)
+            if match:
+                rtype, head = match.group('type'), match.group('doc')
+            returns = "\n".join([head] + body).strip()
+        elif section == 'raises':
+            for head, body in entries:
+                name, _, doc = head.partition(':')
+                raises[name.strip()] = ' '.join([doc.strip()] + body).strip()
+
+    return ParsedDocstring(lines[0], "\n".join(description_lines).strip(), params, returns,
+                           rtype, raises)
+
+
+def numpy_doc_parser(docstring):
+    """Parse a NumPy style docstring
+
+    ```
+    Title of the docstring
+
+    Long description goes here.
 
-                for name, type_ in TYPE_REGEX.findall(params_returns_desc):
-                    type_ = type_.strip()
-                    if name in params:
-                        params[name].update({'type': type_})
-                    else:
-                        params[name] = {'doc':'', 'type': type_}
+    Parameters
+    ----------
+    argument_one : str
+        Argument one description
+    argument_two
+        Argument two description
 
-    return short_description, long_description, params, returns
+    Returns
+    -------
+    bool
+        What the function returns
+    ```
+
+    Sections other than parameters, returns and raises are kept on the long description.
+
+    :param str docstring: Docstring in string format
+    :returns: Tuple with short_description, long_description, params, returns
+    :rtype: ParsedDocstring
+    """
+    if not docstring:
+        return ParsedDocstring("", "", {}, "")
+    lines = stats.measure('trim', _trim, docstring).split("\n")
+
+    description_lines = []
+    sections = []
+    section_lines = None
+    index = 1
+    while index < len(lines):
+        line = lines[index]
+        if line and index + 1 < len(lines) and NUMPY_UNDERLINE_REGEX.match(lines[index + 1]):
+            section = _NUMPY_SECTIONS.get(line.strip().lower())
+            if section:
+                section_lines = []
+                sections.append((section, section_lines))
+                index += 2
+                continue
+            section_lines = None  # Other sections are part of the description
+        if section_lines is not None:
+            section_lines.append(line)
+        else:
+            description_lines.append(line)
+        index += 1
+
+    params, returns, rtype, raises = {}, "", None, {}
+    for section, section_lines in sections:
+        entries = _split_entries(section_lines)
+        if section == 'params':
+            for head, body in entries:
+                names, _, kind = head.partition(':')
+                for name in names.split(','):
+                    params[name.strip().lstrip('*')] = {'doc': ' '.join(body),
+                                                        'type': kind.strip() or None}
+        elif section == 'returns' and entries and not returns:
+            head, body = entries[0]
+            name, separator, kind = head.partition(':')
+            rtype = (kind if separator else name).strip() or None
+            returns = "\n".join(body)
+        elif section == 'raises':
+            for head, body in entries:
+                raises[head.strip()] = ' '.join(body)
+
+    return ParsedDocstring(lines[0], "\n".join(description_lines).strip(), params, returns,
+                           rtype, raises)
+
+
+def _split_entries(lines):
+    """Split the lines of a section into entries
+
+    An entry starts on every line indented as the first one, the lines indented deeper are its
+    body.
+
+    :param list lines: Lines of the section
+    :return: List of tuples with the first line and the list of body lines, stripped
+    :rtype: list
+    """
+    entries = []
+    indentation = None
+    for line in lines:
+        stripped = line.strip()
+        if not stripped:
+            continue
+        line_indentation = len(line) - len(line.lstrip())
+        if indentation is None:
+            indentation = line_indentation
+        if line_indentation <= indentation:
+            entries.append((stripped, []))
+        else:
+            entries[-1][1].append(stripped)
+    return entries
+
+
+_doc_parsers = {
+    'sphinx': sphinx_doc_parser,
+    'google': google_doc_parser,
+    'numpy': numpy_doc_parser,
+}
+
+
+def register_doc_parser(style, parser):
+    """Register the parser for a docstring style, used by auto_doc_parser
+
+    Example:
+    >>> register_doc_parser('google', my_google_parser)
+
+    :param str style: Style name, sphinx, google, numpy or a new one
+    :param function parser: Parser for the style
+    """
+    _doc_parsers[style] = parser
+
+
+def get_doc_parser(style):
+    """Get the parser registered for a docstring style
+
+    :param str style: Style name
+    :return: Parser for the style
+    :rtype: function
+    :raises ValueError: If there's no parser for the style
+    """
+    try:
+        return _doc_parsers[style]
+    except KeyError:
+        raise ValueError("No doc parser registered for style %r" % style)
+
+
+def detect_doc_style(docstring):
+    """Detect the style of a docstring
+
+    Only a few cheap markers are looked for, without parsing the docstring: sphinx fields
+    (``:param``, ``:return``...), numpy underlined sections (``Parameters`` followed by
+    ``----``) and google sections (``Args:``, ``Returns:``...). Docstrings without any marker are
+    reported as sphinx, all the parsers read their descriptions the same way.
+
+    :param str docstring: Docstring in string format
+    :return: sphinx, google or numpy
+    :rtype: str
+    """
+    if not docstring:
+        return 'sphinx'
+    if any(marker in docstring for marker in _SPHINX_MARKERS):
+        return 'sphinx'
+    if '---' in docstring and _NUMPY_MARKER_REGEX.search(docstring):
+        return 'numpy'
+    if ':' in docstring and _GOOGLE_MARKER_REGEX.search(docstring):
+        return 'google'
+    return 'sphinx'
+
+
+def auto_doc_parser(docstring):
+    """Parse a docstring with the parser registered for its style
+
+    Every docstring is parsed once, by the parser of the style found by detect_doc_style.
+
+    Example:
+    >>> get_func_inspect_result(func, doc_parser=auto_doc_parser)
+
+    :param str docstring: Docstring in string format
+    :returns: Tuple with short_description, long_description, params, returns
+    :rtype: ParsedDocstring
+    """
+    return _doc_parsers[detect_doc_style(docstring)](docstring)
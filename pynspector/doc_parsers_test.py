@@ -7,7 +7,51 @@ import unittest
 
 # Third-party imports
 # Local imports
-from pynspector.doc_parsers import sphinx_doc_parser
+from pynspector.doc_parsers import (
+    auto_doc_parser, detect_doc_style, get_doc_parser, google_doc_parser, numpy_doc_parser,
+    register_doc_parser, sphinx_doc_parser
+)
+
+
+GOOGLE_DOCSTRING = """Fetch rows
+
+    Rows are read from the
+    given table.
+
+    Args:
+        table (str): Table name
+        keys: Keys to fetch,
+            one per row.
+        **options: Extra options
+
+    Returns:
+        dict: Rows by key
+
+    Raises:
+        KeyError: When a key is missing
+    """
+
+NUMPY_DOCSTRING = """Fetch rows
+
+    Rows are read from the given table.
+
+    Parameters
+    ----------
+    table : str
+        Table name
+    keys, defaults : list
+        Keys to fetch,
+        one per row.
+
+    Returns
+    -------
+    dict
+        Rows by key
+
+    Examples
+    --------
+    >>> fetch('users', [1])
+    """
 
 
 class TestSphinxDocParser(unittest.TestCase):
@@ -93,6 +137,150 @@ class TestSphinxDocParser(unittest.TestCase):
         _, long_, _, _ = sphinx_doc_parser(docstring)
         self.assertEqual('Subtitle could be\nmultiline.', long_)
 
+    def test_multiline_param_description(self):
+        docstring = """
+            Title
+
+            :param foo: Description foo
+                continues here
+            :param bar: Description bar
+        """
+        _, _, params, _ = sphinx_doc_parser(docstring)
+        self.assertEqual('Description foo continues here', params['foo']['doc'])
+        self.assertEqual('Description bar', params['bar']['doc'])
+
+    def test_type_statement_before_param(self):
+        docstring = """
+            Title
+
+            :type foo: bool
+            :param str foo: Description foo
+        """
+        _, _, params, _ = sphinx_doc_parser(docstring)
+        self.assertEqual({'foo': {'doc': 'Description foo', 'type': 'bool'}}, params)
+
+    def test_should_accept_rtype_and_raises_statements(self):
+        docstring = """
+            Title
+
+            :param foo: Description foo
+            :returns: Here goes the return
+            :rtype: int
+            :raises ValueError: When foo is wrong
+        """
+        result = sphinx_doc_parser(docstring)
+        self.assertEqual('Here goes the return', result.returns)
+        self.assertEqual('int', result.rtype)
+        self.assertEqual({'ValueError': 'When foo is wrong'}, result.raises)
+
+    def test_field_markers_in_description_are_not_fields(self):
+        docstring = """
+            Title
+
+            Long description mentioning :param foo: inline.
+
+            :param foo: Description foo
+        """
+        _, long_, params, _ = sphinx_doc_parser(docstring)
+        self.assertEqual('Long description mentioning :param foo: inline.', long_)
+        self.assertEqual({'foo': {'doc': 'Description foo', 'type': None}}, params)
+
+    def test_roles_at_line_start_are_not_fields(self):
+        docstring = """
+            Title
+
+            Uses the
+            :class:`Foo` helper to do things.
+
+            :param foo: Description foo
+        """
+        _, long_, params, _ = sphinx_doc_parser(docstring)
+        self.assertEqual('Uses the\n:class:`Foo` helper to do things.', long_)
+        self.assertEqual({'foo': {'doc': 'Description foo', 'type': None}}, params)
+
+    def test_unknown_fields_are_kept_on_the_description(self):
+        docstring = """
+            Title
+
+            Long description.
+
+            :note: Be careful
+            :seealso: other_function
+            :param foo: Description foo
+                :class:`Foo` instance
+        """
+        _, long_, params, _ = sphinx_doc_parser(docstring)
+        self.assertEqual('Long description.\n\n:note: Be careful\n:seealso: other_function', long_)
+        self.assertEqual('Description foo :class:`Foo` instance', params['foo']['doc'])
+
+
+class TestGoogleDocParser(unittest.TestCase):
+    def test_it_should_return_descriptions(self):
+        short_description, long_description, _, _ = google_doc_parser(GOOGLE_DOCSTRING)
+        self.assertEqual(short_description, 'Fetch rows')
+        self.assertEqual(long_description, 'Rows are read from the\ngiven table.')
+
+    def test_it_should_return_params(self):
+        _, _, params, _ = google_doc_parser(GOOGLE_DOCSTRING)
+        self.assertEqual(params, {
+            'table': {'doc': 'Table name', 'type': 'str'},
+            'keys': {'doc': 'Keys to fetch, one per row.', 'type': None},
+            'options': {'doc': 'Extra options', 'type': None},
+        })
+
+    def test_it_should_return_returns_and_raises(self):
+        parsed = google_doc_parser(GOOGLE_DOCSTRING)
+        self.assertEqual((parsed.returns, parsed.rtype), ('Rows by key', 'dict'))
+        self.assertEqual(parsed.raises, {'KeyError': 'When a key is missing'})
+
+    def test_it_should_accept_empty_docstrings(self):
+        self.assertEqual(google_doc_parser(None), ('', '', {}, ''))
+
+
+class TestNumpyDocParser(unittest.TestCase):
+    def test_it_should_keep_other_sections_on_the_long_description(self):
+        _, long_description, _, _ = numpy_doc_parser(NUMPY_DOCSTRING)
+        self.assertEqual(long_description, 'Rows are read from the given table.\n\n'
+                                           'Examples\n--------\n>>> fetch(\'users\', [1])')
+
+    def test_it_should_return_params(self):
+        _, _, params, _ = numpy_doc_parser(NUMPY_DOCSTRING)
+        self.assertEqual(params, {
+            'table': {'doc': 'Table name', 'type': 'str'},
+            'keys': {'doc': 'Keys to fetch, one per row.', 'type': 'list'},
+            'defaults': {'doc': 'Keys to fetch, one per row.', 'type': 'list'},
+        })
+
+    def test_it_should_return_returns(self):
+        parsed = numpy_doc_parser(NUMPY_DOCSTRING)
+        self.assertEqual((parsed.returns, parsed.rtype), ('Rows by key', 'dict'))
+
+
+class TestDocStyles(unittest.TestCase):
+    def test_it_should_detect_styles(self):
+        self.assertEqual(detect_doc_style(GOOGLE_DOCSTRING), 'google')
+        self.assertEqual(detect_doc_style(NUMPY_DOCSTRING), 'numpy')
+        self.assertEqual(detect_doc_style('Title\n\n:param str name: Name'), 'sphinx')
+        self.assertEqual(detect_doc_style('Just a title'), 'sphinx')
+        self.assertEqual(detect_doc_style(None), 'sphinx')
+
+    def test_auto_parser_should_parse_once_with_the_detected_style(self):
+        calls = []
+
+        def parser(docstring):
+            calls.append(docstring)
+            return google_doc_parser(docstring)
+
+        register_doc_parser('google', parser)
+        self.addCleanup(register_doc_parser, 'google', google_doc_parser)
+        self.assertEqual(auto_doc_parser(GOOGLE_DOCSTRING), google_doc_parser(GOOGLE_DOCSTRING))
+        self.assertEqual(calls, [GOOGLE_DOCSTRING])
+        self.assertEqual(auto_doc_parser(NUMPY_DOCSTRING), numpy_doc_parser(NUMPY_DOCSTRING))
+
+    def test_it_should_reject_unknown_styles(self):
+        self.assertIs(get_doc_parser('sphinx'), sphinx_doc_parser)
+        self.assertRaises(ValueError, get_doc_parser, 'epytext')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -5,16 +5,53 @@
 Main module for inspecting functions
 """
 # System imports
+import ast
+import functools
 import inspect
+import linecache
+import tokenize
+import types
+from collections import namedtuple
+
 import six
 
 # Third-party imports
 # Local imports
 from . import models
+from . import stats
+from .cache import NegativeCache
 from .doc_parsers import sphinx_doc_parser
 
 
-__all__ = ['get_function_args', 'get_default_args']
+__all__ = ['get_function_args', 'get_default_args', 'get_parameters', 'get_func_inspect_result',
+           'build_func_inspect_result', 'get_argument_records', 'inspect_many', 'get_name',
+           'get_doc',
+           'Parameter', 'EMPTY', 'POSITIONAL_ONLY', 'POSITIONAL_OR_KEYWORD', 'VAR_POSITIONAL',
+           'KEYWORD_ONLY', 'VAR_KEYWORD']
+
+
+POSITIONAL_ONLY = 'POSITIONAL_ONLY'
+POSITIONAL_OR_KEYWORD = 'POSITIONAL_OR_KEYWORD'
+VAR_POSITIONAL = 'VAR_POSITIONAL'
+KEYWORD_ONLY = 'KEYWORD_ONLY'
+VAR_KEYWORD = 'VAR_KEYWORD'
+
+# Default value for parameters without default
+EMPTY = inspect.Parameter.empty if six.PY3 else type('EMPTY', (object,), {})
+
+Parameter = namedtuple('Parameter', ['name', 'kind', 'default'])
+
+if six.PY3:
+    _SIGNATURE_KINDS = {
+        inspect.Parameter.POSITIONAL_ONLY: POSITIONAL_ONLY,
+        inspect.Parameter.POSITIONAL_OR_KEYWORD: POSITIONAL_OR_KEYWORD,
+        inspect.Parameter.VAR_POSITIONAL: VAR_POSITIONAL,
+        inspect.Parameter.KEYWORD_ONLY: KEYWORD_ONLY,
+        inspect.Parameter.VAR_KEYWORD: VAR_KEYWORD,
+    }
+
+# Callables whose signature couldn't be resolved, with the parameters found by the fallbacks
+_unresolved_signatures = NegativeCache(maxsize=4096)
 
 
 def get_default_args(func):
@@ -33,15 +70,9 @@ def get_default_args(func):
     :return: Dictionary with argument as key and default value as value
     :rtype: dict
     """
-    if six.PY3:
-        func_sign = inspect.signature(func)
-        return {param.name: param.default
-                for param in func_sign.parameters.values()
-                if param.default is not inspect._empty}
-    args, _, _, defaults = inspect.getargspec(func)
-    if not defaults:
-        return {}
-    return dict(zip(args[-len(defaults):], defaults))
+    return {param.name: param.default
+            for param in get_parameters(func)
+            if param.default is not EMPTY}
 
 
 def get_function_args(func):
@@ -57,36 +88,388 @@ def get_function_args(func):
     :return: List of arguments
     :rtype: list
     """
+    return [param.name for param in get_parameters(func)]
+
+
+def get_parameters(func):
+    """ Get name, kind and default value of every parameter of a function
+
+    Plain python functions are resolved in a single pass reading their code object,
+    ``__defaults__`` and ``__kwdefaults__``. Wrapped functions, partials, methods and builtins
+    fall back to ``inspect.signature``. When it fails, partials and ``__wrapped__`` chains are
+    resolved from the function they wrap and builtins from their ``__text_signature__``.
+    Callables that can't be resolved have no parameters, they are remembered so they are not
+    tried again.
+
+    Kind is one of POSITIONAL_ONLY, POSITIONAL_OR_KEYWORD, VAR_POSITIONAL, KEYWORD_ONLY or
+    VAR_KEYWORD, default is EMPTY when the parameter has no default value.
+
+    Example:
+    >>> def example_func(foo, bar=None, *args, **kwargs):
+    >>>    return foo, bar
+    >>> get_parameters(example_func)
+    >>> [Parameter(name='foo', kind='POSITIONAL_OR_KEYWORD', default=EMPTY),
+    ...  Parameter(name='bar', kind='POSITIONAL_OR_KEYWORD', default=None),
+    ...  Parameter(name='args', kind='VAR_POSITIONAL', default=EMPTY),
+    ...  Parameter(name='kwargs', kind='VAR_KEYWORD', default=EMPTY)]
+
+    :param function func: Function to inspect
+    :return: List of parameters in definition order
+    :rtype: list
+    """
+    if (isinstance(func, types.FunctionType) and not hasattr(func, '__wrapped__') and
+            not hasattr(func, '__signature__')):
+        return _get_code_parameters(func)
+    parameters = _unresolved_signatures.get(func)
+    if parameters is not None:
+        return list(parameters)
+    try:
+        return _get_signature_parameters(func)
+    except (TypeError, ValueError):
+        parameters = _get_fallback_parameters(func)
+        _unresolved_signatures.set(func, tuple(parameters))
+        return parameters
+
+
+def _get_code_parameters(func):
+    code = func.__code__
+    names = code.co_varnames
+    arg_count = code.co_argcount
+    positional_only_count = getattr(code, 'co_posonlyargcount', 0)
+    keyword_only_count = getattr(code, 'co_kwonlyargcount', 0)
+    defaults = func.__defaults__ or ()
+    keyword_defaults = getattr(func, '__kwdefaults__', None) or {}
+
+    parameters = []
+    first_default = arg_count - len(defaults)
+    for index in range(arg_count):
+        kind = POSITIONAL_ONLY if index < positional_only_count else POSITIONAL_OR_KEYWORD
+        default = defaults[index - first_default] if index >= first_default else EMPTY
+        parameters.append(Parameter(names[index], kind, default))
+
+    var_index = arg_count + keyword_only_count
+    if code.co_flags & inspect.CO_VARARGS:
+        parameters.append(Parameter(names[var_index], VAR_POSITIONAL, EMPTY))
+        var_index += 1
+    for name in names[arg_count:arg_count + keyword_only_count]:
+        parameters.append(Parameter(name, KEYWORD_ONLY, keyword_defaults.get(name, EMPTY)))
+    if code.co_flags & inspect.CO_VARKEYWORDS:
+        parameters.append(Parameter(names[var_index], VAR_KEYWORD, EMPTY))
+    return parameters
+
+
+def _get_signature_parameters(func):
     if six.PY3:
-        func_sign = inspect.signature(func)
-        return list(func_sign.parameters.keys())
-    arg_spec = inspect.getargspec(func)
-    return arg_spec.args
+        return [Parameter(param.name, _SIGNATURE_KINDS[param.kind], param.default)
+                for param in inspect.signature(func).parameters.values()]
+    args, varargs, keywords, defaults = inspect.getargspec(func)
+    defaults = defaults or ()
+    first_default = len(args) - len(defaults)
+    parameters = [
+        Parameter(name, POSITIONAL_OR_KEYWORD,
+                  defaults[index - first_default] if index >= first_default else EMPTY)
+        for index, name in enumerate(args)
+    ]
+    if varargs:
+        parameters.append(Parameter(varargs, VAR_POSITIONAL, EMPTY))
+    if keywords:
+        parameters.append(Parameter(keywords, VAR_KEYWORD, EMPTY))
+    return parameters
+
+
+def _get_fallback_parameters(func):
+    if isinstance(func, functools.partial):
+        return _apply_partial(get_parameters(func.func), func.args, func.keywords or {})
+    wrapped = getattr(func, '__wrapped__', None)
+    if wrapped is not None and wrapped is not func:
+        return get_parameters(wrapped)
+    text_signature = getattr(func, '__text_signature__', None)
+    if isinstance(text_signature, six.string_types):
+        try:
+            return _parse_text_signature(text_signature)
+        except (ValueError, SyntaxError):
+            pass
+    return []
+
+
+def _apply_partial(parameters, args, keywords):
+    """Get the parameters left once a partial binds some positional and keyword arguments
+
+    As ``inspect.signature`` does, bound keywords become keyword only parameters with the bound
+    value as default, and so do the positional or keyword parameters after them.
+    """
+    result = []
+    positional_left = len(args)
+    keyword_only = False
+    for param in parameters:
+        if positional_left and param.kind in (POSITIONAL_ONLY, POSITIONAL_OR_KEYWORD):
+            positional_left -= 1
+            continue
+        if param.name in keywords and param.kind not in (VAR_POSITIONAL, VAR_KEYWORD):
+            keyword_only = True
+            param = Parameter(param.name, KEYWORD_ONLY, keywords[param.name])
+        elif keyword_only and param.kind == POSITIONAL_OR_KEYWORD:
+            param = param._replace(kind=KEYWORD_ONLY)
+        result.append(param)
+    return result
+
+
+def _parse_text_signature(text_signature):
+    """Get the parameters of a builtin from its ``__text_signature__``
+
+    Example:
+    >>> _parse_text_signature('($module, iterable, /, start=0)')
+    >>> [Parameter(name='iterable', kind='POSITIONAL_ONLY', default=EMPTY),
+    ...  Parameter(name='start', kind='POSITIONAL_OR_KEYWORD', default=0)]
+
+    Defaults that are not literals are kept as their source text.
+    """
+    text = text_signature.strip()
+    if not (text.startswith('(') and text.endswith(')')):
+        raise ValueError('Invalid text signature %r' % text_signature)
+    parameters = []
+    kind = POSITIONAL_OR_KEYWORD
+    for index, part in enumerate(_split_arguments(text[1:-1])):
+        if not part or (index == 0 and part.startswith('$')):
+            continue  # $self, $module and $type are bound
+        if part == '/':
+            parameters = [param._replace(kind=POSITIONAL_ONLY) for param in parameters]
+        elif part == '*':
+            kind = KEYWORD_ONLY
+        elif part.startswith('**'):
+            parameters.append(Parameter(part[2:], VAR_KEYWORD, EMPTY))
+        elif part.startswith('*'):
+            parameters.append(Parameter(part[1:], VAR_POSITIONAL, EMPTY))
+            kind = KEYWORD_ONLY
+        else:
+            name, _, default = part.partition('=')
+            default = default.strip()
+            if default:
+                try:
+                    default = ast.literal_eval(default)
+                except (ValueError, SyntaxError):
+                    pass
+            else:
+                default = EMPTY
+            parameters.append(Parameter(name.strip(), kind, default))
+    return parameters
+
+
+def _split_arguments(text):
+    """Split a list of arguments on the commas that are not nested in brackets or strings"""
+    parts, current, depth, quote = [], [], 0, None
+    for char in text:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in '\'"':
+            quote = char
+        elif char in '([{':
+            depth += 1
+        elif char in ')]}':
+            depth -= 1
+        elif char == ',' and not depth:
+            parts.append(''.join(current).strip())
+            current = []
+            continue
+        current.append(char)
+    parts.append(''.join(current).strip())
+    return parts
 
 
-def get_func_inspect_result(func, doc_parser=sphinx_doc_parser):
+def get_func_inspect_result(func, doc_parser=sphinx_doc_parser, cache=None):
     """Get inspect results for a function
 
+    If a cache is given, the result is taken from it when the function didn't change since
+    it was inspected, and stored on it otherwise.
+
+    Example:
+    >>> inspections_cache = FunctionInspectionCache(maxsize=1024)
+    >>> get_func_inspect_result(func, cache=inspections_cache)
+
     :param function func: Function to inspect
+    :param function doc_parser: Parser used to parse the function docstring
+    :param cache.FunctionInspectionCache cache: Cache to read and store the result
     :return: Object with all the information related with the function
     :rtype: models.Function
     """
-    arguments = []
-    name = func.__name__
-    args = get_function_args(func)
-    default_args = get_default_args(func)
-    short_description, long_description, doc_args, returns = doc_parser(func.__doc__)
-    for position, arg in enumerate(args):
-        doc_arg = doc_args.get(arg) or {}
-        kind = doc_arg.get('type')
-        description = doc_arg.get('doc')
-        default = default_args.get(arg)
-        is_arg = arg not in default_args  # if it doesn't have a default value, then it's an argument
-        # name, default_value, kind, description, is_arg, position
-        arguments.append(
-            models.Argument(name=arg, default=default, kind=kind,
-                            description=description, is_arg=is_arg, position=position)
-        )
+    if cache is not None:
+        result = cache.get(func, doc_parser)
+        if result is not None:
+            stats.hit('inspect')
+            return result
+        stats.miss('inspect')
+        result = stats.measure('inspect', _inspect_function, func, doc_parser)
+        cache.set(func, result, doc_parser)
+        return result
+    return stats.measure('inspect', _inspect_function, func, doc_parser)
+
+
+def _inspect_function(func, doc_parser):
+    return build_func_inspect_result(get_name(func), get_doc(func),
+                                     stats.measure('signature', get_parameters, func),
+                                     doc_parser, func=func)
+
+
+def get_name(func):
+    """Get the name of a callable, partials take it from the function they wrap
+
+    :param function func: Function, or any callable
+    :return: Name of the callable, the name of its type if it has none
+    :rtype: str
+    """
+    name = getattr(func, '__name__', None)
+    while name is None and isinstance(func, functools.partial):
+        func = func.func
+        name = getattr(func, '__name__', None)
+    return name if name is not None else type(func).__name__
+
+
+def get_doc(func):
+    """Get the docstring of a callable, partials take it from the function they wrap
+
+    :param function func: Function, or any callable
+    :return: Docstring, None if it has none
+    :rtype: str
+    """
+    while isinstance(func, functools.partial):
+        func = func.func
+    return getattr(func, '__doc__', None)
+
+
+def build_func_inspect_result(name, docstring, parameters, doc_parser=sphinx_doc_parser,
+                              func=None):
+    """Build the inspect results for a function from its already extracted parts
+
+    Used when the function is not available as a live object, for example when it's read
+    from source code.
+
+    :param str name: Name of the function
+    :param str docstring: Docstring of the function
+    :param list parameters: List of Parameter
+    :param function doc_parser: Parser used to parse the docstring
+    :param function func: Inspected function, if available
+    :return: Object with all the information related with the function
+    :rtype: models.Function
+    """
+    parsed = stats.measure('doc_parse', doc_parser, docstring)
+    short_description, long_description, doc_args, returns = parsed
+    arguments = [models.Argument(*record) for record in get_argument_records(parameters, doc_args)]
     return models.Function(name=name, short_description=short_description,
                            long_description=long_description, func=func,
-                           arguments=arguments)
+                           arguments=arguments, return_type=getattr(parsed, 'rtype', None))
+
+
+def get_argument_records(parameters, doc_args):
+    """Merge the parameters of a function with their documentation
+
+    :param list parameters: List of Parameter
+    :param dict doc_args: Documented arguments, as returned by the doc parsers
+    :return: List of models.ArgumentRecord, in the order of the parameters
+    :rtype: list
+    """
+    records = []
+    for position, param in enumerate(parameters):
+        doc_arg = doc_args.get(param.name) or {}
+        is_arg = param.default is EMPTY  # if it doesn't have a default value, then it's an argument
+        records.append(models.ArgumentRecord(
+            param.name, None if is_arg else param.default, doc_arg.get('type'), doc_arg.get('doc'),
+            is_arg, position, param.kind
+        ))
+    return records
+
+
+def inspect_many(funcs, doc_parser=sphinx_doc_parser):
+    """Get inspect results for many functions at once
+
+    Functions are grouped by source file: every file is read and parsed once, and the source code
+    of each function is sliced from it using the first line of its code object and the last line
+    of its node, instead of locating and tokenizing the functions one by one. Identical
+    docstrings are parsed once.
+
+    Example:
+    >>> results = inspect_many(get_module_functions(module))
+
+    :param iterable funcs: Functions to inspect
+    :param function doc_parser: Parser used to parse the docstrings
+    :return: List of models.Function, in the same order as the functions
+    :rtype: list
+    """
+    parsed_docstrings = {}
+
+    def parse_once(docstring):
+        try:
+            return parsed_docstrings[docstring]
+        except KeyError:
+            parsed = parsed_docstrings[docstring] = doc_parser(docstring)
+            return parsed
+
+    results = []
+    by_file = {}
+    for func in funcs:
+        result = build_func_inspect_result(get_name(func), get_doc(func), get_parameters(func),
+                                           parse_once, func=func)
+        results.append(result)
+        location = result.source_location
+        if location is not None:
+            by_file.setdefault(location[0], []).append((result, location))
+
+    for filename, file_results in by_file.items():
+        lines = linecache.getlines(filename)
+        if not lines:
+            continue  # Source not available, source_code will be retrieved lazily
+        block_ends = stats.measure('source', _get_block_ends, lines)
+        for result, (_, first_line, last_line) in file_results:
+            block_end = block_ends.get(first_line)
+            if block_end is None:
+                block_end = _get_block_end(lines, first_line, last_line)
+            result.source_code = ''.join(lines[first_line - 1:block_end])
+    return results
+
+
+_FUNCTION_NODES = (ast.FunctionDef, getattr(ast, 'AsyncFunctionDef', ast.FunctionDef))
+
+
+def _get_block_ends(lines):
+    """Get the last line of every function of a source file, parsing it once
+
+    :param list lines: Lines of the source file
+    :return: Dictionary with the first line of every function (its first decorator if it's
+        decorated) as key and its last line as value, 1 based. Empty if the file can't be parsed
+        or the python version doesn't know where nodes end (before 3.8)
+    :rtype: dict
+    """
+    try:
+        tree = ast.parse(''.join(lines))
+    except (SyntaxError, ValueError):
+        return {}
+    block_ends = {}
+    for node in ast.walk(tree):
+        if isinstance(node, _FUNCTION_NODES):
+            end_line = getattr(node, 'end_lineno', None)
+            if end_line is None:
+                return {}
+            first_line = min([node.lineno] + [decorator.lineno
+                                              for decorator in node.decorator_list])
+            block_ends[first_line] = end_line
+    return block_ends
+
+
+def _get_block_end(lines, first_line, last_line):
+    """Get the last line of the block of a single function
+
+    Fallback for the functions _get_block_ends doesn't know, such as lambdas. The block is found
+    with ``inspect.getblock``, as ``inspect.getsource`` does, so it ends at the same line.
+
+    :param list lines: Lines of the source file
+    :param int first_line: First line of the function, 1 based
+    :param int last_line: Last line reported by the code object, used if the block can't be
+        tokenized, 1 based
+    :return: Last line of the block, 1 based
+    :rtype: int
+    """
+    try:
+        block = inspect.getblock(lines[first_line - 1:])
+    except (tokenize.TokenError, SyntaxError):
+        return last_line
+    return first_line - 1 + len(block)
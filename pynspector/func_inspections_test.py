@@ -3,11 +3,28 @@
 Set of tests for functions inspections module
 """
 # System imports
+import functools
+import inspect
+import sys
 import unittest
 
+import six
+
+try:
+    from unittest import mock
+except ImportError:  # python 2
+    import mock
+
 # Third-party imports
 # Local imports
-from .func_inspections import get_default_args, get_function_args, get_func_inspect_result
+from .func_inspections import (
+    get_argument_records, get_default_args, get_function_args, get_func_inspect_result,
+    get_parameters, inspect_many,
+    _get_signature_parameters, _parse_text_signature, _unresolved_signatures, Parameter, EMPTY, POSITIONAL_ONLY, POSITIONAL_OR_KEYWORD,
+    VAR_POSITIONAL, KEYWORD_ONLY, VAR_KEYWORD
+)
+from .cache import FunctionInspectionCache, DocParserCache
+from .doc_parsers import sphinx_doc_parser
 from . import models
 
 # ####################
@@ -62,6 +79,96 @@ class TestFunctionArgs(unittest.TestCase):
         self.assertListEqual(arguments, [])
 
 
+def func_with_var_args(foo, bar=1, *args, **kwargs):
+    return foo, bar, args, kwargs
+
+
+class TestGetParameters(unittest.TestCase):
+    """
+    Test suite for function `get_parameters`
+    """
+
+    def test_should_return_kinds_and_defaults(self):
+        self.assertListEqual(get_parameters(func_with_var_args), [
+            Parameter('foo', POSITIONAL_OR_KEYWORD, EMPTY),
+            Parameter('bar', POSITIONAL_OR_KEYWORD, 1),
+            Parameter('args', VAR_POSITIONAL, EMPTY),
+            Parameter('kwargs', VAR_KEYWORD, EMPTY),
+        ])
+
+    @unittest.skipUnless(six.PY3, "keyword only arguments are python 3 only")
+    def test_should_return_keyword_only_arguments(self):
+        namespace = {}
+        exec("def func(foo, *args, bar, baz=2, **kwargs): pass", namespace)
+        self.assertListEqual(get_parameters(namespace['func']), [
+            Parameter('foo', POSITIONAL_OR_KEYWORD, EMPTY),
+            Parameter('args', VAR_POSITIONAL, EMPTY),
+            Parameter('bar', KEYWORD_ONLY, EMPTY),
+            Parameter('baz', KEYWORD_ONLY, 2),
+            Parameter('kwargs', VAR_KEYWORD, EMPTY),
+        ])
+
+    @unittest.skipUnless(sys.version_info >= (3, 8), "positional only arguments are python 3.8+")
+    def test_should_return_positional_only_arguments(self):
+        namespace = {}
+        exec("def func(foo, bar=1, /, baz=2, *, qux): pass", namespace)
+        self.assertListEqual(get_parameters(namespace['func']),
+                             _get_signature_parameters(namespace['func']))
+        self.assertEqual(get_parameters(namespace['func'])[1], Parameter('bar', POSITIONAL_ONLY, 1))
+
+    def test_should_fall_back_for_partials(self):
+        partial = functools.partial(func_with_some_defaults, 1)
+        self.assertListEqual(get_function_args(partial), ['bar'])
+
+    @unittest.skipUnless(six.PY3, "functools.wraps sets __wrapped__ on python 3 only")
+    def test_should_follow_wrapped_functions(self):
+        @functools.wraps(func_with_some_defaults)
+        def wrapper(*args, **kwargs):
+            return func_with_some_defaults(*args, **kwargs)
+        self.assertListEqual(get_function_args(wrapper), ['foo', 'bar'])
+
+    def test_should_bind_partial_keywords_when_signature_fails(self):
+        partial = functools.partial(_NoSignature(), 1)
+        self.assertListEqual(get_parameters(partial), [])
+        func = functools.partial(func_with_var_args, 1, bar=2)
+        with mock.patch('inspect.signature', side_effect=ValueError):
+            self.assertListEqual(get_parameters(func), [
+                Parameter('bar', KEYWORD_ONLY, 2),
+                Parameter('args', VAR_POSITIONAL, EMPTY),
+                Parameter('kwargs', VAR_KEYWORD, EMPTY),
+            ])
+
+    def test_should_parse_text_signatures(self):
+        self.assertListEqual(_parse_text_signature("($module, iterable, /, start=0, *, key=None)"), [
+            Parameter('iterable', POSITIONAL_ONLY, EMPTY),
+            Parameter('start', POSITIONAL_OR_KEYWORD, 0),
+            Parameter('key', KEYWORD_ONLY, None),
+        ])
+        self.assertListEqual(_parse_text_signature("(sep=(' ', ','), *args, **kwargs)"), [
+            Parameter('sep', POSITIONAL_OR_KEYWORD, (' ', ',')),
+            Parameter('args', VAR_POSITIONAL, EMPTY),
+            Parameter('kwargs', VAR_KEYWORD, EMPTY),
+        ])
+        self.assertListEqual(_parse_text_signature("(file=sys.stdout)"),
+                             [Parameter('file', POSITIONAL_OR_KEYWORD, 'sys.stdout')])
+
+    def test_should_remember_unresolved_signatures(self):
+        func = _NoSignature()
+        self.assertListEqual(get_parameters(func), [])
+        self.assertIn(func, _unresolved_signatures)
+        with mock.patch('pynspector.func_inspections._get_signature_parameters') as signature:
+            self.assertListEqual(get_parameters(func), [])
+        self.assertFalse(signature.called)
+
+
+class _NoSignature(object):
+    """Callable whose signature can't be resolved"""
+    __signature__ = 'not a signature'
+
+    def __call__(self, *args, **kwargs):
+        pass
+
+
 class TestFunctionInspectResults(unittest.TestCase):
     """
     Test suite for function `get_func_inspect_result`
@@ -110,6 +217,53 @@ class TestFunctionInspectResults(unittest.TestCase):
             default=None, kind=None, is_arg=False, is_kwarg=True, position=1, mandatory=False
         )
 
+    def test_should_inspect_partials(self):
+        result = get_func_inspect_result(functools.partial(func_with_same_docstring, foo=1))
+        self.assertEqual(result.name, 'func_with_same_docstring')
+        self.assertEqual(result.short_description, 'Function to check something')
+        self.assertEqual([(argument.name, argument.default) for argument in result.arguments],
+                         [('foo', 1)])
+        self.assertIn('def func_with_same_docstring', result.source_code)
+
+    def test_should_keep_documented_return_type(self):
+        def func():
+            """Function
+
+            :rtype: int
+            """
+        result = get_func_inspect_result(func)
+        self.assertEqual(result.return_type, 'int')
+        self.assertEqual(result.return_annotation, 'int')
+
+    def test_should_inspect_builtins_without_source(self):
+        result = get_func_inspect_result(len)
+        self.assertEqual(result.name, 'len')
+        self.assertIsNone(result.source_code)
+
+    def test_should_reuse_cached_result(self):
+        cache = FunctionInspectionCache()
+        first = get_func_inspect_result(func_with_some_defaults, cache=cache)
+        second = get_func_inspect_result(func_with_some_defaults, cache=cache)
+        self.assertIs(first.arguments, second.arguments)
+        self.assertIs(second.func, func_with_some_defaults)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_should_accept_cached_doc_parser(self):
+        def dummy_function(param_1):
+            """Function to check something
+
+            :param str param_1: Param one should be string
+            """
+            return
+        doc_parser = DocParserCache(sphinx_doc_parser)
+        get_func_inspect_result(dummy_function, doc_parser=doc_parser)
+        func_res = get_func_inspect_result(dummy_function, doc_parser=doc_parser)
+        self.assertEqual(doc_parser.hits, 1)
+        self._check_argument(
+            func_res.arguments[0], name='param_1', description='Param one should be string',
+            default=None, kind='str', is_arg=True, is_kwarg=False, position=0, mandatory=True
+        )
+
     def _check_argument(self, argument, name, description, kind, default, is_arg, is_kwarg, position, mandatory):
         self.assertIsInstance(argument, models.Argument)
         self.assertEqual(argument.name, name)
@@ -122,5 +276,97 @@ class TestFunctionInspectResults(unittest.TestCase):
         self.assertEqual(argument.is_mandatory, mandatory)
 
 
+def func_with_multiline_call(foo):
+    """Function to check something"""
+    return dict(
+        foo=foo,
+    )
+
+
+def func_with_same_docstring(foo):
+    """Function to check something"""
+    return foo
+
+
+def func_returning_dedented_string():
+    return """
+abc
+"""
+
+
+def func_followed_by_comment():
+    return 1
+# Comment after the function
+
+
+def _identity(func):
+    return func
+
+
+@_identity
+def func_with_decorator(foo):
+    return foo
+
+
+def _make_nested_func():
+    def nested_func(foo):
+        return foo
+    return nested_func
+
+
+lambda_func = lambda foo: foo  # noqa: E731
+
+
+class TestGetArgumentRecords(unittest.TestCase):
+    """
+    Test suite for function `get_argument_records`
+    """
+
+    def test_should_merge_parameters_and_documentation(self):
+        parameters = [Parameter('foo', POSITIONAL_OR_KEYWORD, EMPTY),
+                      Parameter('bar', KEYWORD_ONLY, 3)]
+        records = get_argument_records(parameters, {'bar': {'type': 'int', 'doc': 'Bar'}})
+        self.assertEqual([tuple(record) for record in records], [
+            ('foo', None, None, None, True, 0, POSITIONAL_OR_KEYWORD),
+            ('bar', 3, 'int', 'Bar', False, 1, KEYWORD_ONLY),
+        ])
+
+
+class TestInspectMany(unittest.TestCase):
+    """
+    Test suite for function `inspect_many`
+    """
+
+    funcs = [func_with_some_defaults, func_with_multiline_call, func_with_same_docstring,
+             func_returning_dedented_string, func_followed_by_comment, func_with_decorator,
+             _make_nested_func(), lambda_func]
+
+    def test_should_match_single_inspections(self):
+        results = inspect_many(self.funcs)
+        for func, result in zip(self.funcs, results):
+            single = get_func_inspect_result(func)
+            self.assertIs(result.func, func)
+            self.assertEqual(result.to_record(), single.to_record())
+
+    def test_should_slice_source_code_from_file(self):
+        for func, result in zip(self.funcs, inspect_many(self.funcs)):
+            self.assertEqual(result.source_code, inspect.getsource(func))
+
+    def test_should_parse_identical_docstrings_once(self):
+        docstrings = []
+
+        def doc_parser(docstring):
+            docstrings.append(docstring)
+            return sphinx_doc_parser(docstring)
+
+        inspect_many(self.funcs[1:3], doc_parser=doc_parser)
+        self.assertEqual(docstrings, ['Function to check something'])
+
+    def test_should_accept_functions_without_source(self):
+        result = inspect_many([len])[0]
+        self.assertEqual('len', result.name)
+        self.assertIsNone(result.source_location)
+
+
 if __name__ == '__main__':
     unittest.main()
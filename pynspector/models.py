@@ -7,22 +7,145 @@ Here you will find all models that are used across pynspector.
 What is a model?
 ================
 A model is just a class that holds some attributes and is returned as a result of an operation.
+
+Models use ``__slots__``, so they don't carry a per instance ``__dict__``, which is what keeps
+them small. They can be converted to records (named tuples) with ``to_record`` and back with
+``from_record``: records are immutable snapshots without the live function, to store, send to
+another process or compare. Records are not a compact form, they are slightly bigger than the
+models. The compact form are the array backed columns of the ``columnar`` module, written with
+``ColumnsBuilder.add_result`` and converted back with ``Columns.get_function``, which keep
+default values as their repr.
+
+Memory footprint
+================
+Measured with ``benchmarks/models_benchmark.py`` on CPython 3.11 64-bit, per argument and
+without counting the strings and default values it references:
+
+- Argument: 96 bytes (it was 136 bytes with a ``__dict__``).
+- ArgumentRecord: 104 bytes.
+- Columns: 30 bytes, 29 bytes of columns plus the spare room of the arrays.
 """
 # System imports
+import dis
+import functools
+import hashlib
 import inspect
+import re
+import weakref
+from collections import namedtuple
+
+import six
+
+try:
+    from typing import get_type_hints
+except ImportError:  # python 2
+    get_type_hints = None
 
 # Third-party imports
 # Local imports
+from . import stats
+from .cache import NegativeCache
+
+
+__all__ = ['Argument', 'Function', 'Method', 'Class', 'ArgumentRecord', 'FunctionRecord',
+           'DefaultRepr', 'get_source_location', 'get_argument_key', 'get_default_repr']
+
+
+class _Model(object):
+    """Base class for models, makes models with ``__slots__`` picklable"""
+    __slots__ = ()
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in _all_slots(type(self)) if hasattr(self, name)}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def __copy__(self):
+        # Copies the slots as they are, __getstate__ would read the source code
+        copy = object.__new__(type(self))
+        for name in _all_slots(type(self)):
+            if hasattr(self, name):
+                setattr(copy, name, getattr(self, name))
+        return copy
+
+
+def _all_slots(cls):
+    return [name for klass in cls.__mro__ for name in getattr(klass, '__slots__', ())]
+
+
+class DefaultRepr(str):
+    """Default value that is already a repr, such as the ones read from source code
+
+    Its repr is the text itself, so it's reported, fingerprinted and compared the same as the
+    live default value it stands for. It's still a string for everything else.
+
+    Example:
+    >>> default = DefaultRepr("'GET'")
+    >>> repr(default) == repr('GET')
+    >>> True
+    """
+    __slots__ = ()
+
+    def __repr__(self):
+        return str(self)
+
+
+class ArgumentRecord(namedtuple('ArgumentRecord', ['name', 'default', 'kind', 'description',
+                                                   'is_arg', 'position', 'parameter_kind'])):
+    """Immutable snapshot of an Argument"""
+    __slots__ = ()
+
+    @property
+    def is_kwarg(self):
+        return not self.is_arg
+
+    @property
+    def is_mandatory(self):
+        """Returns if the argument is mandatory or not"""
+        return self.is_arg
+
+
+class FunctionRecord(namedtuple('FunctionRecord', ['name', 'short_description', 'long_description',
+                                                   'arguments', 'source_code', 'source_location',
+                                                   'fingerprint', 'return_type'])):
+    """Immutable snapshot of a Function
+
+    It doesn't keep the live function, arguments are a tuple of ArgumentRecord.
+    """
+    __slots__ = ()
+
+    def to_plain(self):
+        """Get this record with the default values that are not plain builtin values replaced by
+        their repr (DefaultRepr), so unpickling it imports nothing but pynspector
+
+        :rtype: FunctionRecord
+        """
+        if all(_is_plain(argument.default) for argument in self.arguments):
+            return self
+        arguments = tuple(
+            argument if _is_plain(argument.default) else
+            argument._replace(default=DefaultRepr(repr(argument.default)))
+            for argument in self.arguments
+        )
+        return self._replace(arguments=arguments)
+
+
+# Records stored before fingerprints and return types were added don't have them
+FunctionRecord.__new__.__defaults__ = (None, None)
 
 
-class Argument(object):
+class Argument(_Model):
     """Argument object
 
     This object represents an argument that is passed to a function.
     Whenever you inspect a function, you will get a function object with all it's arguments in this format.
     """
+    __slots__ = ('name', 'default', 'kind', 'description', 'is_arg', 'position', 'parameter_kind',
+                 '_annotations')
 
-    def __init__(self, name, default, kind, description, is_arg, position):
+    def __init__(self, name, default, kind, description, is_arg, position, parameter_kind=None):
         """ Initialize Argument object
 
         :param str name: Name of the argument
@@ -31,6 +154,8 @@ class Argument(object):
         :param str description: Description for this argument
         :param bool is_arg: Returns if the argument is arg or kwarg (keyword argument)
         :param int position: Position in arg list
+        :param str parameter_kind: How the argument is passed, such as POSITIONAL_ONLY,
+            POSITIONAL_OR_KEYWORD, VAR_POSITIONAL, KEYWORD_ONLY or VAR_KEYWORD
         """
         self.name = name
         self.default = default
@@ -38,6 +163,20 @@ class Argument(object):
         self.description = description
         self.is_arg = is_arg
         self.position = position
+        self.parameter_kind = parameter_kind
+        # Annotations of the function, set by the Function holding this argument
+        self._annotations = None
+
+    @property
+    def annotation(self):
+        """Annotation of the argument, resolved the first time an annotation of its function is
+        accessed. The documented type (``kind``) is returned when it's not annotated.
+        """
+        if self._annotations is not None:
+            annotation = self._annotations.resolve().get(self.name, _MISSING)
+            if annotation is not _MISSING:
+                return annotation
+        return self.kind
 
     @property
     def is_kwarg(self):
@@ -48,17 +187,412 @@ class Argument(object):
         """Returns if the argument is mandatory or not"""
         return self.is_arg
 
+    def to_record(self):
+        """Get an immutable snapshot of this argument
+
+        :rtype: ArgumentRecord
+        """
+        return ArgumentRecord(self.name, self.default, self.kind, self.description, self.is_arg,
+                              self.position, self.parameter_kind)
 
-class Function(object):
+    @classmethod
+    def from_record(cls, record):
+        """Build an argument from its record
+
+        :param ArgumentRecord record: Snapshot of the argument
+        :rtype: Argument
+        """
+        return cls(*record)
+
+
+class Function(_Model):
     """Function object
 
-    This object represents a function
+    This object represents a function.
+    The source code is only retrieved the first time it's accessed, it's None when it's not
+    available (builtins, C extensions or functions created at runtime).
+
+    Annotations are resolved the first time they are accessed, for the function and all its
+    arguments at once.
+
+    Functions can be pickled, the live function is not part of the pickle but its source code
+    and location are. Annotations are pickled formatted as strings.
     """
+    __slots__ = ('name', 'short_description', 'long_description', 'func', 'arguments',
+                 'return_type', '_source_code', '_source_location', '_fingerprint', '_annotations')
+
+    def __init__(self, name, short_description, long_description, func, arguments,
+                 return_type=None):
+        """ Initialize Function object
 
-    def __init__(self, name, short_description, long_description, func, arguments):
+        :param str name: Name of the function
+        :param str short_description: Short description from the docstring
+        :param str long_description: Long description from the docstring
+        :param function func: Inspected function, None if it's not available
+        :param list arguments: List of Argument
+        :param str return_type: Documented return type
+        """
         self.name = name
         self.short_description = short_description
         self.long_description = long_description
         self.func = func
-        self.source_code = inspect.getsource(func)
         self.arguments = arguments or []
+        self.return_type = return_type
+        self._source_code = None
+        self._source_location = None
+        self._fingerprint = None
+        self._annotations = _Annotations(func)
+        for argument in self.arguments:
+            argument._annotations = self._annotations
+
+    @property
+    def annotations(self):
+        """Annotations of the function, resolved on first access
+
+        String annotations (``from __future__ import annotations`` or forward references) are
+        evaluated with ``typing.get_type_hints``, the ones that can't be evaluated are kept as
+        strings. Partials and wrappers get the annotations of the function they wrap.
+
+        :return: Dictionary with argument name, or ``return``, as key and annotation as value
+        :rtype: dict
+        """
+        return self._annotations.resolve()
+
+    @property
+    def return_annotation(self):
+        """Return annotation, the documented return type (``return_type``) if not annotated"""
+        return self.annotations.get('return', self.return_type)
+
+    @property
+    def fingerprint(self):
+        """Hash of the signature and documentation of the function, computed on first access
+
+        It covers the name, descriptions, documented return type and, for every argument, its
+        name, position, parameter kind, whether it's mandatory, default value repr, documented
+        type and description.
+        Source code and location are not part of it, so it only changes when the API of the
+        function does. Memory addresses are removed from the default values repr, so it's stable
+        across processes.
+
+        :return: Hexadecimal SHA-1 digest
+        :rtype: str
+        """
+        if self._fingerprint is None:
+            parts = [u'%s\x00%s\x00%s\x00%s' % (self.name, self.short_description,
+                                                self.long_description, self.return_type)]
+            parts.extend(_ARGUMENT_KEY_FORMAT % get_argument_key(argument)
+                         for argument in self.arguments)
+            key = u'\x01'.join(parts)
+            self._fingerprint = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return self._fingerprint
+
+    @property
+    def source_code(self):
+        """Source code of the function, retrieved on first access
+
+        Partials and wrappers (``__wrapped__``) get the source code of the function they wrap.
+        """
+        if self._source_code is None and self.func is not None:
+            self._source_code = _get_source(self.func)
+        return self._source_code
+
+    @source_code.setter
+    def source_code(self, value):
+        self._source_code = value
+
+    @property
+    def source_location(self):
+        """Location of the function source code without reading it
+
+        The location is taken from the function code object, so it doesn't read nor
+        tokenize the source file. Returns None if the function has no code object.
+
+        The last line is the last one holding code: on python 3.11+ that's where the last
+        expression ends, before it's where the last statement starts, so a closing bracket on its
+        own line is not included. Lines without code at the end of the function, such as the rest
+        of a docstring-only body or comments, are never included. Use ``source_code`` for the
+        exact source.
+
+        :return: Tuple with filename, first line and last line
+        :rtype: tuple
+        """
+        if self._source_location is not None:
+            return self._source_location
+        return get_source_location(self.func)
+
+    @source_location.setter
+    def source_location(self, value):
+        self._source_location = value
+
+    def __getstate__(self):
+        state = super(Function, self).__getstate__()
+        if self.func is not None:
+            state['_source_location'] = self.source_location
+            state['_source_code'] = self.source_code
+        state['func'] = None
+        return state
+
+    def to_record(self, include_source=True):
+        """Get an immutable snapshot of this function, without the live function
+
+        :param bool include_source: Include the source code, reading it if it wasn't yet
+        :rtype: FunctionRecord
+        """
+        source_code = self.source_code if include_source else self._source_code
+        return FunctionRecord(
+            self.name, self.short_description, self.long_description,
+            tuple(argument.to_record() for argument in self.arguments),
+            source_code, self.source_location, self.fingerprint, self.return_type
+        )
+
+    def to_dict(self, include_source=True):
+        """Get this function as a dictionary of builtin types, ready to be serialized
+
+        Arguments are dictionaries too, default values are kept as they are.
+
+        :param bool include_source: Include the source code, reading it if it wasn't yet
+        :rtype: dict
+        """
+        record = self.to_record(include_source=include_source)._asdict()
+        record['arguments'] = [dict(argument._asdict()) for argument in record['arguments']]
+        if not include_source:
+            del record['source_code']
+        return dict(record)
+
+    @classmethod
+    def from_record(cls, record):
+        """Build a function from its record, ``func`` will be None
+
+        :param FunctionRecord record: Snapshot of the function
+        :rtype: Function
+        """
+        function = cls(record.name, record.short_description, record.long_description, None,
+                       [Argument.from_record(argument) for argument in record.arguments],
+                       record.return_type)
+        function.source_code = record.source_code
+        function.source_location = record.source_location
+        function._fingerprint = record.fingerprint
+        return function
+
+
+class _Annotations(object):
+    """Annotations of a function, resolved once and shared by the function and its arguments
+
+    The function is weakly referenced when possible, so dropping it from the models doesn't
+    keep it alive.
+    """
+    __slots__ = ('_func', '_resolved')
+
+    def __init__(self, func):
+        try:
+            self._func = weakref.ref(func) if func is not None else None
+        except TypeError:
+            self._func = lambda: func
+        self._resolved = None
+
+    def resolve(self):
+        if self._resolved is None:
+            func = self._func() if self._func is not None else None
+            self._resolved = {} if func is None else stats.measure('annotations',
+                                                                   _resolve_annotations, func)
+        return self._resolved
+
+    def __getstate__(self):
+        # Always a non empty tuple, so __setstate__ is called
+        return ({name: _format_annotation(value) for name, value in self.resolve().items()},)
+
+    def __setstate__(self, state):
+        self._func = None
+        self._resolved = state[0]
+
+
+class Method(Function):
+    """Method object
+
+    This object represents a function defined on a class, it could be a regular method,
+    a classmethod, a staticmethod or a property (the getter function is inspected).
+    """
+    __slots__ = ('method_type', 'defined_in')
+
+    def __init__(self, name, short_description, long_description, func, arguments, method_type,
+                 defined_in, return_type=None):
+        """ Initialize Method object
+
+        :param str name: Name of the method on the class
+        :param str short_description: Short description from the docstring
+        :param str long_description: Long description from the docstring
+        :param function func: Underlying function
+        :param list arguments: List of Argument
+        :param str method_type: One of method, classmethod, staticmethod or property
+        :param str defined_in: Name of the class where the method is defined
+        :param str return_type: Documented return type
+        """
+        super(Method, self).__init__(name, short_description, long_description, func, arguments,
+                                     return_type)
+        self.method_type = method_type
+        self.defined_in = defined_in
+
+
+class Class(_Model):
+    """Class object
+
+    This object represents a class with all its public methods, inherited ones included.
+    """
+    __slots__ = ('name', 'short_description', 'long_description', 'cls', 'methods')
+
+    def __init__(self, name, short_description, long_description, cls, methods):
+        self.name = name
+        self.short_description = short_description
+        self.long_description = long_description
+        self.cls = cls
+        self.methods = methods or []
+
+    def __getstate__(self):
+        state = super(Class, self).__getstate__()
+        state['cls'] = None
+        return state
+
+
+_MISSING = object()
+
+
+def _resolve_annotations(func):
+    """Get the annotations of a function, evaluating the ones given as strings"""
+    func = _unwrap(func)
+    annotations = getattr(func, '__annotations__', None)
+    if not annotations:
+        return {}
+    if get_type_hints is not None and any(isinstance(value, six.string_types)
+                                          for value in annotations.values()):
+        try:
+            return get_type_hints(func)
+        except Exception:
+            pass  # Names that can't be resolved, annotations are kept as strings
+    return dict(annotations)
+
+
+def _format_annotation(value):
+    if isinstance(value, six.string_types):
+        return value
+    return getattr(inspect, 'formatannotation', repr)(value)
+
+
+# Functions whose source code couldn't be read, they are not tried again
+_unavailable_sources = NegativeCache(maxsize=4096)
+
+
+def _get_source(func):
+    """Get the source code of a function, None if it's not available"""
+    func = _unwrap(func)
+    if getattr(func, '__code__', None) is None or func in _unavailable_sources:
+        return None  # Builtins and C extensions have no code object
+    try:
+        return stats.measure('source', inspect.getsource, func)
+    except (IOError, OSError, TypeError):
+        _unavailable_sources.set(func, True)
+        return None
+
+
+def get_source_location(func):
+    """Get the location of the source code of a function from its code object, without reading it
+
+    Partials and wrappers (``__wrapped__``) get the location of the function they wrap. See
+    Function.source_location for how the last line is found.
+
+    :param function func: Function
+    :return: Tuple with filename, first line and last line, None if it has no code object
+    :rtype: tuple
+    """
+    code = getattr(_unwrap(func), '__code__', None)
+    if code is None:
+        return None
+    return code.co_filename, code.co_firstlineno, _last_line(code)
+
+
+def _unwrap(func):
+    """Follow the ``functools.partial`` and ``__wrapped__`` chains down to the original function"""
+    seen = set()
+    while id(func) not in seen:
+        seen.add(id(func))
+        if isinstance(func, functools.partial):
+            func = func.func
+        elif getattr(func, '__wrapped__', None) is not None:
+            func = func.__wrapped__
+        else:
+            break
+    return func
+
+
+def _last_line(code):
+    """Get the last line number used by a code object, including nested code objects
+
+    On python 3.11+ it's the line where the last expression ends, taken from the instruction
+    positions, so closing brackets on their own line are included. On older versions only the
+    lines where statements start are known, so it's the line where the last statement starts.
+
+    :param code code: Code object
+    :return: Last line number
+    :rtype: int
+    """
+    last_line = code.co_firstlineno
+    positions = getattr(code, 'co_positions', None)
+    if positions is not None:
+        lines = (end_line for _, end_line, _, _ in positions())
+    else:
+        lines = (line for _, line in dis.findlinestarts(code))
+    for line in lines:
+        if line is not None and line > last_line:
+            last_line = line
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            last_line = max(last_line, _last_line(const))
+    return last_line
+
+
+_PLAIN_TYPES = ((type(None), bool, float, complex, bytes, DefaultRepr) + six.integer_types +
+                six.string_types)
+
+
+def _is_plain(value):
+    """Check if a value is made only of builtin values (or DefaultRepr), so unpickling it imports
+    nothing but pynspector"""
+    if isinstance(value, (tuple, list, set, frozenset)):
+        return type(value) in (tuple, list, set, frozenset) and all(_is_plain(item)
+                                                                    for item in value)
+    if isinstance(value, dict):
+        return type(value) is dict and all(
+            _is_plain(key) and _is_plain(item) for key, item in value.items()
+        )
+    return type(value) in _PLAIN_TYPES
+
+
+_ARGUMENT_KEY_FORMAT = u'\x00'.join([u'%s'] * 7)
+
+# Memory addresses in default values repr, such as <object object at 0x7f...>
+_ADDRESS_REGEX = re.compile(r' at 0x[0-9a-fA-F]+')
+
+
+def get_default_repr(default):
+    """Get the repr of a default value without memory addresses, so it's stable across processes
+
+    Defaults that are already a repr (DefaultRepr) give the repr of the value they stand for.
+
+    :param default: Default value
+    :rtype: str
+    """
+    default = repr(default)
+    if ' at 0x' in default:
+        default = _ADDRESS_REGEX.sub('', default)
+    return default
+
+
+def get_argument_key(argument):
+    """Get the values of an argument that are part of the function fingerprint
+
+    :param argument: Argument or ArgumentRecord
+    :return: Tuple with name, position, parameter kind, whether it's mandatory, default value repr
+        (see get_default_repr), kind and description
+    :rtype: tuple
+    """
+    return (argument.name, argument.position, argument.parameter_kind, argument.is_arg,
+            get_default_repr(argument.default), argument.kind, argument.description)
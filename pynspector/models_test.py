@@ -0,0 +1,232 @@
+# -* coding: utf-8 *-
+"""
+Set of tests for models module
+"""
+# System imports
+import functools
+import inspect
+import pickle
+import unittest
+
+import six
+
+try:
+    import typing
+    from unittest import mock
+except ImportError:  # python 2
+    import mock
+
+# Third-party imports
+# Local imports
+from .models import (
+    Argument, ArgumentRecord, DefaultRepr, Function, FunctionRecord, _unavailable_sources
+)
+
+
+def dummy_func(foo, bar=None):
+    """Dummy function"""
+    def inner():
+        return bar
+    return foo, inner
+
+
+def func_with_closing_brackets():
+    values = {
+        'foo': 1,
+    }
+    return (values,
+            2
+            )
+
+
+class TestFunction(unittest.TestCase):
+    """
+    Test suite for class `Function`
+    """
+
+    def _function(self, func):
+        return Function(name=getattr(func, '__name__', None), short_description='', long_description='',
+                        func=func, arguments=[])
+
+    def test_should_not_read_source_on_init(self):
+        function = self._function(len)
+        self.assertEqual(function.name, 'len')
+
+    def test_should_retrieve_source_code_lazily(self):
+        function = self._function(dummy_func)
+        self.assertEqual(function.source_code, inspect.getsource(dummy_func))
+
+    def test_should_allow_setting_source_code(self):
+        function = self._function(len)
+        function.source_code = 'def len(obj): pass'
+        self.assertEqual(function.source_code, 'def len(obj): pass')
+
+    def test_should_return_source_location(self):
+        lines, first_line = inspect.getsourcelines(dummy_func)
+        self.assertEqual(
+            self._function(dummy_func).source_location,
+            (dummy_func.__code__.co_filename, first_line, first_line + len(lines) - 1)
+        )
+
+    @unittest.skipUnless(hasattr(dummy_func.__code__, 'co_positions'),
+                         "end lines are only known on python 3.11+")
+    def test_should_include_closing_brackets_on_source_location(self):
+        lines, first_line = inspect.getsourcelines(func_with_closing_brackets)
+        self.assertEqual(self._function(func_with_closing_brackets).source_location[1:],
+                         (first_line, first_line + len(lines) - 1))
+
+    def test_should_return_no_source_for_builtins(self):
+        self.assertIsNone(self._function(len).source_code)
+
+    def test_should_remember_unavailable_sources(self):
+        namespace = {}
+        exec("def generated(): pass", namespace)
+        function = self._function(namespace['generated'])
+        self.assertIsNone(function.source_code)
+        self.assertIn(namespace['generated'], _unavailable_sources)
+
+    def test_should_follow_partials(self):
+        partial = functools.partial(dummy_func, 1)
+        self.assertEqual(self._function(partial).source_code, inspect.getsource(dummy_func))
+        self.assertEqual(self._function(partial).source_location,
+                         self._function(dummy_func).source_location)
+
+    def test_should_return_no_location_for_builtins(self):
+        self.assertIsNone(self._function(len).source_location)
+
+    def test_should_not_have_instance_dict(self):
+        self.assertFalse(hasattr(self._function(dummy_func), '__dict__'))
+
+    def test_should_convert_to_record_and_back(self):
+        function = self._function(dummy_func)
+        function.arguments = [Argument('foo', None, 'str', 'Foo', True, 0)]
+        record = function.to_record()
+        self.assertIsInstance(record, FunctionRecord)
+        self.assertIsInstance(record.arguments[0], ArgumentRecord)
+        self.assertEqual(record.source_code, inspect.getsource(dummy_func))
+
+        rebuilt = Function.from_record(record)
+        self.assertIsNone(rebuilt.func)
+        self.assertEqual(rebuilt.to_record(), record)
+
+    def test_should_keep_fingerprint_on_records(self):
+        function = self._function(dummy_func)
+        record = function.to_record(include_source=False)
+        self.assertEqual(record.fingerprint, function.fingerprint)
+        self.assertEqual(Function.from_record(record)._fingerprint, function.fingerprint)
+
+    def test_should_read_records_without_fingerprint(self):
+        record = FunctionRecord('foo', '', '', (), None, None)
+        self.assertEqual(Function.from_record(record).fingerprint,
+                         Function('foo', '', '', None, []).fingerprint)
+
+    def test_should_replace_defaults_that_are_not_plain_on_plain_records(self):
+        sentinel = object()
+        record = FunctionRecord('foo', '', '', (
+            ArgumentRecord('bar', 1, None, None, False, 0, None),
+            ArgumentRecord('baz', sentinel, None, None, False, 1, None),
+        ), None, None)
+        plain = record.to_plain()
+        self.assertEqual(plain.arguments[0], record.arguments[0])
+        self.assertIsInstance(plain.arguments[1].default, DefaultRepr)
+        self.assertEqual(repr(plain.arguments[1].default), repr(sentinel))
+        self.assertEqual(Function.from_record(plain).fingerprint,
+                         Function.from_record(record).fingerprint)
+        self.assertIs(plain.to_plain(), plain)
+
+    def test_should_not_read_source_for_record_without_source(self):
+        self.assertIsNone(self._function(dummy_func).to_record(include_source=False).source_code)
+
+    def test_should_convert_to_dict(self):
+        function = self._function(dummy_func)
+        function.arguments = [Argument('foo', None, 'str', 'Foo', True, 0)]
+        data = function.to_dict(include_source=False)
+        self.assertEqual(data['arguments'][0]['name'], 'foo')
+        self.assertNotIn('source_code', data)
+        self.assertEqual(function.to_dict()['source_code'], inspect.getsource(dummy_func))
+
+    def test_should_pickle_without_live_function(self):
+        function = pickle.loads(pickle.dumps(self._function(dummy_func)))
+        self.assertIsNone(function.func)
+        self.assertEqual(function.source_code, inspect.getsource(dummy_func))
+
+
+@unittest.skipUnless(six.PY3, "Annotations are not available on python 2")
+class TestAnnotations(unittest.TestCase):
+    """
+    Test suite for the annotations of `Function` and `Argument`
+    """
+
+    def _function(self, source, kind=None, return_type=None):
+        namespace = {}
+        exec(source, namespace)
+        func = namespace['func']
+        arguments = [Argument('foo', None, kind, None, True, 0), Argument('bar', None, None, None,
+                                                                          True, 1)]
+        return Function('func', '', '', func, arguments, return_type=return_type)
+
+    def test_should_return_annotations(self):
+        function = self._function("def func(foo: int, bar) -> str: pass")
+        self.assertEqual(function.annotations, {'foo': int, 'return': str})
+        self.assertEqual(function.arguments[0].annotation, int)
+        self.assertEqual(function.return_annotation, str)
+
+    def test_should_fall_back_to_documented_types(self):
+        function = self._function("def func(foo, bar: int): pass", kind='str', return_type='int')
+        self.assertEqual(function.arguments[0].annotation, 'str')
+        self.assertEqual(function.arguments[1].annotation, int)
+        self.assertEqual(function.return_annotation, 'int')
+
+    def test_should_evaluate_string_annotations(self):
+        function = self._function("import typing\ndef func(foo: 'typing.List[int]', bar): pass")
+        self.assertEqual(function.arguments[0].annotation, typing.List[int])
+
+    def test_should_keep_unresolvable_string_annotations(self):
+        function = self._function("def func(foo: 'Missing', bar) -> 'str': pass")
+        self.assertEqual(function.annotations, {'foo': 'Missing', 'return': 'str'})
+
+    def test_should_resolve_annotations_once(self):
+        function = self._function("def func(foo: int, bar): pass")
+        with mock.patch('pynspector.models._resolve_annotations',
+                        return_value={'foo': int}) as resolve:
+            function.arguments[0].annotation
+            function.arguments[1].annotation
+            function.annotations
+        self.assertEqual(resolve.call_count, 1)
+
+    def test_should_pickle_annotations_as_strings(self):
+        function = pickle.loads(pickle.dumps(self._function(
+            "import typing\ndef func(foo: typing.List[int], bar) -> str: pass"
+        )))
+        self.assertEqual(function.annotations, {'foo': 'List[int]', 'return': 'str'})
+        self.assertEqual(function.arguments[0].annotation, 'List[int]')
+
+
+class TestArgument(unittest.TestCase):
+    """
+    Test suite for class `Argument`
+    """
+
+    def setUp(self):
+        self.argument = Argument(name='foo', default=1, kind='int', description='Foo',
+                                 is_arg=False, position=0, parameter_kind='POSITIONAL_OR_KEYWORD')
+
+    def test_should_not_have_instance_dict(self):
+        self.assertFalse(hasattr(self.argument, '__dict__'))
+
+    def test_record_should_keep_properties(self):
+        record = self.argument.to_record()
+        self.assertEqual((record.is_kwarg, record.is_mandatory), (True, False))
+        self.assertEqual(record.default, 1)
+
+    def test_should_convert_from_record(self):
+        argument = Argument.from_record(self.argument.to_record())
+        self.assertEqual(argument.to_record(), self.argument.to_record())
+
+    def test_should_be_picklable(self):
+        argument = pickle.loads(pickle.dumps(self.argument))
+        self.assertEqual(argument.to_record(), self.argument.to_record())
+
+
+if __name__ == '__main__':
+    unittest.main()
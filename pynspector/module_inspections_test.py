@@ -3,6 +3,7 @@
 Set of tests for testing module inspections
 """
 # System imports
+import types
 import unittest
 
 # Third-party imports
@@ -33,6 +34,44 @@ class TestGetModuleFunctions(unittest.TestCase):
             list(get_module_functions(module_inspections_fixture_test))
         )
 
+    def _module(self, **members):
+        module = types.ModuleType('fake_module')
+        for name, member in members.items():
+            setattr(module, name, member)
+        return module
+
+    def test_it_should_respect_all_when_present(self):
+        module = self._module(__all__=['_dummy_func'], dummy_func=dummy_func,
+                              _dummy_func=_dummy_func)
+        self.assertListEqual([_dummy_func], list(get_module_functions(module)))
+
+    def test_it_should_ignore_missing_names_in_all(self):
+        module = self._module(__all__=['dummy_func', 'missing'], dummy_func=dummy_func)
+        self.assertListEqual([dummy_func], list(get_module_functions(module)))
+
+    def test_it_should_sort_by_name(self):
+        module = self._module(__all__=['zzz', 'aaa'], zzz=_dummy_func, aaa=dummy_func)
+        self.assertListEqual([dummy_func, _dummy_func], list(get_module_functions(module)))
+        self.assertListEqual([_dummy_func, dummy_func],
+                             list(get_module_functions(module, sort=False)))
+
+    def test_it_should_exclude_imported_functions(self):
+        module = self._module(dummy_func=dummy_func)
+        self.assertListEqual([dummy_func], list(get_module_functions(module)))
+        self.assertListEqual([], list(get_module_functions(module, exclude_imported=True)))
+
+    def test_it_should_include_builtins_on_demand(self):
+        module = self._module(dummy_func=dummy_func, len=len)
+        self.assertListEqual([dummy_func], list(get_module_functions(module)))
+        self.assertListEqual([dummy_func, len],
+                             list(get_module_functions(module, include_builtins=True)))
+
+    def test_it_should_not_trigger_lazy_attributes(self):
+        def __getattr__(name):
+            raise AssertionError("Lazy attribute %s accessed" % name)
+        module = self._module(__getattr__=__getattr__, dummy_func=dummy_func)
+        self.assertListEqual([dummy_func], list(get_module_functions(module)))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,221 @@
+# -* coding: utf-8 *-
+"""
+:py:mod:`pynspector.package_inspections`
+----------------------------------------
+Module for inspecting whole packages
+"""
+# System imports
+import functools
+import importlib
+import multiprocessing
+import os
+import pkgutil
+import traceback
+from collections import namedtuple
+
+# Third-party imports
+# Local imports
+from .doc_parsers import sphinx_doc_parser
+from .func_inspections import get_func_inspect_result
+from .module_inspections import get_module_functions
+
+
+__all__ = ['ModuleInspection', 'get_package_module_names', 'inspect_module', 'inspect_package',
+           'iter_package_inspections', 'iter_inspections']
+
+
+class ModuleInspection(namedtuple('ModuleInspection', ['module', 'functions', 'error'])):
+    """Inspection results for a module
+
+    - module: Dotted name of the module.
+    - functions: List of models.Function for the public functions of the module.
+    - error: Traceback of the error if the module couldn't be inspected, None otherwise.
+    """
+    __slots__ = ()
+
+
+def _import(package):
+    if hasattr(package, '__name__'):
+        return package
+    return importlib.import_module(package)
+
+
+def get_package_module_names(package):
+    """Get the names of a package and all its submodules
+
+    Submodules are discovered from the package directories, so they are not imported.
+
+    Example:
+    >>> get_package_module_names('pynspector')
+    >>> ['pynspector', 'pynspector.cache', 'pynspector.doc_parsers', ...]
+
+    :param package: Package to walk, module object or dotted name
+    :return: Sorted list of module names
+    :rtype: list
+    """
+    return sorted(_iter_module_names(_import(package)))
+
+
+def _iter_module_names(package):
+    yield package.__name__
+    if hasattr(package, '__path__'):
+        for name in _walk_module_names(package.__path__, package.__name__ + '.'):
+            yield name
+
+
+def _walk_module_names(path, prefix):
+    for _, name, is_package in pkgutil.iter_modules(path, prefix):
+        yield name
+        if is_package:
+            subpath = [os.path.join(directory, name.rsplit('.', 1)[-1]) for directory in path]
+            for subname in _walk_module_names(subpath, name + '.'):
+                yield subname
+
+
+def inspect_module(module_name, doc_parser=sphinx_doc_parser, lightweight=False):
+    """Import a module and inspect all its public functions
+
+    Errors are reported on the result instead of being raised.
+
+    :param str module_name: Dotted name of the module
+    :param function doc_parser: Parser used to parse the docstrings
+    :param bool lightweight: Drop the live function and source code from the results
+    :return: Inspection results for the module
+    :rtype: ModuleInspection
+    """
+    try:
+        module = importlib.import_module(module_name)
+        functions = [get_func_inspect_result(func, doc_parser=doc_parser)
+                     for func in get_module_functions(module)]
+    except Exception:
+        return ModuleInspection(module_name, [], traceback.format_exc())
+    if lightweight:
+        for function in functions:
+            _drop_heavy_fields(function)
+    return ModuleInspection(module_name, functions, None)
+
+
+def _drop_heavy_fields(function):
+    # The location is computed from the live function, keep it before dropping it
+    function.source_location = function.source_location
+    function.func = None
+    function.source_code = None
+
+
+def inspect_package(package, workers=None, doc_parser=sphinx_doc_parser, chunksize=1):
+    """Inspect every public function of a package and its submodules
+
+    Modules are sharded across a pool of ``workers`` processes. Results are returned in the
+    same order as the module names, and a module that fails to import or to be inspected is
+    reported on its result without stopping the others.
+    Functions are pickled back from the workers, so they come without the live function
+    (``func`` is None) unless the package is inspected with a single worker.
+
+    Example:
+    >>> for result in inspect_package('pynspector', workers=4):
+    ...     if result.error:
+    ...         print(result.module, result.error)
+
+    :param package: Package to inspect, module object or dotted name
+    :param int workers: Number of processes, by default the number of CPUs. With 1 worker
+        the modules are inspected in this process.
+    :param function doc_parser: Parser used to parse the docstrings, it must be picklable
+    :param int chunksize: Number of modules sent to a worker at once
+    :return: List of ModuleInspection sorted by module name
+    :rtype: list
+    """
+    return list(iter_package_inspections(package, workers=workers, doc_parser=doc_parser,
+                                         chunksize=chunksize))
+
+
+def iter_package_inspections(package, workers=None, doc_parser=sphinx_doc_parser, chunksize=1,
+                             lightweight=False):
+    """Inspect a package as inspect_package does, yielding every module result once it's ready
+
+    Results are yielded in module name order, as soon as the result of a module and all the
+    previous ones are available.
+
+    :param package: Package to inspect, module object or dotted name
+    :param int workers: Number of processes, by default the number of CPUs. With 1 worker
+        the modules are inspected in this process, one at a time as results are consumed.
+    :param function doc_parser: Parser used to parse the docstrings, it must be picklable
+    :param int chunksize: Number of modules sent to a worker at once
+    :param bool lightweight: Drop the live function and source code from the results
+    :return: Generator of ModuleInspection sorted by module name
+    :rtype: generator
+    """
+    module_names = get_package_module_names(package)
+    inspect_one = functools.partial(inspect_module, doc_parser=doc_parser,
+                                    lightweight=lightweight)
+    if workers == 1:
+        for module_name in module_names:
+            yield inspect_one(module_name)
+        return
+
+    pool = multiprocessing.Pool(workers)
+    try:
+        iterator = pool.imap(inspect_one, module_names, chunksize)
+        for module_name in module_names:
+            try:
+                result = next(iterator)
+            except Exception:
+                # The worker result couldn't be sent back, pickling failed for example
+                result = ModuleInspection(module_name, [], traceback.format_exc())
+            yield result
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def iter_inspections(root, doc_parser=sphinx_doc_parser, lightweight=False, on_error=None,
+                     cache=None):
+    """Inspect every public function of a package and its submodules, one function at a time
+
+    Nothing is computed ahead of the consumer: the next module is only imported when the
+    functions of the previous one have been consumed, and only the function being yielded is
+    kept in memory, so memory usage doesn't depend on the size of the package.
+
+    With ``lightweight`` the heavy fields are dropped from every result: the live function is
+    not kept (``func`` is None) and the source code is never read (``source_code`` is None).
+    The source location is still available.
+
+    With a ``cache`` (disk_cache.DiskCache), modules that didn't change since they were cached
+    are read from it without being imported. The doc parser of the cache is used instead of
+    ``doc_parser``.
+
+    Example:
+    >>> for module_name, function in iter_inspections('pynspector', lightweight=True):
+    ...     print(module_name, function.name)
+
+    :param root: Package or module to inspect, module object or dotted name
+    :param function doc_parser: Parser used to parse the docstrings
+    :param bool lightweight: Drop the live function and source code from the results
+    :param function on_error: Called with the module name and the traceback when a module, or
+        one of its functions, can't be inspected. The rest of that module is skipped, by default
+        silently
+    :param disk_cache.DiskCache cache: Persistent cache for the module inspections
+    :return: Generator of tuples with the module name and the models.Function
+    :rtype: generator
+    """
+    for module_name in _iter_module_names(_import(root)):
+        functions = None
+        while True:
+            # Functions are inspected while they are consumed, so every step can fail
+            try:
+                if functions is None:
+                    if cache is not None:
+                        functions = iter(cache.inspect_module(module_name))
+                    else:
+                        module = importlib.import_module(module_name)
+                        functions = (get_func_inspect_result(func, doc_parser=doc_parser)
+                                     for func in get_module_functions(module))
+                function = next(functions)
+            except StopIteration:
+                break
+            except Exception:
+                if on_error is not None:
+                    on_error(module_name, traceback.format_exc())
+                break
+            if lightweight:
+                _drop_heavy_fields(function)
+            yield module_name, function
@@ -0,0 +1,165 @@
+# -* coding: utf-8 *-
+"""
+Set of tests for package inspections module
+"""
+# System imports
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Third-party imports
+# Local imports
+from pynspector.disk_cache import DiskCache
+from pynspector.doc_parsers import sphinx_doc_parser
+from pynspector.package_inspections import (
+    get_package_module_names, inspect_module, inspect_package, iter_inspections, ModuleInspection
+)
+
+
+def _write(path, content):
+    with open(path, 'w') as module_file:
+        module_file.write(content)
+
+
+class PackageFixtureMixin(object):
+    """Creates the package `fixture_package` on a temporary directory"""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        package = os.path.join(directory, 'fixture_package')
+        os.makedirs(os.path.join(package, 'subpackage'))
+        _write(os.path.join(package, '__init__.py'), '')
+        _write(os.path.join(package, 'handlers.py'),
+               'def get(request, retries=3):\n    """Get handler"""\n    return request\n\n\n'
+               'def post(request):\n    """Post handler"""\n    return request\n')
+        _write(os.path.join(package, 'broken.py'), 'raise RuntimeError("broken module")\n')
+        _write(os.path.join(package, 'subpackage', '__init__.py'), '')
+        _write(os.path.join(package, 'subpackage', 'utils.py'),
+               'def helper(value):\n    """Helper"""\n    return value\n')
+        sys.path.insert(0, directory)
+        self.addCleanup(shutil.rmtree, directory)
+        self.addCleanup(sys.path.remove, directory)
+        self.addCleanup(self._unload)
+
+    def _unload(self):
+        for name in list(sys.modules):
+            if name.startswith('fixture_package'):
+                del sys.modules[name]
+
+
+class TestGetPackageModuleNames(PackageFixtureMixin, unittest.TestCase):
+    """
+    Test suite for function `get_package_module_names`
+    """
+
+    def test_it_should_walk_submodules_without_importing_them(self):
+        self.assertListEqual(get_package_module_names('fixture_package'), [
+            'fixture_package', 'fixture_package.broken', 'fixture_package.handlers',
+            'fixture_package.subpackage', 'fixture_package.subpackage.utils',
+        ])
+        self.assertNotIn('fixture_package.broken', sys.modules)
+
+
+class TestInspectModule(PackageFixtureMixin, unittest.TestCase):
+    """
+    Test suite for function `inspect_module`
+    """
+
+    def test_it_should_report_errors(self):
+        result = inspect_module('fixture_package.broken')
+        self.assertEqual(result.functions, [])
+        self.assertIn('broken module', result.error)
+
+    def test_results_should_be_picklable(self):
+        result = pickle.loads(pickle.dumps(inspect_module('fixture_package.handlers')))
+        self.assertEqual(['get', 'post'], [function.name for function in result.functions])
+        self.assertIsNone(result.functions[0].func)
+        self.assertIn('def get(request, retries=3):', result.functions[0].source_code)
+
+
+class TestInspectPackage(PackageFixtureMixin, unittest.TestCase):
+    """
+    Test suite for function `inspect_package`
+    """
+
+    def _check_results(self, results):
+        self.assertTrue(all(isinstance(result, ModuleInspection) for result in results))
+        self.assertListEqual(
+            [(result.module, [function.name for function in result.functions])
+             for result in results],
+            [('fixture_package', []), ('fixture_package.broken', []),
+             ('fixture_package.handlers', ['get', 'post']), ('fixture_package.subpackage', []),
+             ('fixture_package.subpackage.utils', ['helper'])]
+        )
+        self.assertIsNotNone(results[1].error)
+
+    def test_it_should_inspect_in_this_process_with_one_worker(self):
+        self._check_results(inspect_package('fixture_package', workers=1))
+
+    def test_it_should_inspect_with_a_process_pool(self):
+        self._check_results(inspect_package('fixture_package', workers=2))
+
+
+class TestIterInspections(PackageFixtureMixin, unittest.TestCase):
+    """
+    Test suite for function `iter_inspections`
+    """
+
+    def test_it_should_yield_functions_with_their_module(self):
+        self.assertListEqual(
+            [(module_name, function.name)
+             for module_name, function in iter_inspections('fixture_package')],
+            [('fixture_package.handlers', 'get'), ('fixture_package.handlers', 'post'),
+             ('fixture_package.subpackage.utils', 'helper')]
+        )
+
+    def test_it_should_import_modules_lazily(self):
+        inspections = iter_inspections('fixture_package')
+        module_name, _ = next(inspections)
+        self.assertEqual(module_name, 'fixture_package.handlers')
+        self.assertNotIn('fixture_package.subpackage.utils', sys.modules)
+
+    def test_it_should_report_errors(self):
+        errors = []
+        list(iter_inspections('fixture_package', on_error=lambda *error: errors.append(error)))
+        self.assertEqual(['fixture_package.broken'], [module_name for module_name, _ in errors])
+        self.assertIn('broken module', errors[0][1])
+
+    def test_it_should_report_errors_inspecting_functions(self):
+        def doc_parser(docstring):
+            if docstring == 'Post handler':
+                raise ValueError('unparseable docstring')
+            return sphinx_doc_parser(docstring)
+
+        errors = []
+        names = [(module_name, function.name) for module_name, function in iter_inspections(
+            'fixture_package', doc_parser=doc_parser, on_error=lambda *error: errors.append(error)
+        )]
+        self.assertEqual(names, [('fixture_package.handlers', 'get'),
+                                 ('fixture_package.subpackage.utils', 'helper')])
+        self.assertEqual([module_name for module_name, _ in errors],
+                         ['fixture_package.broken', 'fixture_package.handlers'])
+        self.assertIn('unparseable docstring', errors[1][1])
+
+    def test_it_should_drop_heavy_fields_when_lightweight(self):
+        _, function = next(iter_inspections('fixture_package', lightweight=True))
+        self.assertIsNone(function.func)
+        self.assertIsNone(function.source_code)
+        self.assertTrue(function.source_location[0].endswith('handlers.py'))
+
+    def test_it_should_read_unchanged_modules_from_cache(self):
+        cache_directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_directory)
+        list(iter_inspections('fixture_package', cache=DiskCache(cache_directory)))
+        self._unload()
+        cache = DiskCache(cache_directory)
+        names = [function.name for _, function in iter_inspections('fixture_package', cache=cache)]
+        self.assertEqual(['get', 'post', 'helper'], names)
+        self.assertNotIn('fixture_package.handlers', sys.modules)
+
+
+if __name__ == '__main__':
+    unittest.main()
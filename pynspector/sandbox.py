@@ -0,0 +1,263 @@
+# -* coding: utf-8 *-
+"""
+:py:mod:`pynspector.sandbox`
+----------------------------
+Isolated inspection on a pool of persistent worker processes.
+
+Modules are imported and inspected by worker processes, never by the calling process, so its
+``sys.modules`` is left untouched, memory leaked by the imports goes away with the workers and
+an import that crashes the interpreter only takes a worker down. Results are sent back as
+records with plain builtin values (FunctionRecord.to_plain), so reading them doesn't import the
+inspected modules either.
+
+Workers are kept warm between modules, and replaced with fresh ones after inspecting
+``max_modules`` modules or when their memory usage goes over ``max_memory``.
+
+Example:
+>>> with SandboxPool(workers=2, max_modules=50, max_memory=512 * 1024 * 1024) as sandbox:
+...     for result in sandbox.inspect_package('some_third_party_package'):
+...         print(result.module, [function.name for function in result.functions])
+"""
+# System imports
+import importlib
+import multiprocessing
+import sys
+import threading
+import traceback
+from multiprocessing.pool import ThreadPool
+
+from six.moves import queue
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Third-party imports
+# Local imports
+from . import models
+from .doc_parsers import sphinx_doc_parser
+from .func_inspections import get_func_inspect_result
+from .module_inspections import get_module_functions
+from .package_inspections import ModuleInspection, get_package_module_names
+
+
+__all__ = ['SandboxPool']
+
+
+class SandboxPool(object):
+    """Pool of worker processes inspecting modules in isolation
+
+    Workers are started when they are first needed. It's thread safe, every call takes an idle
+    worker or waits for one.
+    """
+
+    def __init__(self, workers=None, max_modules=100, max_memory=None,
+                 doc_parser=sphinx_doc_parser, include_source=True, timeout=None):
+        """ Initialize SandboxPool object
+
+        :param int workers: Number of worker processes, by default the number of CPUs
+        :param int max_modules: Modules inspected by a worker before it's replaced, None to
+            never replace workers because of it
+        :param int max_memory: Memory usage in bytes above which a worker is replaced, None to
+            never replace workers because of it
+        :param function doc_parser: Parser used to parse the docstrings, it must be picklable
+        :param bool include_source: Send the source code of the functions back
+        :param float timeout: Seconds to wait for a module, the worker is killed when it takes
+            longer. None waits forever
+        """
+        self.workers = workers or multiprocessing.cpu_count()
+        self.max_modules = max_modules
+        self.max_memory = max_memory
+        self.doc_parser = doc_parser
+        self.include_source = include_source
+        self.timeout = timeout
+        # Number of workers replaced because of max_modules, max_memory, a crash or a timeout
+        self.recycled = 0
+        # Idle workers, None stands for a worker that isn't started yet
+        self._idle = queue.Queue()
+        for _ in range(self.workers):
+            self._idle.put(None)
+        self._closed = False
+        self._close_lock = threading.Lock()
+
+    def inspect_module(self, module_name):
+        """Import and inspect the public functions of a module on a worker
+
+        Errors, including crashes and timeouts of the worker, are reported on the result instead
+        of being raised.
+
+        :param str module_name: Dotted name of the module
+        :return: Inspection results, ``func`` is None for every function
+        :rtype: package_inspections.ModuleInspection
+        """
+        records, error = self._call('inspect', module_name)
+        if error is not None:
+            return ModuleInspection(module_name, [], error)
+        return ModuleInspection(module_name,
+                                [models.Function.from_record(record) for record in records], None)
+
+    def get_package_module_names(self, package):
+        """Get the names of a package and all its submodules, the package is imported on a worker
+
+        :param str package: Dotted name of the package
+        :return: Sorted list of module names
+        :rtype: list
+        :raises ImportError: If the package can't be imported
+        """
+        module_names, error = self._call('walk', package)
+        if error is not None:
+            raise ImportError(error)
+        return module_names
+
+    def inspect_package(self, package):
+        """Inspect a package and all its submodules, sharding the modules across the workers
+
+        :param str package: Dotted name of the package
+        :return: List of ModuleInspection sorted by module name
+        :rtype: list
+        :raises ImportError: If the package can't be imported
+        """
+        module_names = self.get_package_module_names(package)
+        pool = ThreadPool(self.workers)
+        try:
+            return pool.map(self.inspect_module, module_names, 1)
+        finally:
+            pool.close()
+            pool.join()
+
+    def close(self):
+        """Stop all the workers, waiting for the ones that are busy
+
+        Closing a pool that is already closed does nothing.
+        """
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        for _ in range(self.workers):
+            worker = self._idle.get()
+            if worker is not None:
+                worker.stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _call(self, command, name):
+        worker = self._idle.get()
+        try:
+            if worker is None:
+                worker = _Worker(self.doc_parser, self.include_source)
+            try:
+                result, error = worker.call(command, name, self.timeout)
+            except _WorkerFailure as failure:
+                worker.stop(kill=True)
+                worker = None
+                self.recycled += 1
+                return None, '%s while inspecting %s\n' % (failure, name)
+            except BaseException:
+                # Interrupted while waiting for the answer (KeyboardInterrupt for example), the
+                # worker may still send it later, so it can't be reused
+                worker.stop(kill=True)
+                worker = None
+                raise
+            if ((self.max_modules is not None and worker.calls >= self.max_modules) or
+                    (self.max_memory is not None and worker.memory is not None and
+                     worker.memory > self.max_memory)):
+                worker.stop()
+                worker = None
+                self.recycled += 1
+            return result, error
+        finally:
+            self._idle.put(worker)
+
+
+class _WorkerFailure(Exception):
+    """The worker died or didn't answer in time"""
+
+
+class _Worker(object):
+    """Worker process and the connection to talk to it"""
+
+    def __init__(self, doc_parser, include_source):
+        self.connection, child_connection = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_worker_main,
+                                               args=(child_connection, doc_parser, include_source))
+        self.process.daemon = True
+        self.process.start()
+        child_connection.close()
+        self.calls = 0
+        self.memory = None
+
+    def call(self, command, name, timeout):
+        try:
+            self.connection.send((command, name))
+            if timeout is not None and not self.connection.poll(timeout):
+                raise _WorkerFailure('Worker timed out after %s seconds' % timeout)
+            result, error, memory = self.connection.recv()
+        except (EOFError, IOError, OSError):
+            self.process.join(1)
+            raise _WorkerFailure('Worker died with exit code %s' % self.process.exitcode)
+        self.calls += 1
+        self.memory = memory
+        return result, error
+
+    def stop(self, kill=False):
+        if not kill:
+            try:
+                self.connection.send(None)
+            except (IOError, OSError):
+                pass
+            self.process.join(1)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.connection.close()
+
+
+def _worker_main(connection, doc_parser, include_source):
+    """Answer requests until the connection is closed or None is received"""
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        command, name = request
+        try:
+            if command == 'walk':
+                result = get_package_module_names(name)
+            else:
+                result = _inspect_records(name, doc_parser, include_source)
+            response = (result, None, _memory_usage())
+        except Exception:
+            response = (None, traceback.format_exc(), _memory_usage())
+        connection.send(response)
+
+
+def _inspect_records(module_name, doc_parser, include_source):
+    module = importlib.import_module(module_name)
+    return [
+        get_func_inspect_result(func, doc_parser=doc_parser).to_record(
+            include_source=include_source
+        ).to_plain()
+        for func in get_module_functions(module)
+    ]
+
+
+def _memory_usage():
+    """Get the resident memory of this process in bytes, None if it can't be known"""
+    if resource is None:
+        return None
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize()
+    except (IOError, OSError, ValueError, IndexError):
+        pass
+    # Peak usage, in kilobytes on linux and bytes on macOS
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage if sys.platform == 'darwin' else usage * 1024
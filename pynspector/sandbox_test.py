@@ -0,0 +1,124 @@
+# -* coding: utf-8 *-
+"""
+Set of tests for sandbox module
+"""
+# System imports
+import os
+import sys
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:  # python 2
+    import mock
+
+# Third-party imports
+# Local imports
+from pynspector.package_inspections_test import PackageFixtureMixin, _write
+from pynspector.sandbox import SandboxPool
+
+
+class TestSandboxPool(PackageFixtureMixin, unittest.TestCase):
+    """
+    Test suite for class `SandboxPool`
+    """
+
+    def setUp(self):
+        super(TestSandboxPool, self).setUp()
+        self.package = [path for path in sys.path
+                        if os.path.isdir(os.path.join(path, 'fixture_package'))][0]
+        self.sandbox = SandboxPool(workers=2)
+        self.addCleanup(self.sandbox.close)
+
+    def _write_module(self, name, content):
+        _write(os.path.join(self.package, 'fixture_package', name + '.py'), content)
+
+    def test_inspect_module(self):
+        result = self.sandbox.inspect_module('fixture_package.handlers')
+        self.assertEqual(result.module, 'fixture_package.handlers')
+        self.assertIsNone(result.error)
+        self.assertEqual([function.name for function in result.functions], ['get', 'post'])
+        get = result.functions[0]
+        self.assertIsNone(get.func)
+        self.assertEqual(get.short_description, 'Get handler')
+        self.assertEqual(get.arguments[1].default, 3)
+        self.assertIn('def get(request', get.source_code)
+        self.assertNotIn('fixture_package.handlers', sys.modules)
+
+    def test_inspect_module_error(self):
+        result = self.sandbox.inspect_module('fixture_package.broken')
+        self.assertEqual(result.functions, [])
+        self.assertIn('broken module', result.error)
+
+    def test_inspect_package(self):
+        results = self.sandbox.inspect_package('fixture_package')
+        self.assertEqual([result.module for result in results], [
+            'fixture_package', 'fixture_package.broken', 'fixture_package.handlers',
+            'fixture_package.subpackage', 'fixture_package.subpackage.utils',
+        ])
+        self.assertIn('broken module', results[1].error)
+        self.assertEqual([function.name for function in results[4].functions], ['helper'])
+        self.assertNotIn('fixture_package', sys.modules)
+
+    def test_inspect_package_not_found(self):
+        with self.assertRaises(ImportError):
+            self.sandbox.inspect_package('fixture_package_not_found')
+
+    def test_plain_defaults(self):
+        self._write_module('defaults', 'class Marker(object):\n    pass\n\n\n'
+                                       'def run(marker=Marker()):\n    return marker\n')
+        result = self.sandbox.inspect_module('fixture_package.defaults')
+        self.assertTrue(result.functions[0].arguments[0].default.startswith('<fixture_package'))
+        self.assertNotIn('fixture_package.defaults', sys.modules)
+
+    def test_without_source(self):
+        with SandboxPool(workers=1, include_source=False) as sandbox:
+            result = sandbox.inspect_module('fixture_package.handlers')
+        self.assertIsNone(result.functions[0].source_code)
+
+    def test_recycle_after_max_modules(self):
+        with SandboxPool(workers=1, max_modules=2) as sandbox:
+            for _ in range(5):
+                self.assertIsNone(sandbox.inspect_module('fixture_package.handlers').error)
+            self.assertEqual(sandbox.recycled, 2)
+
+    def test_recycle_over_max_memory(self):
+        with SandboxPool(workers=1, max_modules=None, max_memory=1) as sandbox:
+            sandbox.inspect_module('fixture_package.handlers')
+            sandbox.inspect_module('fixture_package.handlers')
+            self.assertEqual(sandbox.recycled, 2)
+
+    def test_worker_crash(self):
+        self._write_module('crash', 'import os\nos._exit(3)\n')
+        with SandboxPool(workers=1) as sandbox:
+            result = sandbox.inspect_module('fixture_package.crash')
+            self.assertIn('exit code 3', result.error)
+            self.assertEqual(sandbox.recycled, 1)
+            self.assertIsNone(sandbox.inspect_module('fixture_package.handlers').error)
+
+    def test_close_twice(self):
+        with SandboxPool(workers=1) as sandbox:
+            sandbox.inspect_module('fixture_package.handlers')
+            sandbox.close()
+        sandbox.close()
+
+    def test_interrupted_call_kills_the_worker(self):
+        with SandboxPool(workers=1) as sandbox:
+            sandbox.inspect_module('fixture_package.handlers')
+            worker = sandbox._idle.queue[0]
+            with mock.patch.object(worker.connection, 'recv', side_effect=KeyboardInterrupt):
+                with self.assertRaises(KeyboardInterrupt):
+                    sandbox.inspect_module('fixture_package.handlers')
+            self.assertFalse(worker.process.is_alive())
+            self.assertIsNone(sandbox.inspect_module('fixture_package.handlers').error)
+
+    def test_timeout(self):
+        self._write_module('slow', 'import time\ntime.sleep(30)\n')
+        with SandboxPool(workers=1, timeout=0.5) as sandbox:
+            result = sandbox.inspect_module('fixture_package.slow')
+            self.assertIn('timed out', result.error)
+            self.assertIsNone(sandbox.inspect_module('fixture_package.handlers').error)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,345 @@
+# -* coding: utf-8 *-
+"""
+:py:mod:`pynspector.server`
+---------------------------
+Long running inspection server answering queries over a local Unix socket.
+
+The server keeps an index of the public functions of some packages in memory. Source files are
+polled for changes (modification time and size), the ones of the modules and the ones defining
+the functions they re-export, and only the modules that changed are imported again and
+inspected. Every function is serialized when it's indexed, so answering a query is a
+dictionary lookup.
+
+Protocol: one JSON object per line in both directions. Requests have a ``query`` and a ``name``,
+responses have either a ``result`` or an ``error``.
+
+- ``{"query": "function", "name": "mypackage.handlers.get"}``: Function by dotted name, the
+  result is null if there's no such function.
+- ``{"query": "argument", "name": "request"}``: List of functions taking that argument, sorted by
+  dotted name.
+
+Example:
+>>> server = InspectionServer('/tmp/pynspector.sock', ['mypackage'])
+>>> server.serve_forever()  # Or `pynspector --serve /tmp/pynspector.sock mypackage`
+>>> client = InspectionClient('/tmp/pynspector.sock')
+>>> client.get_function('mypackage.handlers.get')['arguments']
+>>> [{'name': 'request', ...}]
+"""
+# System imports
+import importlib
+import json
+import os
+import socket
+import sys
+import threading
+import traceback
+
+import six
+from six.moves import socketserver
+
+# Third-party imports
+# Local imports
+from .doc_parsers import sphinx_doc_parser
+from .func_inspections import get_func_inspect_result
+from .module_inspections import get_module_functions
+from .package_inspections import get_package_module_names
+from .static_inspections import find_module_path
+
+
+__all__ = ['InspectionIndex', 'InspectionServer', 'InspectionClient', 'QueryError']
+
+
+class QueryError(ValueError):
+    """Raised by the client when the server can't answer a query"""
+
+
+class InspectionIndex(object):
+    """In memory index of the public functions of some packages
+
+    Thread safe: queries can be answered while the index is being refreshed.
+    """
+
+    def __init__(self, roots, doc_parser=sphinx_doc_parser):
+        """ Initialize InspectionIndex object
+
+        :param list roots: Dotted names of the packages or modules to index
+        :param function doc_parser: Parser used to parse the docstrings
+        """
+        self.roots = list(roots)
+        self.doc_parser = doc_parser
+        # Module name to traceback, for the modules that couldn't be inspected
+        self.errors = {}
+        self._lock = threading.Lock()
+        # Module name to (source fingerprint, dotted names of its functions, their argument names)
+        self._modules = {}
+        # Dotted function name to its JSON representation
+        self._functions = {}
+        # Argument name to set of dotted function names
+        self._arguments = {}
+
+    def refresh(self):
+        """Inspect the modules that are new or whose source changed since the last refresh
+
+        Modules that were removed are dropped from the index.
+
+        :return: Sorted list of the names of the modules inspected again or dropped
+        :rtype: list
+        """
+        invalidate_caches = getattr(importlib, 'invalidate_caches', None)
+        if invalidate_caches is not None:
+            invalidate_caches()  # Let new source files be imported
+        module_names = set()
+        for root in self.roots:
+            try:
+                module_names.update(get_package_module_names(root))
+            except Exception:
+                module_names.add(root)  # Reported as an error when it's inspected
+
+        stale = []
+        for module_name in sorted(module_names):
+            entry = self._modules.get(module_name)
+            previous = entry[0] if entry is not None else ()
+            fingerprint = _fingerprint(module_name, [path for path, _, _ in previous[1:]])
+            if entry is None or previous != fingerprint:
+                stale.append((module_name, fingerprint))
+                if entry is not None:
+                    # Imported from scratch instead of reloaded, so removed names don't linger.
+                    # All of them are removed first, so re-exported functions are the new ones
+                    sys.modules.pop(module_name, None)
+
+        changed = []
+        for module_name, fingerprint in stale:
+            functions, error = self._inspect(module_name)
+            fingerprint = fingerprint[:1] + tuple(
+                _stat(path) for path in _get_defining_paths(functions, fingerprint[0][0])
+            )
+            with self._lock:
+                self._drop(module_name)
+                self._add(module_name, fingerprint, functions)
+                if error is not None:
+                    self.errors[module_name] = error
+            changed.append(module_name)
+
+        for module_name in set(self._modules) - module_names:
+            with self._lock:
+                self._drop(module_name)
+            changed.append(module_name)
+        return sorted(changed)
+
+    def get_function(self, name):
+        """Get a function by dotted name
+
+        :param str name: Dotted name of the function, module name and function name
+        :return: JSON representation of the function, None if it's not indexed
+        :rtype: str
+        """
+        return self._functions.get(name)
+
+    def find_by_argument(self, name):
+        """Get the functions taking an argument
+
+        :param str name: Name of the argument
+        :return: List of JSON representations of the functions, sorted by dotted name
+        :rtype: list
+        """
+        with self._lock:
+            names = sorted(self._arguments.get(name, ()))
+            return [self._functions[function_name] for function_name in names]
+
+    def answer(self, request):
+        """Answer a query of the protocol
+
+        :param str request: JSON request
+        :return: JSON response
+        :rtype: str
+        """
+        try:
+            request = json.loads(request)
+            query, name = request['query'], request['name']
+        except (ValueError, TypeError, KeyError):
+            return json.dumps({'error': 'Invalid request, expected query and name'})
+        if not isinstance(name, six.string_types):
+            return json.dumps({'error': 'Invalid request, name must be a string'})
+        if query == 'function':
+            return '{"result": %s}' % (self.get_function(name) or 'null')
+        if query == 'argument':
+            return '{"result": [%s]}' % ', '.join(self.find_by_argument(name))
+        return json.dumps({'error': 'Unknown query %r' % query})
+
+    def _inspect(self, module_name):
+        try:
+            module = importlib.import_module(module_name)
+            functions = [get_func_inspect_result(func, doc_parser=self.doc_parser)
+                         for func in get_module_functions(module)]
+        except Exception:
+            return [], traceback.format_exc()
+        return functions, None
+
+    def _add(self, module_name, fingerprint, functions):
+        names, argument_names = [], set()
+        for function in functions:
+            name = '%s.%s' % (module_name, function.name)
+            data = function.to_dict(include_source=False)
+            data['module'] = module_name
+            self._functions[name] = json.dumps(data, default=repr, sort_keys=True)
+            for argument in function.arguments:
+                self._arguments.setdefault(argument.name, set()).add(name)
+                argument_names.add(argument.name)
+            names.append(name)
+        self._modules[module_name] = (fingerprint, names, argument_names)
+
+    def _drop(self, module_name):
+        self.errors.pop(module_name, None)
+        _, names, argument_names = self._modules.pop(module_name, (None, (), ()))
+        for name in names:
+            del self._functions[name]
+        for argument_name in argument_names:
+            function_names = self._arguments[argument_name]
+            function_names.difference_update(names)
+            if not function_names:
+                del self._arguments[argument_name]
+
+
+def _fingerprint(module_name, paths=()):
+    """Modification time and size of the source of a module and of other source files
+
+    :param str module_name: Dotted name of the module
+    :param list paths: Other source files, the ones defining the functions it re-exports
+    :return: Tuple with the path, modification time and size of the module source and of every
+        other file, the time and size are None for the files that don't exist
+    :rtype: tuple
+    """
+    try:
+        module_path = os.path.abspath(find_module_path(module_name))
+    except ImportError:
+        module_path = None
+    return tuple(_stat(path) for path in [module_path] + list(paths))
+
+
+def _stat(path):
+    try:
+        stat = os.stat(path)
+    except (TypeError, OSError):
+        return path, None, None
+    return path, stat.st_mtime, stat.st_size
+
+
+def _get_defining_paths(functions, module_path):
+    """Get the sorted source files defining some functions, other than the module one"""
+    paths = set()
+    for function in functions:
+        location = function.source_location
+        if location is not None:
+            paths.add(os.path.abspath(location[0]))
+    paths.discard(module_path)
+    return sorted(paths)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Answers the requests of a connection, one per line, until the client closes it"""
+
+    def handle(self):
+        index = self.server.index
+        for line in iter(self.rfile.readline, b''):
+            response = index.answer(line.decode('utf-8'))
+            self.wfile.write(response.encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+
+class InspectionServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server answering queries from an InspectionIndex
+
+    A background thread refreshes the index every ``poll_interval`` seconds while the server is
+    running. Every connection is handled on its own thread, so clients can keep a connection
+    open to send several queries.
+    """
+    daemon_threads = True
+
+    def __init__(self, socket_path, roots, doc_parser=sphinx_doc_parser, poll_interval=1.0):
+        """ Initialize InspectionServer object
+
+        The index is built before the socket is bound, so clients never see it half built.
+
+        :param str socket_path: Path of the Unix socket, replaced if it already exists
+        :param list roots: Dotted names of the packages or modules to index
+        :param function doc_parser: Parser used to parse the docstrings
+        :param float poll_interval: Seconds between checks for changed source files
+        """
+        self.index = InspectionIndex(roots, doc_parser=doc_parser)
+        self.index.refresh()
+        self.poll_interval = poll_interval
+        self._stop_polling = threading.Event()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        socketserver.UnixStreamServer.__init__(self, socket_path, _RequestHandler)
+
+    def serve_forever(self, poll_interval=0.5):
+        poller = threading.Thread(target=self._poll)
+        poller.daemon = True
+        poller.start()
+        try:
+            socketserver.UnixStreamServer.serve_forever(self, poll_interval)
+        finally:
+            self._stop_polling.set()
+
+    def server_close(self):
+        socketserver.UnixStreamServer.server_close(self)
+        self._stop_polling.set()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+    def _poll(self):
+        while not self._stop_polling.wait(self.poll_interval):
+            self.index.refresh()
+
+
+class InspectionClient(object):
+    """Client for an InspectionServer, keeps its connection open between queries"""
+
+    def __init__(self, socket_path, timeout=None):
+        """ Initialize InspectionClient object
+
+        :param str socket_path: Path of the Unix socket of the server
+        :param float timeout: Seconds to wait for a response, forever by default
+        """
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        self._socket.connect(socket_path)
+        self._file = self._socket.makefile('rwb')
+
+    def query(self, query, name):
+        """Send a query to the server
+
+        :param str query: Kind of query, function or argument
+        :param str name: Dotted name of the function or name of the argument
+        :return: Result of the query
+        :raises QueryError: If the server couldn't answer the query
+        """
+        request = json.dumps({'query': query, 'name': name})
+        self._file.write(request.encode('utf-8') + b'\n')
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise QueryError('Connection closed by the server')
+        response = json.loads(line.decode('utf-8'))
+        if 'error' in response:
+            raise QueryError(response['error'])
+        return response['result']
+
+    def get_function(self, name):
+        """Get a function by dotted name, None if it's not indexed"""
+        return self.query('function', name)
+
+    def find_by_argument(self, name):
+        """Get the functions taking an argument, sorted by dotted name"""
+        return self.query('argument', name)
+
+    def close(self):
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,131 @@
+# -* coding: utf-8 *-
+"""
+Set of tests for server module
+"""
+# System imports
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+# Third-party imports
+# Local imports
+from pynspector.package_inspections_test import PackageFixtureMixin, _write
+from pynspector.server import InspectionClient, InspectionIndex, InspectionServer, QueryError
+
+
+class TestInspectionIndex(PackageFixtureMixin, unittest.TestCase):
+    """
+    Test suite for class `InspectionIndex`
+    """
+
+    def setUp(self):
+        super(TestInspectionIndex, self).setUp()
+        self.package = os.path.join(sys.path[0], 'fixture_package')
+        self.index = InspectionIndex(['fixture_package'])
+        self.index.refresh()
+
+    def _touch(self, path, content):
+        mtime = os.stat(path).st_mtime + 10 if os.path.exists(path) else None
+        _write(path, content)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+
+    def test_it_should_index_functions_by_dotted_name(self):
+        function = json.loads(self.index.get_function('fixture_package.handlers.get'))
+        self.assertEqual(function['module'], 'fixture_package.handlers')
+        self.assertEqual([argument['name'] for argument in function['arguments']],
+                         ['request', 'retries'])
+        self.assertIsNone(self.index.get_function('fixture_package.handlers.put'))
+
+    def test_it_should_index_functions_by_argument(self):
+        names = [json.loads(function)['name']
+                 for function in self.index.find_by_argument('request')]
+        self.assertEqual(names, ['get', 'post'])
+
+    def test_it_should_report_broken_modules(self):
+        self.assertIn('broken module', self.index.errors['fixture_package.broken'])
+
+    def test_it_should_only_inspect_changed_modules(self):
+        self.assertEqual(self.index.refresh(), [])
+        self._touch(os.path.join(self.package, 'handlers.py'),
+                    'def get(path):\n    """Get handler"""\n    return path\n')
+        self.assertEqual(self.index.refresh(), ['fixture_package.handlers'])
+        self.assertIsNone(self.index.get_function('fixture_package.handlers.post'))
+        self.assertEqual(self.index.find_by_argument('request'), [])
+        self.assertEqual(len(self.index.find_by_argument('path')), 1)
+
+    def test_it_should_inspect_modules_again_when_reexported_functions_change(self):
+        self._touch(os.path.join(self.package, 'reexports.py'),
+                    'from fixture_package.subpackage.utils import helper\n')
+        self.index.refresh()
+        self._touch(os.path.join(self.package, 'subpackage', 'utils.py'),
+                    'def helper(value, strict=False):\n    return value\n')
+        self.assertEqual(self.index.refresh(),
+                         ['fixture_package.reexports', 'fixture_package.subpackage.utils'])
+        function = json.loads(self.index.get_function('fixture_package.reexports.helper'))
+        self.assertEqual([argument['name'] for argument in function['arguments']],
+                         ['value', 'strict'])
+
+    def test_it_should_follow_new_and_removed_modules(self):
+        self._touch(os.path.join(self.package, 'extra.py'), 'def extra(request):\n    pass\n')
+        os.remove(os.path.join(self.package, 'broken.py'))
+        self.assertEqual(self.index.refresh(), ['fixture_package.broken', 'fixture_package.extra'])
+        self.assertNotIn('fixture_package.broken', self.index.errors)
+        self.assertEqual(len(self.index.find_by_argument('request')), 3)
+
+    def test_it_should_answer_queries(self):
+        response = json.loads(self.index.answer('{"query": "function", "name": "nope"}'))
+        self.assertEqual(response, {'result': None})
+        response = json.loads(self.index.answer('{"query": "argument", "name": "value"}'))
+        self.assertEqual([function['name'] for function in response['result']], ['helper'])
+        self.assertIn('error', json.loads(self.index.answer('{"query": "other", "name": "x"}')))
+        self.assertIn('error', json.loads(self.index.answer('not json')))
+
+    def test_it_should_reject_names_that_are_not_strings(self):
+        for query in ('function', 'argument'):
+            response = self.index.answer(json.dumps({'query': query, 'name': ['value']}))
+            self.assertIn('error', json.loads(response))
+
+
+class TestInspectionServer(PackageFixtureMixin, unittest.TestCase):
+    """
+    Test suite for classes `InspectionServer` and `InspectionClient`
+    """
+
+    def setUp(self):
+        super(TestInspectionServer, self).setUp()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.socket_path = os.path.join(directory, 'pynspector.sock')
+        self.server = InspectionServer(self.socket_path, ['fixture_package'], poll_interval=60)
+        thread = threading.Thread(target=self.server.serve_forever, args=(0.01,))
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def test_it_should_answer_queries_over_the_socket(self):
+        with InspectionClient(self.socket_path, timeout=5) as client:
+            self.assertEqual(client.get_function('fixture_package.subpackage.utils.helper')['name'],
+                             'helper')
+            self.assertEqual([function['name'] for function in client.find_by_argument('request')],
+                             ['get', 'post'])
+            self.assertRaises(QueryError, client.query, 'other', 'x')
+
+    def test_it_should_keep_the_connection_after_invalid_queries(self):
+        with InspectionClient(self.socket_path, timeout=5) as client:
+            self.assertRaises(QueryError, client.find_by_argument, ['request'])
+            self.assertEqual(len(client.find_by_argument('request')), 2)
+
+    def test_it_should_remove_the_socket_on_close(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.assertFalse(os.path.exists(self.socket_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,182 @@
+# -* coding: utf-8 *-
+"""
+:py:mod:`pynspector.static_inspections`
+---------------------------------------
+Module for inspecting modules without importing them.
+
+The source code is parsed with :py:mod:`ast`, so nothing is executed. Results are the same
+:py:class:`models.Function` objects returned when inspecting imported functions, except that
+there's no live function (``func`` is None) and default values are reported as the repr of the
+literal, or as the source of the expression when it's not a literal. They are
+:py:class:`models.DefaultRepr`, so they compare to live results by repr.
+"""
+# System imports
+import ast
+import io
+import os
+import sys
+import tokenize
+
+import six
+
+# Third-party imports
+# Local imports
+from .doc_parsers import sphinx_doc_parser
+from .models import DefaultRepr
+from .func_inspections import (
+    build_func_inspect_result, Parameter, EMPTY, POSITIONAL_ONLY, POSITIONAL_OR_KEYWORD,
+    VAR_POSITIONAL, KEYWORD_ONLY, VAR_KEYWORD
+)
+
+
+__all__ = ['find_module_path', 'get_static_inspect_results']
+
+
+_FUNCTION_NODES = tuple(
+    getattr(ast, node_name) for node_name in ('FunctionDef', 'AsyncFunctionDef')
+    if hasattr(ast, node_name)
+)
+
+
+def find_module_path(name, path=None):
+    """Find the source file of a module without importing it (nor its parent packages)
+
+    Example:
+    >>> find_module_path('pynspector.models')
+    >>> '/path/to/pynspector/models.py'
+
+    :param str name: Dotted name of the module
+    :param list path: Directories to look into, by default sys.path
+    :return: Path of the source file
+    :rtype: str
+    :raises ImportError: If there's no source file for this module
+    """
+    search_paths = list(sys.path if path is None else path)
+    parts = name.split('.')
+    for part in parts[:-1]:
+        search_paths = [
+            os.path.join(base or os.curdir, part) for base in search_paths
+            if os.path.isdir(os.path.join(base or os.curdir, part))
+        ]
+    for base in search_paths:
+        base = os.path.join(base or os.curdir, parts[-1])
+        for candidate in (base + '.py', os.path.join(base, '__init__.py')):
+            if os.path.isfile(candidate):
+                return candidate
+    raise ImportError("No source file found for module %r" % name)
+
+
+def get_static_inspect_results(module, doc_parser=sphinx_doc_parser):
+    """Get inspect results for the public functions of a module without importing it
+
+    Example:
+    >>> functions = get_static_inspect_results('pynspector.module_inspections_fixture_test')
+    >>> [function.name for function in functions]
+    >>> ['dummy_func']
+
+    :param str module: Dotted name of the module or path to its source file
+    :param function doc_parser: Parser used to parse the docstrings
+    :return: List of models.Function sorted by name, ``func`` is None for all of them
+    :rtype: list
+    """
+    path = _module_path(module)
+    source = _read_source(path)
+    tree = ast.parse(source, path)
+    lines = source.splitlines(True)
+
+    nodes = {}
+    for index, node in enumerate(tree.body):
+        if isinstance(node, _FUNCTION_NODES) and not node.name.startswith('_'):
+            next_node = tree.body[index + 1] if index + 1 < len(tree.body) else None
+            nodes[node.name] = (node, next_node)
+
+    results = []
+    for name in sorted(nodes):
+        node, next_node = nodes[name]
+        function = build_func_inspect_result(
+            name, ast.get_docstring(node, clean=False), _get_node_parameters(node, source),
+            doc_parser
+        )
+        first_line = min([node.lineno] + [decorator.lineno for decorator in node.decorator_list])
+        last_line = _last_line(node, next_node, lines)
+        function.source_code = ''.join(lines[first_line - 1:last_line])
+        function.source_location = (path, first_line, last_line)
+        results.append(function)
+    return results
+
+
+def _module_path(module):
+    if module.endswith('.py') or os.path.sep in module:
+        if os.path.isdir(module):
+            return os.path.join(module, '__init__.py')
+        return module
+    return find_module_path(module)
+
+
+def _read_source(path):
+    if six.PY3:
+        with tokenize.open(path) as source_file:
+            return source_file.read()
+    with io.open(path, 'rb') as source_file:
+        return source_file.read()
+
+
+def _last_line(node, next_node, lines):
+    """Get the last line of a function node
+
+    Python 3.8+ reports it, for older versions it's the line before the next statement
+    without trailing blank lines or comments.
+    """
+    if getattr(node, 'end_lineno', None):
+        return node.end_lineno
+    last_line = len(lines)
+    if next_node is not None:
+        last_line = min([next_node.lineno] +
+                        [decorator.lineno for decorator in getattr(next_node, 'decorator_list', [])])
+        last_line -= 1
+    while last_line > node.lineno and lines[last_line - 1].strip()[:1] in ('', '#'):
+        last_line -= 1
+    return last_line
+
+
+def _get_node_parameters(node, source):
+    """Get the list of Parameter of a function node, defaults are reprs"""
+    arguments = node.args
+    positional_only = getattr(arguments, 'posonlyargs', [])
+    positional = positional_only + arguments.args
+    first_default = len(positional) - len(arguments.defaults)
+
+    parameters = []
+    for index, argument in enumerate(positional):
+        kind = POSITIONAL_ONLY if index < len(positional_only) else POSITIONAL_OR_KEYWORD
+        default = EMPTY
+        if index >= first_default:
+            default = _default_repr(arguments.defaults[index - first_default], source)
+        parameters.append(Parameter(_arg_name(argument), kind, default))
+    if arguments.vararg:
+        parameters.append(Parameter(_arg_name(arguments.vararg), VAR_POSITIONAL, EMPTY))
+    for argument, default in zip(getattr(arguments, 'kwonlyargs', []),
+                                 getattr(arguments, 'kw_defaults', [])):
+        default = EMPTY if default is None else _default_repr(default, source)
+        parameters.append(Parameter(argument.arg, KEYWORD_ONLY, default))
+    if arguments.kwarg:
+        parameters.append(Parameter(_arg_name(arguments.kwarg), VAR_KEYWORD, EMPTY))
+    return parameters
+
+
+def _arg_name(argument):
+    # On python 2 arguments are Name nodes and varargs plain strings
+    if isinstance(argument, six.string_types):
+        return argument
+    return getattr(argument, 'arg', None) or getattr(argument, 'id', None)
+
+
+def _default_repr(node, source):
+    """Get the repr of a default value, or its source when it's not a literal"""
+    try:
+        return DefaultRepr(repr(ast.literal_eval(node)))
+    except (ValueError, TypeError, SyntaxError):
+        pass
+    if hasattr(ast, 'get_source_segment'):
+        return DefaultRepr(ast.get_source_segment(source, node))
+    return DefaultRepr('<%s>' % type(node).__name__)
@@ -0,0 +1,48 @@
+# -* coding: utf-8 *-
+"""
+Fixture module for static inspections test
+"""
+# System imports
+# Third-party imports
+# Local imports
+
+
+DEFAULT_TIMEOUT = 10
+
+
+def _decorator(func):
+    return func
+
+
+def _private_func(foo):
+    """This should not be returned"""
+    return foo
+
+
+def func_with_defaults(foo, bar='bar', baz=None, timeout=DEFAULT_TIMEOUT, *args, **kwargs):
+    """Function with defaults
+
+    Long description.
+
+    :param str foo: Foo description
+    :param bar: Bar description
+    :type bar: str
+    :param int timeout: Timeout in seconds
+    :return: Nothing
+    """
+    return foo, bar, baz, timeout, args, kwargs
+
+
+@_decorator
+def decorated_func(foo):
+    """Decorated function"""
+    return foo
+
+# Comment after the function, not part of it
+
+
+class JustAClass(object):
+    """This class should not be returned"""
+
+    def method(self):
+        pass
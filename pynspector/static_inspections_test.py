@@ -0,0 +1,96 @@
+# -* coding: utf-8 *-
+"""
+Set of tests for static inspections module
+"""
+# System imports
+import inspect
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# Third-party imports
+# Local imports
+from pynspector.static_inspections import find_module_path, get_static_inspect_results
+from pynspector.func_inspections import get_func_inspect_result
+from pynspector import static_inspections_fixture_test
+
+
+class TestFindModulePath(unittest.TestCase):
+    """
+    Test suite for function `find_module_path`
+    """
+
+    def test_it_should_find_modules_inside_packages(self):
+        self.assertEqual(
+            os.path.abspath(find_module_path('pynspector.static_inspections_fixture_test')),
+            os.path.abspath(static_inspections_fixture_test.__file__).replace('.pyc', '.py')
+        )
+
+    def test_it_should_find_packages(self):
+        self.assertTrue(find_module_path('pynspector').endswith('__init__.py'))
+
+    def test_it_should_raise_import_error_when_not_found(self):
+        with self.assertRaises(ImportError):
+            find_module_path('pynspector.does_not_exist')
+
+
+class TestGetStaticInspectResults(unittest.TestCase):
+    """
+    Test suite for function `get_static_inspect_results`
+    """
+
+    def setUp(self):
+        self.results = get_static_inspect_results('pynspector.static_inspections_fixture_test')
+
+    def test_it_should_get_only_public_functions(self):
+        self.assertListEqual(['decorated_func', 'func_with_defaults'],
+                             [function.name for function in self.results])
+
+    def test_it_should_match_runtime_inspection(self):
+        static = self.results[1]
+        runtime = get_func_inspect_result(static_inspections_fixture_test.func_with_defaults)
+        self.assertIsNone(static.func)
+        self.assertEqual(static.short_description, runtime.short_description)
+        self.assertEqual(static.long_description, runtime.long_description)
+        self.assertEqual(len(static.arguments), len(runtime.arguments))
+        for static_arg, runtime_arg in zip(static.arguments, runtime.arguments):
+            self.assertEqual(
+                (static_arg.name, static_arg.kind, static_arg.description, static_arg.is_arg,
+                 static_arg.position, static_arg.parameter_kind),
+                (runtime_arg.name, runtime_arg.kind, runtime_arg.description, runtime_arg.is_arg,
+                 runtime_arg.position, runtime_arg.parameter_kind)
+            )
+
+    def test_it_should_report_defaults_as_reprs(self):
+        defaults = [argument.default for argument in self.results[1].arguments]
+        self.assertEqual(defaults[1:3], ["'bar'", 'None'])
+        if sys.version_info >= (3, 8):
+            self.assertEqual(defaults[3], 'DEFAULT_TIMEOUT')
+
+    def test_it_should_get_source_code(self):
+        for function in self.results:
+            runtime = getattr(static_inspections_fixture_test, function.name)
+            self.assertEqual(function.source_code, inspect.getsource(runtime))
+            self.assertEqual(function.source_location[1], inspect.getsourcelines(runtime)[1])
+
+    def test_it_should_not_import_the_module(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'side_effects.py')
+        with open(path, 'w') as module_file:
+            module_file.write(
+                'raise RuntimeError("imported")\n\n\n'
+                'def handler(request, retries=3):\n'
+                '    """Handle a request"""\n'
+                '    return request\n'
+            )
+        results = get_static_inspect_results(path)
+        self.assertEqual(['handler'], [function.name for function in results])
+        self.assertEqual('3', results[0].arguments[1].default)
+        self.assertNotIn('side_effects', sys.modules)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+# -* coding: utf-8 *-
+"""
+:py:mod:`pynspector.stats`
+--------------------------
+Opt-in instrumentation for the inspection stages.
+
+When a collector is enabled, every stage of an inspection records its number of calls, cumulative
+and maximum time, and the hits and misses of the caches in front of it. When it's disabled the
+stages are called directly, so the overhead is a single global lookup per stage.
+
+Stages:
+- inspect: get_func_inspect_result, hits and misses of the inspections cache.
+- signature: get_parameters.
+- doc_parse: Doc parser, hits and misses of a DocParserCache.
+- trim: Docstring trimming in sphinx_doc_parser.
+- source: inspect.getsource in models.Function.
+- annotations: Resolution of the annotations of a models.Function.
+- module_scan: get_module_functions, measured while its results are consumed.
+- disk_cache: Hits and misses of a DiskCache.
+
+Example:
+>>> collector = stats.enable()
+>>> get_func_inspect_result(func)
+>>> stats.disable()
+>>> collector.report()
+>>> {'inspect': {'calls': 1, 'total_time': 6.1e-05, 'max_time': 6.1e-05, 'hits': 0, 'misses': 0},
+...  'signature': {...}, ...}
+"""
+# System imports
+import time
+
+# Third-party imports
+# Local imports
+
+
+__all__ = ['StageStats', 'StatsCollector', 'enable', 'disable', 'get_collector', 'measure',
+           'measure_iter', 'hit', 'miss']
+
+
+_timer = getattr(time, 'perf_counter', time.time)
+
+# Collector receiving the stats, None when the instrumentation is disabled
+_collector = None
+
+
+class StageStats(object):
+    """Stats recorded for a stage"""
+    __slots__ = ('calls', 'total_time', 'max_time', 'hits', 'misses')
+
+    def __init__(self):
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class StatsCollector(object):
+    """Collects the stats of every stage
+
+    A callback can be given to be notified every time a stage finishes, it receives the stage
+    name and the elapsed time in seconds.
+    """
+
+    def __init__(self, callback=None):
+        """ Initialize StatsCollector object
+
+        :param function callback: Called with stage name and elapsed seconds after every call
+        """
+        self.callback = callback
+        self.stages = {}
+
+    def _stage(self, stage):
+        stats = self.stages.get(stage)
+        if stats is None:
+            stats = self.stages[stage] = StageStats()
+        return stats
+
+    def record(self, stage, elapsed):
+        """Record a call to a stage
+
+        :param str stage: Name of the stage
+        :param float elapsed: Time spent on the call, in seconds
+        """
+        stats = self._stage(stage)
+        stats.calls += 1
+        stats.total_time += elapsed
+        if elapsed > stats.max_time:
+            stats.max_time = elapsed
+        if self.callback is not None:
+            self.callback(stage, elapsed)
+
+    def record_hit(self, stage):
+        self._stage(stage).hits += 1
+
+    def record_miss(self, stage):
+        self._stage(stage).misses += 1
+
+    def reset(self):
+        self.stages = {}
+
+    def report(self):
+        """Get the stats of every stage
+
+        :return: Dictionary with stage name as key and dictionary of stats as value
+        :rtype: dict
+        """
+        return {stage: stats.as_dict() for stage, stats in self.stages.items()}
+
+
+def enable(collector=None):
+    """Enable the instrumentation
+
+    :param StatsCollector collector: Collector to use, a new one by default
+    :return: The enabled collector
+    :rtype: StatsCollector
+    """
+    global _collector
+    _collector = collector if collector is not None else StatsCollector()
+    return _collector
+
+
+def disable():
+    """Disable the instrumentation"""
+    global _collector
+    _collector = None
+
+
+def get_collector():
+    """Get the enabled collector, None if the instrumentation is disabled"""
+    return _collector
+
+
+def measure(stage, func, *args, **kwargs):
+    """Call a function recording it as a call to a stage"""
+    collector = _collector
+    if collector is None:
+        return func(*args, **kwargs)
+    start = _timer()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        collector.record(stage, _timer() - start)
+
+
+def measure_iter(stage, iterable):
+    """Record the time spent consuming an iterable as a call to a stage"""
+    collector = _collector
+    if collector is None:
+        return iterable
+    return _measured_iter(collector, stage, iterable)
+
+
+def _measured_iter(collector, stage, iterable):
+    elapsed = 0.0
+    iterator = iter(iterable)
+    try:
+        while True:
+            start = _timer()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                elapsed += _timer() - start
+            yield item
+    finally:
+        collector.record(stage, elapsed)
+
+
+def hit(stage):
+    """Record a cache hit for a stage"""
+    collector = _collector
+    if collector is not None:
+        collector.record_hit(stage)
+
+
+def miss(stage):
+    """Record a cache miss for a stage"""
+    collector = _collector
+    if collector is not None:
+        collector.record_miss(stage)
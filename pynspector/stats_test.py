@@ -0,0 +1,98 @@
+# -* coding: utf-8 *-
+"""
+Set of tests for stats module
+"""
+# System imports
+import inspect
+import unittest
+
+try:
+    from unittest import mock
+except ImportError:  # python 2
+    import mock
+
+# Third-party imports
+# Local imports
+from pynspector import stats
+from pynspector.cache import FunctionInspectionCache
+from pynspector.func_inspections import get_func_inspect_result
+from pynspector.module_inspections import get_module_functions
+from pynspector import module_inspections_fixture_test
+
+
+def dummy_func(foo, bar=None):
+    """Dummy function
+
+    :param str foo: Foo description
+    """
+    return foo, bar
+
+
+class TestStats(unittest.TestCase):
+    """
+    Test suite for the stats instrumentation
+    """
+
+    def setUp(self):
+        self.addCleanup(stats.disable)
+
+    def test_it_should_be_disabled_by_default(self):
+        self.assertIsNone(stats.get_collector())
+
+    def test_it_should_record_every_stage_of_an_inspection(self):
+        collector = stats.enable()
+        function = get_func_inspect_result(dummy_func)
+        function.source_code
+        report = collector.report()
+        for stage in ('inspect', 'signature', 'doc_parse', 'trim', 'source'):
+            self.assertEqual(report[stage]['calls'], 1, stage)
+            self.assertGreaterEqual(report[stage]['max_time'], 0)
+        self.assertGreaterEqual(report['inspect']['total_time'], report['signature']['total_time'])
+
+    def test_it_should_record_cache_hits(self):
+        collector = stats.enable()
+        cache = FunctionInspectionCache()
+        get_func_inspect_result(dummy_func, cache=cache)
+        get_func_inspect_result(dummy_func, cache=cache)
+        report = collector.report()
+        self.assertEqual((report['inspect']['hits'], report['inspect']['misses']), (1, 1))
+        self.assertEqual(report['inspect']['calls'], 1)
+
+    def test_it_should_record_module_scan(self):
+        collector = stats.enable()
+        get_module_functions(module_inspections_fixture_test)
+        self.assertEqual(collector.report()['module_scan']['calls'], 1)
+
+    def test_module_scan_should_cover_the_scan(self):
+        clock = [0]
+
+        def timer():
+            return clock[0]
+
+        def isfunction(member):
+            clock[0] += 1
+            return inspect.isfunction(member)
+
+        collector = stats.enable()
+        members = len([name for name in vars(module_inspections_fixture_test)
+                       if not name.startswith('_')])
+        with mock.patch.object(stats, '_timer', timer), \
+                mock.patch('pynspector.module_inspections.isfunction', isfunction):
+            get_module_functions(module_inspections_fixture_test)
+        self.assertEqual(collector.report()['module_scan']['total_time'], members)
+
+    def test_it_should_call_the_callback(self):
+        calls = []
+        stats.enable(stats.StatsCollector(callback=lambda *call: calls.append(call)))
+        get_func_inspect_result(dummy_func)
+        self.assertIn('inspect', [stage for stage, _ in calls])
+
+    def test_it_should_not_record_when_disabled(self):
+        collector = stats.enable()
+        stats.disable()
+        get_func_inspect_result(dummy_func)
+        self.assertEqual(collector.report(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
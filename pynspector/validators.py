@@ -0,0 +1,104 @@
+# -* coding: utf-8 *-
+"""
+:py:mod:`pynspector.validators`
+-------------------------------
+Validation of keyword arguments against inspected functions.
+
+A validator is compiled once from a :py:class:`models.Function` and then reused for every call:
+everything that doesn't depend on the call (mandatory names, accepted names, defaults) is
+precomputed, so validating a call is a couple of set operations and a dictionary copy.
+"""
+# System imports
+# Third-party imports
+# Local imports
+from .func_inspections import POSITIONAL_ONLY, VAR_POSITIONAL, VAR_KEYWORD
+
+
+__all__ = ['CallValidationError', 'CallValidator', 'compile_validator']
+
+
+class CallValidationError(TypeError):
+    """Raised when keyword arguments don't match the function arguments
+
+    It's a TypeError, as the one python raises when calling a function with wrong arguments.
+    """
+
+    def __init__(self, message, missing=(), unknown=()):
+        """ Initialize CallValidationError object
+
+        :param str message: Error message
+        :param tuple missing: Names of the mandatory arguments that were not given
+        :param tuple unknown: Names of the given arguments the function doesn't accept
+        """
+        super(CallValidationError, self).__init__(message)
+        self.missing = missing
+        self.unknown = unknown
+
+
+class CallValidator(object):
+    """Validator and binder of keyword arguments for a function
+
+    Calling the validator with the keyword arguments checks that no mandatory argument is missing
+    and that every name is accepted, and returns the arguments with the defaults filled in.
+    Positional only arguments can't be given by name, so they are left out: they are neither
+    required, accepted nor filled in.
+    """
+    __slots__ = ('name', '_mandatory', '_names', '_defaults', '_accepts_any')
+
+    def __init__(self, function):
+        """ Initialize CallValidator object
+
+        :param models.Function function: Inspected function
+        """
+        arguments = [argument for argument in function.arguments
+                     if argument.parameter_kind not in (POSITIONAL_ONLY, VAR_POSITIONAL,
+                                                        VAR_KEYWORD)]
+        self.name = function.name
+        self._mandatory = frozenset(argument.name for argument in arguments
+                                    if argument.is_mandatory)
+        self._names = frozenset(argument.name for argument in arguments)
+        self._defaults = {argument.name: argument.default for argument in arguments
+                          if not argument.is_mandatory}
+        self._accepts_any = any(argument.parameter_kind == VAR_KEYWORD
+                                for argument in function.arguments)
+
+    def __call__(self, kwargs):
+        """Validate keyword arguments and bind them with the defaults
+
+        :param dict kwargs: Keyword arguments for the function
+        :return: New dictionary with the given arguments and the defaults of the missing ones
+        :rtype: dict
+        :raises CallValidationError: If a mandatory argument is missing or a name is unknown
+        """
+        if not self._mandatory.issubset(kwargs):
+            missing = tuple(sorted(self._mandatory.difference(kwargs)))
+            raise CallValidationError(
+                "%s() missing required argument(s): %s" % (self.name, ', '.join(missing)),
+                missing=missing
+            )
+        if not self._accepts_any and not self._names.issuperset(kwargs):
+            unknown = tuple(sorted(set(kwargs).difference(self._names)))
+            raise CallValidationError(
+                "%s() got unexpected keyword argument(s): %s" % (self.name, ', '.join(unknown)),
+                unknown=unknown
+            )
+        bound = self._defaults.copy()
+        bound.update(kwargs)
+        return bound
+
+
+def compile_validator(function):
+    """Compile a reusable validator for an inspected function
+
+    Example:
+    >>> validate = compile_validator(get_func_inspect_result(handler))
+    >>> validate({'user_id': 1})
+    >>> {'user_id': 1, 'timeout': 10}
+    >>> validate({'timeout': 5})
+    >>> CallValidationError: handler() missing required argument(s): user_id
+
+    :param models.Function function: Inspected function
+    :return: Validator to call with the keyword arguments
+    :rtype: CallValidator
+    """
+    return CallValidator(function)
@@ -0,0 +1,76 @@
+# -* coding: utf-8 *-
+"""
+Set of tests for validators module
+"""
+# System imports
+import sys
+import unittest
+
+# Third-party imports
+# Local imports
+from pynspector.func_inspections import get_func_inspect_result
+from pynspector.validators import compile_validator, CallValidationError
+
+
+def handler(user_id, name, timeout=10, retries=None):
+    return user_id, name, timeout, retries
+
+
+def handler_with_kwargs(user_id, *args, **kwargs):
+    return user_id, args, kwargs
+
+
+class TestCallValidator(unittest.TestCase):
+    """
+    Test suite for class `CallValidator`
+    """
+
+    def setUp(self):
+        self.validate = compile_validator(get_func_inspect_result(handler))
+
+    def test_it_should_fill_defaults(self):
+        self.assertEqual(self.validate({'user_id': 1, 'name': 'foo', 'retries': 3}),
+                         {'user_id': 1, 'name': 'foo', 'timeout': 10, 'retries': 3})
+
+    def test_it_should_not_modify_the_given_arguments(self):
+        kwargs = {'user_id': 1, 'name': 'foo'}
+        self.validate(kwargs)
+        self.assertEqual(kwargs, {'user_id': 1, 'name': 'foo'})
+
+    def test_it_should_reject_missing_mandatory_arguments(self):
+        with self.assertRaises(CallValidationError) as context:
+            self.validate({'user_id': 1, 'timeout': 5})
+        self.assertEqual(context.exception.missing, ('name',))
+        self.assertIsInstance(context.exception, TypeError)
+
+    def test_it_should_reject_unknown_arguments(self):
+        with self.assertRaises(CallValidationError) as context:
+            self.validate({'user_id': 1, 'name': 'foo', 'color': 'red'})
+        self.assertEqual(context.exception.unknown, ('color',))
+
+    def test_it_should_accept_any_name_with_var_keyword(self):
+        validate = compile_validator(get_func_inspect_result(handler_with_kwargs))
+        self.assertEqual(validate({'user_id': 1, 'color': 'red'}), {'user_id': 1, 'color': 'red'})
+        with self.assertRaises(CallValidationError):
+            validate({'color': 'red'})
+
+    def test_it_should_match_the_function_call(self):
+        bound = self.validate({'user_id': 1, 'name': 'foo'})
+        self.assertEqual(handler(**bound), (1, 'foo', 10, None))
+
+    @unittest.skipIf(sys.version_info < (3, 8), "positional only arguments need python 3.8+")
+    def test_it_should_leave_positional_only_arguments_out(self):
+        namespace = {}
+        exec("def handler(request, /, retries=1, *, timeout=None):\n"
+             "    return request, retries, timeout\n", namespace)
+        validate = compile_validator(get_func_inspect_result(namespace['handler']))
+        bound = validate({'timeout': 5})
+        self.assertEqual(bound, {'retries': 1, 'timeout': 5})
+        self.assertEqual(namespace['handler']('request', **bound), ('request', 1, 5))
+        with self.assertRaises(CallValidationError) as context:
+            validate({'request': 'request'})
+        self.assertEqual(context.exception.unknown, ('request',))
+
+
+if __name__ == '__main__':
+    unittest.main()
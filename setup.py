@@ -38,5 +38,13 @@ setup(
     packages=find_packages(exclude=['contrib', 'docs', 'tests']),
     install_requires=[
         "six",
-    ]
+    ],
+    extras_require={
+        'numpy': ['numpy'],
+    },
+    entry_points={
+        'console_scripts': [
+            'pynspector=pynspector.cli:main',
+        ],
+    },
 )